@@ -0,0 +1,59 @@
+"""
+Benchmark of batch conversion throughput against the number of worker processes.
+
+64 synthetic cells of 20k atoms are converted to POSCAR and XYZ with 1, 2, 4, ... workers,
+up to the number of CPUs.
+
+Run in root of repo:
+    python3 benchmarks/bench_batch.py [number of files] [atoms per file]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from conquest2a.batch import batch_convert
+
+SPECIES = {1: "Bi", 2: "Mn", 3: "O"}
+
+
+def write_cell(path: Path, natoms: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    frac = rng.random((natoms, 3))
+    species = rng.integers(1, 4, natoms)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("20.0 0.0 0.0\n0.0 30.0 0.0\n0.0 0.0 40.0\n")
+        f.write(f"{natoms}\n")
+        for (x, y, z), sp in zip(frac, species):
+            f.write(f"  {x:.12f}   {y:.12f}   {z:.12f} {sp} T T T\n")
+
+
+def main() -> None:
+    nfiles = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    natoms = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    cpus = os.cpu_count() or 1
+    worker_counts = [1 << i for i in range(cpus.bit_length()) if 1 << i <= cpus]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(nfiles):
+            path = Path(tmp) / f"coord_{i:04d}.in"
+            write_cell(path, natoms, i)
+            paths.append(str(path))
+        print(f"{nfiles} files of {natoms} atoms, {cpus} CPUs")
+        print(f"{'workers':>8} {'time [s]':>10} {'files/s':>9} {'speedup':>9}")
+        serial = 0.0
+        for workers in worker_counts:
+            start = time.perf_counter()
+            results = batch_convert(
+                paths, SPECIES, ["vasp", "xyz"], output_dir=f"{tmp}/out", workers=workers
+            )
+            elapsed = time.perf_counter() - start
+            assert all(result.ok for result in results)
+            serial = serial or elapsed
+            print(f"{workers:>8} {elapsed:>10.3f} {nfiles / elapsed:>9.1f} {serial / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of the bulk CONQUEST coordinates parser against the original line-by-line parser.
+
+Synthetic orthorhombic cells of 10k, 100k and 1M atoms are written to a temporary directory,
+read with both parsers, and checked to produce identical columns.
+
+Run in root of repo:
+    python3 benchmarks/bench_coordinates_parser.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from conquest2a.conquest import conquest_coordinates_processor, conquest_species, atom_columns
+
+SIZES = [10_000, 100_000, 1_000_000]
+SPECIES = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+
+
+def write_cell(path: Path, natoms: int) -> None:
+    rng = np.random.default_rng(natoms)
+    frac = rng.random((natoms, 3))
+    species = rng.integers(1, 4, natoms)
+    flags = np.where(rng.random((natoms, 3)) < 0.9, "T", "F")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("20.0 0.0 0.0\n0.0 30.0 0.0\n0.0 0.0 40.0\n")
+        f.write(f"{natoms}\n")
+        for (x, y, z), sp, (a, b, c) in zip(frac, species, flags):
+            f.write(f"  {x:.12f}   {y:.12f}   {z:.12f} {sp} {a} {b} {c}\n")
+
+
+def legacy_parse(path: Path) -> atom_columns:
+    """The original per-line parser, kept here as the reference implementation."""
+    with open(path, "r", encoding="utf-8") as f:
+        for _ in range(4):
+            next(f)
+        atom_data = [atom for atom in f.readlines() if atom.strip()]
+    frac, species, can_move = [], [], []
+    for atom in atom_data:
+        split_atom_data = atom.strip().split()
+        frac.append(np.array(split_atom_data[:3]).astype(float))
+        species.append(int(split_atom_data[3]))
+        can_move.append([flag == "T" for flag in split_atom_data[4:]])
+    columns = atom_columns(len(atom_data))
+    columns.frac_coords = np.vstack(frac)
+    columns.species = np.array(species, dtype=np.int64)
+    columns.can_move = np.array(can_move, dtype=np.bool_)
+    return columns
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'atoms':>10} {'legacy [s]':>12} {'bulk [s]':>12} {'speedup':>9}")
+        for natoms in sizes:
+            path = Path(tmp) / f"cell_{natoms}.dat"
+            write_cell(path, natoms)
+            start = time.perf_counter()
+            reference = legacy_parse(path)
+            legacy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            bulk = conquest_coordinates_processor(str(path), SPECIES).coords.columns
+            bulk_time = time.perf_counter() - start
+            assert np.array_equal(reference.frac_coords, bulk.frac_coords)
+            assert np.array_equal(reference.species, bulk.species)
+            assert np.array_equal(reference.can_move, bulk.can_move)
+            print(
+                f"{natoms:>10} {legacy_time:>12.3f} {bulk_time:>12.3f} "
+                f"{legacy_time / bulk_time:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
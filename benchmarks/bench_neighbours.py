@@ -0,0 +1,60 @@
+"""
+Benchmark of periodic neighbour-list construction, KDTree against cell list.
+
+Random atoms are placed in a cubic cell at a given number density, and the neighbour list within
+a cutoff is built with each method. Each build is repeated and the fastest time reported, so
+first-touch memory costs are not counted. Sizes default to 10k, 100k and 1M atoms, at a density
+of 0.1 atoms per cubic Bohr and cutoffs of 1.5, 3 and 6 Bohr.
+
+Run in root of repo:
+    python3 benchmarks/bench_neighbours.py [atoms ...]
+"""
+
+import sys
+import time
+import numpy as np
+from conquest2a.algo.nn import choose_method, neighbour_list
+from conquest2a.conquest import atom_columns, conquest_coordinates_processor, conquest_species
+
+SIZES = [10_000, 100_000, 1_000_000]
+DENSITY = 0.1
+CUTOFFS = [1.5, 3.0, 6.0]
+REPEATS = 3
+SPECIES = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+
+
+def make_cell(natoms: int) -> conquest_coordinates_processor:
+    rng = np.random.default_rng(natoms)
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", SPECIES)
+    coords = coords_proc.coords
+    coords.lattice_vectors = np.diag(np.full(3, (natoms / DENSITY) ** (1 / 3)))
+    columns = atom_columns(natoms)
+    columns.frac_coords = rng.random((natoms, 3))
+    columns.species = rng.integers(1, 4, natoms)
+    coords.columns = columns
+    coords.get_cartesian_positions()
+    return coords_proc
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+    print(f"{'atoms':>10} {'cutoff':>7} {'method':>10} {'time [s]':>10} {'pairs':>10} {'auto':>10}")
+    for natoms in sizes:
+        coords_proc = make_cell(natoms)
+        box = np.diag(coords_proc.coords.lattice_vectors)
+        for cutoff in CUTOFFS:
+            auto = choose_method(natoms, box, cutoff)
+            for method in ("kdtree", "cell_list"):
+                elapsed = np.inf
+                for _ in range(REPEATS):
+                    start = time.perf_counter()
+                    nlist = neighbour_list(coords_proc, cutoff, method=method)
+                    elapsed = min(elapsed, time.perf_counter() - start)
+                npairs = len(nlist.indices) // 2
+                print(
+                    f"{natoms:>10} {cutoff:>7.1f} {method:>10} {elapsed:>10.3f} {npairs:>10} {auto:>10}"
+                )
+
+
+if __name__ == "__main__":
+    main()
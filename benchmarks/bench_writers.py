@@ -0,0 +1,65 @@
+"""
+Benchmark of writer throughput, in atoms per second, for every output format.
+
+A synthetic orthorhombic cell is built in memory and written with each writer to a temporary
+directory. Cell sizes default to 100k and 1M atoms.
+
+Run in root of repo:
+    python3 benchmarks/bench_writers.py [atoms ...]
+"""
+
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+import numpy as np
+from conquest2a.conquest import atom_columns, conquest_coordinates, conquest_species
+from conquest2a.writers import conquest_writer, extxyz_writer, vasp_writer, xsf_writer, xyz_writer
+
+SIZES = [100_000, 1_000_000]
+SPECIES = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+WRITERS: dict[str, Callable[[str, conquest_coordinates], object]] = {
+    "conquest": conquest_writer,
+    "vasp": vasp_writer,
+    "xyz": xyz_writer,
+    "extxyz": extxyz_writer,
+    "xsf": xsf_writer,
+}
+
+
+def make_cell(natoms: int) -> conquest_coordinates:
+    rng = np.random.default_rng(natoms)
+    coords = conquest_coordinates(SPECIES)
+    coords.lattice_vectors = np.diag([20.0, 30.0, 40.0])
+    coords.natoms = f"{natoms}\n"
+    columns = atom_columns(natoms)
+    columns.frac_coords = rng.random((natoms, 3))
+    columns.species = rng.integers(1, 4, natoms)
+    columns.can_move = rng.random((natoms, 3)) < 0.9
+    columns.spins[:, 2] = rng.standard_normal(natoms)
+    coords.columns = columns
+    coords.get_cartesian_positions()
+    coords.assign_atom_labels()
+    return coords
+
+
+def main() -> None:
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'atoms':>10} {'format':>9} {'time [s]':>10} {'atoms/s':>12} {'MB':>8}")
+        for natoms in sizes:
+            coords = make_cell(natoms)
+            for name, writer in WRITERS.items():
+                dest = Path(tmp) / f"cell.{name}"
+                start = time.perf_counter()
+                writer(str(dest), coords)
+                elapsed = time.perf_counter() - start
+                size = dest.stat().st_size / 1e6
+                print(
+                    f"{natoms:>10} {name:>9} {elapsed:>10.3f} {natoms / elapsed:>12.0f} {size:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
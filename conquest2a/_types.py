@@ -10,5 +10,7 @@ NUMBER_ARRAY = npt.NDArray[np.number]
 REAL_ARRAY = npt.NDArray[np.float64]
 GENERIC_ARRAY = npt.NDArray[typing.Any]
 INT_ARRAY = npt.NDArray[np.int64]
+BOOL_ARRAY = npt.NDArray[np.bool_]
+STR_ARRAY = npt.NDArray[np.str_]
 
 FILE_PATH = str | Path
@@ -1,25 +1,160 @@
+import weakref
 from collections.abc import Sequence
-from typing import Any
+from itertools import product
+from typing import Any, Literal
+import numpy as np
 from scipy.spatial import KDTree
-from conquest2a.conquest import conquest_coordinates_processor, Atom
+from conquest2a.conquest import conquest_coordinates, conquest_coordinates_processor, Atom
+import conquest2a._types as c2at
+
+# Periodic KDTree of each coordinates object, with the position array and box it was built from
+_kdtree_cache: weakref.WeakKeyDictionary[
+    conquest_coordinates, tuple[c2at.REAL_ARRAY, c2at.REAL_ARRAY, KDTree]
+] = weakref.WeakKeyDictionary()
+
+
+def orthorhombic_box(lattice_vectors: c2at.REAL_ARRAY) -> c2at.REAL_ARRAY:
+    """Edge lengths of an orthorhombic cell whose lattice vectors lie along the Cartesian axes.
+
+    :param lattice_vectors: Lattice vectors of the cell.
+    :type lattice_vectors: :ref:`REAL ARRAY <types>`
+    :raises ValueError: If the lattice vectors are not along the axes.
+    :return: The diagonal of ``lattice_vectors``.
+    :rtype: :ref:`REAL ARRAY <types>`
+    """
+    box: c2at.REAL_ARRAY = np.diag(lattice_vectors).astype(np.float64)
+    if not np.array_equal(lattice_vectors, np.diag(box)) or np.any(box <= 0):
+        raise ValueError("Periodic neighbour search needs an orthorhombic cell along the axes.")
+    return box
+
+
+# Number of atoms wrapped at a time by shared_kdtree, bounding its temporaries
+WRAP_CHUNK_ATOMS: int = 65536
+
+
+def wrap_positions(
+    positions: c2at.REAL_ARRAY, box: c2at.REAL_ARRAY, out: c2at.REAL_ARRAY | None = None
+) -> tuple[c2at.REAL_ARRAY, c2at.REAL_ARRAY]:
+    """Wrap Cartesian positions into the periodic box ``[0, box)`` along each axis.
+
+    :param positions: ``(N, 3)`` Cartesian positions.
+    :type positions: :ref:`REAL ARRAY <types>`
+    :param box: Edge lengths of the orthorhombic cell.
+    :type box: :ref:`REAL ARRAY <types>`
+    :param out: Array to write the wrapped positions to, which may be ``positions`` itself, defaults to ``None``.
+    :type out: :ref:`REAL ARRAY <types>` ``| None``, optional
+    :return: The wrapped positions, and the number of box lengths each was moved back by along each axis.
+    :rtype: ``tuple[REAL_ARRAY, REAL_ARRAY]``
+    """
+    cells = np.floor(positions / box)
+    wrapped = np.subtract(positions, cells * box, out=out)
+    # The quotient can round up to a whole number, leaving positions just below an edge negative
+    below = wrapped < 0.0
+    wrapped += below * box
+    cells -= below
+    # Wrapping can round up to exactly the edge, which the periodic tree rejects
+    on_edge = wrapped >= box
+    wrapped[on_edge] = 0.0
+    cells[on_edge] += 1
+    return wrapped, cells
+
+
+def _kdtree_box(coords: conquest_coordinates) -> c2at.REAL_ARRAY:
+    return np.array([coords.lattice_vectors[i][i] for i in range(0, 3)], dtype=np.float64)
+
+
+def shared_kdtree(coords: conquest_coordinates) -> KDTree:
+    """The periodic KDTree over the Cartesian positions of ``coords``, built on first use and shared by every later query.
+
+    The tree references :attr:`~conquest2a.conquest.conquest_coordinates.cart_position_vectors` rather than copying it, unless some positions lie outside the box. Those are wrapped into it, :data:`WRAP_CHUNK_ATOMS` atoms at a time, in a private copy that the tree holds instead, see :func:`wrap_positions`; the coordinates themselves are never modified. The tree is rebuilt when the positions array is replaced, e.g. by :func:`~conquest2a.conquest.conquest_coordinates.get_cartesian_positions` or by assigning new :attr:`~conquest2a.conquest.conquest_coordinates.columns`, or when the lattice vectors change. Positions edited in place are not detected; call :func:`clear_kdtree_cache` afterwards.
+
+    :param coords: The coordinates to search.
+    :type coords: :class:`~conquest2a.conquest.conquest_coordinates`
+    :return: The tree, with periodic box the diagonal of the lattice vectors.
+    :rtype: :class:`~scipy.spatial.KDTree`
+    """
+    positions = coords.cart_position_vectors
+    box = _kdtree_box(coords)
+    cached = _kdtree_cache.get(coords)
+    if cached is not None and cached[0] is positions and np.array_equal(cached[1], box):
+        return cached[2]
+    data = positions
+    for start in range(0, len(positions), WRAP_CHUNK_ATOMS):
+        chunk = positions[start : start + WRAP_CHUNK_ATOMS]
+        if np.any((chunk < 0.0) | (chunk >= box)):
+            if data is positions:
+                data = positions.copy()
+            wrap_positions(chunk, box, out=data[start : start + len(chunk)])
+    tree = KDTree(data, copy_data=False, boxsize=box)
+    _kdtree_cache[coords] = (positions, box, tree)
+    return tree
+
+
+def clear_kdtree_cache(coords: conquest_coordinates | None = None) -> None:
+    """Drop the shared KDTree of ``coords``, or of every coordinates object if ``None``, see :func:`shared_kdtree`.
+
+    :param coords: The coordinates whose tree to drop, defaults to ``None``.
+    :type coords: :class:`~conquest2a.conquest.conquest_coordinates` ``| None``, optional
+    """
+    if coords is None:
+        _kdtree_cache.clear()
+    else:
+        _kdtree_cache.pop(coords, None)
 
 
 class nearest_neighbours:
+    """k-nearest-neighbour search around atoms of a periodic cell.
+
+    The KDTree is shared between all instances for the same coordinates, see :func:`shared_kdtree`, so constructing one per atom to query is cheap. To query many atoms at once, use :func:`query`.
+
+    :param conquest_coordinates_processor: The :class:`conquest_coordinates_processor` to use.
+    :type conquest_coordinates_processor: ``conquest_coordinates_processor``
+    :param atom: The :class:`Atom` queried by :func:`get_result`, defaults to ``None``.
+    :type atom: ``Atom | None``, optional
+    """
+
     def __init__(
         self,
         conquest_coordinates_processor: conquest_coordinates_processor,
-        atom: Atom,
+        atom: Atom | None = None,
     ) -> None:
         self.coords_proc = conquest_coordinates_processor
-        self.kdtree = self.build_kdtree()
         self.atom_to_query = atom
 
+    @property
+    def kdtree(self) -> KDTree:
+        """The shared KDTree of the current coordinates, see :func:`shared_kdtree`."""
+        return self.build_kdtree()
+
     def build_kdtree(self) -> KDTree:
-        return KDTree(
-            self.coords_proc.coords.cart_position_vectors,
-            copy_data=True,
-            boxsize=[self.coords_proc.coords.lattice_vectors[i][i] for i in range(0, 3)],
+        return shared_kdtree(self.coords_proc.coords)
+
+    def query(
+        self, atoms: Sequence[Atom] | c2at.INT_ARRAY, num_neighbours: int
+    ) -> tuple[c2at.REAL_ARRAY, c2at.INT_ARRAY]:
+        """Find the ``num_neighbours`` nearest atoms of many atoms in one vectorised KDTree query.
+
+        As with :func:`get_result`, the nearest atom of an atom in the cell is itself.
+
+        :param atoms: :class:`Atom` s to query, or their indices in the cell.
+        :type atoms: ``Sequence[Atom] | INT_ARRAY``
+        :param num_neighbours: Number of neighbours of each atom.
+        :type num_neighbours: ``int``
+        :return: Distances in Bohr and indices of the neighbours, both of shape ``(len(atoms), num_neighbours)``.
+        :rtype: ``tuple[REAL_ARRAY, INT_ARRAY]``
+        """
+        coords = self.coords_proc.coords
+        tree = self.kdtree
+        if isinstance(atoms, np.ndarray):
+            query_positions = coords.cart_position_vectors[atoms]
+        else:
+            frac_coords = np.array([atom.coords for atom in atoms], dtype=np.float64)
+            query_positions = frac_coords.reshape(-1, 3) @ coords.lattice_vectors.T
+        wrap_positions(query_positions, _kdtree_box(coords), out=query_positions)
+        distances, indices = tree.query(
+            x=query_positions, k=[k + 1 for k in range(num_neighbours)], p=2, workers=-1
         )
+        return distances, indices.astype(np.int64)
 
     def _knn(self, atom_query: Atom, num_neighbours: int) -> tuple[Any, Any]:
         """Perform the KDTree query on number_of_neighbours around the specific Atom.
@@ -29,10 +164,12 @@ class nearest_neighbours:
         Returns:
             list[Atom]: The list of nearest-neighbour Atoms
         """
+        tree = self.kdtree
         atom_query_cart_coords = atom_query.coords @ self.coords_proc.coords.lattice_vectors.T
-        distances, indices = self.kdtree.query(
-            x=atom_query_cart_coords, k=num_neighbours, p=2, workers=-1
+        atom_query_cart_coords, _ = wrap_positions(
+            atom_query_cart_coords, _kdtree_box(self.coords_proc.coords)
         )
+        distances, indices = tree.query(x=atom_query_cart_coords, k=num_neighbours, p=2, workers=-1)
         return distances, indices
 
     def get_result(self, num_neighbours: int) -> list[tuple[float, Atom]]:
@@ -51,3 +188,252 @@ class nearest_neighbours:
             assoc_atom = (pair[0], self.coords_proc.coords.atoms[pair[1]])
             all_atoms.append(assoc_atom)
         return all_atoms
+
+
+def kdtree_pairs(positions: c2at.REAL_ARRAY, box: c2at.REAL_ARRAY, cutoff: float) -> c2at.INT_ARRAY:
+    """Every pair of atoms within ``cutoff`` of each other under periodic boundary conditions, from one periodic :class:`~scipy.spatial.KDTree` and a single :meth:`~scipy.spatial.KDTree.query_pairs` call.
+
+    :param positions: ``(N, 3)`` Cartesian positions, inside ``[0, box)``.
+    :type positions: :ref:`REAL ARRAY <types>`
+    :param box: Edge lengths of the orthorhombic cell.
+    :type box: :ref:`REAL ARRAY <types>`
+    :param cutoff: Largest distance between neighbours.
+    :type cutoff: ``float``
+    :return: ``(M, 2)`` pairs of atom indices, each pair once with the lower index first, in no particular order.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    tree = KDTree(positions, boxsize=box, copy_data=False)
+    pairs: c2at.INT_ARRAY = tree.query_pairs(cutoff, output_type="ndarray").astype(np.int64)
+    return pairs
+
+
+# Atoms whose candidate pairs are expanded at once by cell_list_pairs, bounding its memory use
+CELL_LIST_CHUNK_ATOMS: int = 4096
+
+
+def cell_list_pairs(
+    positions: c2at.REAL_ARRAY, box: c2at.REAL_ARRAY, cutoff: float
+) -> c2at.INT_ARRAY:
+    """Every pair of atoms within ``cutoff`` of each other under periodic boundary conditions, by linked-cell binning.
+
+    The cell is divided into a grid of bins at least ``cutoff`` wide, so the neighbours of an atom lie in its own bin or one of the 26 around it. Atoms are sorted by bin, and the candidate pairs of :data:`CELL_LIST_CHUNK_ATOMS` atoms at a time, over the 14 bin offsets that reach each pair once, are expanded and filtered by distance at once. The work is :math:`O(N)` at constant density. The grid is coarsened to at most about one bin per atom, which keeps sparse cells from allocating mostly empty bins.
+
+    :param positions: ``(N, 3)`` Cartesian positions, inside ``[0, box)``.
+    :type positions: :ref:`REAL ARRAY <types>`
+    :param box: Edge lengths of the orthorhombic cell.
+    :type box: :ref:`REAL ARRAY <types>`
+    :param cutoff: Largest distance between neighbours, less than half the smallest edge.
+    :type cutoff: ``float``
+    :return: ``(M, 2)`` pairs of atom indices, each pair once with the lower index first, in no particular order.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    natoms = len(positions)
+    nbins = np.maximum(np.floor(box / cutoff), 1)
+    excess = np.prod(nbins) / max(natoms, 1)
+    if excess > 1:
+        nbins = np.maximum(np.floor(nbins / excess ** (1 / 3)), 1)
+    nbins = nbins.astype(np.int64)
+    bins = np.minimum((positions * (nbins / box)).astype(np.int64), nbins - 1)
+    bin_ids = (bins[:, 0] * nbins[1] + bins[:, 1]) * nbins[2] + bins[:, 2]
+    order = np.argsort(bin_ids, kind="stable")
+    counts = np.bincount(bin_ids, minlength=int(np.prod(nbins)))
+    starts = np.cumsum(counts) - counts
+    sorted_positions = positions[order]
+    sorted_bins = bins[order]
+    # Offsets between neighbouring bins, modulo the grid. Offsets o and -o reach the same pairs
+    # from opposite ends, so only one of each is searched; offsets equal to their own inverse,
+    # such as (0, 0, 0), reach every pair twice and keep the one with the lower index first
+    stencil = {
+        tuple(int(o) for o in np.array(offset) % nbins) for offset in product((-1, 0, 1), repeat=3)
+    }
+    offsets = np.array(
+        [offset for offset in sorted(stencil) if tuple(-np.array(offset) % nbins) >= offset]
+    )
+    self_inverse = np.all(-offsets % nbins == offsets, axis=1)
+    # With three or more bins along every axis, the image of a neighbour is the one in the
+    # neighbouring bin, so shifts follow from the bins and no minimum-image search is needed
+    exact_images = bool(np.all(nbins >= 3))
+    signed_offsets = np.where(offsets <= 1, offsets, offsets - nbins) if exact_images else offsets
+    noffsets = len(offsets)
+    pairs: list[c2at.INT_ARRAY] = []
+    for start in range(0, natoms, CELL_LIST_CHUNK_ATOMS):
+        stop = min(start + CELL_LIST_CHUNK_ATOMS, natoms)
+        unwrapped = sorted_bins[start:stop, None, :] + signed_offsets[None, :, :]
+        wraps = unwrapped // nbins
+        neighbour_bins = unwrapped - wraps * nbins
+        neighbour_ids = (neighbour_bins[..., 0] * nbins[1] + neighbour_bins[..., 1]) * nbins[2]
+        neighbour_ids = (neighbour_ids + neighbour_bins[..., 2]).ravel()
+        # Expand every (atom, offset) slot into one candidate per atom of the neighbouring bin.
+        # Slots are expanded in order, so per-slot values are repeated rather than gathered
+        candidates = counts[neighbour_ids]
+        first = np.repeat(
+            np.arange(start, stop, dtype=np.int64), candidates.reshape(-1, noffsets).sum(axis=1)
+        )
+        second = np.arange(len(first), dtype=np.int64)
+        second += np.repeat(
+            starts[neighbour_ids] - (np.cumsum(candidates) - candidates), candidates
+        )
+        if exact_images:
+            origins = sorted_positions[start:stop, None, :] - wraps * box
+            difference = np.take(sorted_positions, second, axis=0)
+            difference -= np.repeat(origins.reshape(-1, 3), candidates, axis=0)
+        else:
+            difference = np.take(sorted_positions, second, axis=0)
+            difference -= np.take(sorted_positions, first, axis=0)
+            difference -= np.rint(difference / box) * box
+        within = np.einsum("ij,ij->i", difference, difference) <= cutoff * cutoff
+        slot_self_inverse = np.tile(self_inverse, stop - start)
+        within &= (first < second) | ~np.repeat(slot_self_inverse, candidates)
+        pairs.append(np.column_stack([order[first[within]], order[second[within]]]))
+    found = np.concatenate(pairs + [np.empty((0, 2), dtype=np.int64)])
+    found.sort(axis=1)
+    return found
+
+
+# Thresholds from benchmarks/bench_neighbours.py. SciPy's KDTree is faster up to ~100k atoms; by
+# ~1M atoms with a few atoms per bin the O(N) cell list is level with it
+CELL_LIST_MIN_ATOMS: int = 1_000_000
+CELL_LIST_MIN_BINS: int = 3
+CELL_LIST_MAX_BIN_ATOMS: float = 4.0
+
+
+def choose_method(
+    natoms: int, box: c2at.REAL_ARRAY, cutoff: float
+) -> Literal["kdtree", "cell_list"]:
+    """Pick the neighbour search for a cell, from its size, density and the cutoff.
+
+    The cell list is chosen for cells of at least :data:`CELL_LIST_MIN_ATOMS` atoms, with at least :data:`CELL_LIST_MIN_BINS` bins along every axis and at most :data:`CELL_LIST_MAX_BIN_ATOMS` atoms per bin on average. Otherwise the KDTree is chosen: it is faster on smaller cells, and on dense cells where most candidates of a bin lie beyond the cutoff.
+
+    :param natoms: Number of atoms.
+    :type natoms: ``int``
+    :param box: Edge lengths of the orthorhombic cell.
+    :type box: :ref:`REAL ARRAY <types>`
+    :param cutoff: Largest distance between neighbours.
+    :type cutoff: ``float``
+    :return: ``"kdtree"`` or ``"cell_list"``.
+    :rtype: ``Literal["kdtree", "cell_list"]``
+    """
+    nbins = np.floor(box / cutoff)
+    if (
+        natoms >= CELL_LIST_MIN_ATOMS
+        and np.all(nbins >= CELL_LIST_MIN_BINS)
+        and natoms / np.prod(nbins) <= CELL_LIST_MAX_BIN_ATOMS
+    ):
+        return "cell_list"
+    return "kdtree"
+
+
+NEIGHBOUR_METHODS = {"kdtree": kdtree_pairs, "cell_list": cell_list_pairs}
+
+
+class neighbour_list:
+    """Periodic neighbour list of every atom within ``cutoff`` of each other, in compressed sparse row (CSR) form.
+
+    The neighbours of atom ``i`` are entries ``offsets[i]:offsets[i + 1]`` of :attr:`indices`, :attr:`distances` and :attr:`shifts`, ordered by neighbour index. Atom ``j`` with shift :math:`s` is the periodic image at :math:`r_j + Ls`, so the bond vector from ``i`` is :math:`r_j + Ls - r_i` for the Cartesian positions the list was built from, :attr:`positions`, whether or not they lie inside the cell. Every bond appears once from each end, with opposite shifts.
+
+    Pairs within the cutoff are found by one of two methods, after which shifts and distances are computed for all pairs at once:
+
+    - ``"kdtree"``: a single periodic :class:`~scipy.spatial.KDTree` is built over all atoms and queried once with :meth:`~scipy.spatial.KDTree.query_pairs`, see :func:`kdtree_pairs`. This is several times faster than per-atom :meth:`~scipy.spatial.KDTree.query_ball_point`, whose results are Python lists.
+    - ``"cell_list"``: atoms are binned on a grid along the cell edges and only neighbouring bins are compared, see :func:`cell_list_pairs`. Faster for large, dense cells with short cutoffs.
+
+    ``"auto"`` picks one with :func:`choose_method`. Both give the same list.
+
+    :param conquest_coordinates_processor: The :class:`conquest_coordinates_processor` to use.
+    :type conquest_coordinates_processor: ``conquest_coordinates_processor``
+    :param cutoff: Largest distance between neighbours, in Bohr.
+    :type cutoff: ``float``
+    :param method: Pair search, ``"auto"``, ``"kdtree"`` or ``"cell_list"``, defaults to ``"auto"``.
+    :type method: ``Literal["auto", "kdtree", "cell_list"]``, optional
+    :raises ValueError: If the cell is not orthorhombic, or ``cutoff`` is not positive or is at least half an edge of the cell, where an atom could neighbour two images of another, or if ``method`` is unknown.
+    """
+
+    def __init__(
+        self,
+        conquest_coordinates_processor: conquest_coordinates_processor,
+        cutoff: float,
+        method: Literal["auto", "kdtree", "cell_list"] = "auto",
+    ) -> None:
+        self.coords_proc = conquest_coordinates_processor
+        self.box: c2at.REAL_ARRAY = orthorhombic_box(self.coords_proc.coords.lattice_vectors)
+        if not 0 < cutoff < np.min(self.box) / 2:
+            raise ValueError("Cutoff must be positive and less than half the smallest cell edge.")
+        self.cutoff = cutoff
+        if method == "auto":
+            method = choose_method(len(self.coords_proc.coords), self.box, cutoff)
+        elif method not in NEIGHBOUR_METHODS:
+            raise ValueError(f"Unknown neighbour search method {method}.")
+        self.method: Literal["kdtree", "cell_list"] = method
+        self.offsets: c2at.INT_ARRAY
+        self.indices: c2at.INT_ARRAY
+        self.distances: c2at.REAL_ARRAY
+        self.shifts: c2at.INT_ARRAY
+        self.positions: c2at.REAL_ARRAY
+        self.build()
+
+    def build(self) -> None:
+        """Find every pair of atoms within the cutoff and fill the CSR arrays."""
+        # A copy, so that bond vectors match the shifts even if the stored positions are later edited
+        positions = np.array(self.coords_proc.coords.cart_position_vectors, dtype=np.float64)
+        self.positions = positions
+        wrapped, cells = wrap_positions(positions, self.box)
+        pairs = NEIGHBOUR_METHODS[self.method](wrapped, self.box, self.cutoff)
+        first, second = pairs[:, 0], pairs[:, 1]
+        difference = wrapped[second]
+        difference -= wrapped[first]
+        # Minimum-image shift between the wrapped positions, then relative to the stored ones
+        image = np.rint(difference / self.box)
+        difference -= image * self.box
+        image -= cells[first]
+        image += cells[second]
+        distance = np.sqrt(np.einsum("ij,ij->i", difference, difference))
+        # Every bond from both ends, sorted by centre then neighbour. The keys are unique, so the
+        # sort need not be stable
+        centres = np.concatenate([first, second])
+        self.indices = np.concatenate([second, first])
+        order = np.argsort(centres * len(positions) + self.indices)
+        self.indices = self.indices[order]
+        self.distances = np.concatenate([distance, distance])[order]
+        self.shifts = np.concatenate([-image, image]).astype(np.int64)[order]
+        counts = np.bincount(centres, minlength=len(positions))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def neighbours(self, index: int) -> tuple[c2at.INT_ARRAY, c2at.REAL_ARRAY, c2at.INT_ARRAY]:
+        """Neighbours of one atom, as views of the CSR arrays.
+
+        :param index: Index of the atom.
+        :type index: ``int``
+        :return: Neighbour indices, distances in Bohr and image shifts.
+        :rtype: ``tuple[INT_ARRAY, REAL_ARRAY, INT_ARRAY]``
+        """
+        rows = slice(self.offsets[index], self.offsets[index + 1])
+        return self.indices[rows], self.distances[rows], self.shifts[rows]
+
+    def centres(self) -> c2at.INT_ARRAY:
+        """Index of the central atom of every entry, i.e. the CSR arrays expanded to coordinate (COO) form.
+
+        :return: Atom indices, aligned with :attr:`indices`.
+        :rtype: :ref:`INT ARRAY <types>`
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+
+    def coordination_numbers(self) -> c2at.INT_ARRAY:
+        """Number of neighbours of every atom.
+
+        :return: Neighbour counts.
+        :rtype: :ref:`INT ARRAY <types>`
+        """
+        return np.diff(self.offsets)
+
+    def bond_vectors(self) -> c2at.REAL_ARRAY:
+        """Cartesian vector from every atom to each of its neighbours, e.g. for bond angles.
+
+        :return: ``(M, 3)`` vectors in Bohr, aligned with :attr:`indices`.
+        :rtype: :ref:`REAL ARRAY <types>`
+        """
+        vectors: c2at.REAL_ARRAY = (
+            self.positions[self.indices] + self.shifts * self.box - self.positions[self.centres()]
+        )
+        return vectors
@@ -4,13 +4,16 @@ if sys.version_info >= (3, 12):
 else:
     from typing_extensions import Any, override
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 import re
-from matplotlib.axes import Axes
 import numpy as np
-import matplotlib.pyplot as plt
 from conquest2a.conquest import block_processor
+from conquest2a.constants import apply_plot_style
 import conquest2a._types as c2at
 
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
 
 @dataclass
 class band:
@@ -139,6 +142,9 @@ class bst:
                 "No bands remain after filtering. Check your band_range / energy_range arguments."
             )
 
+        import matplotlib.pyplot as plt
+
+        apply_plot_style()
         _fig, ax = plt.subplots(1, 1, figsize=figsize)
         _ = ax.set_ylabel(ylabel)
         self._draw_bands(ax, bands)
@@ -186,7 +192,7 @@ class bst:
 
         return result
 
-    def _draw_bands(self, ax: Axes, bands: list[band]) -> None:
+    def _draw_bands(self, ax: "Axes", bands: list[band]) -> None:
         """Plot each band as energy versus sequential k-point index.
 
         Spin-up bands (``spin == 1``) and spin-down bands (``spin == 2``) are
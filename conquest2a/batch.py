@@ -0,0 +1,283 @@
+"""
+Batch conversion of many CONQUEST coordinates files over a pool of processes.
+
+Each file is read by :class:`~conquest2a.conquest.conquest_coordinates_processor` and written by one writer per requested format. Files are independent, so they are spread over a :class:`~concurrent.futures.ProcessPoolExecutor`, and a failure in one file is recorded rather than stopping the batch.
+
+Run as a script with ``python -m conquest2a.batch`` or ``conquest2a-batch``, see :func:`main`.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from collections.abc import Callable, Iterable, Sequence
+from conquest2a.conquest import (
+    conquest_coordinates,
+    conquest_coordinates_processor,
+    conquest_species,
+)
+from conquest2a.writers import extxyz_writer, file_writer, vasp_writer, xsf_writer, xyz_writer
+
+# Format name -> (writer class, file extension)
+FORMATS: dict[str, tuple[Callable[[str, conquest_coordinates], file_writer], str]] = {
+    "vasp": (vasp_writer, ".vasp"),
+    "xyz": (xyz_writer, ".xyz"),
+    "extxyz": (extxyz_writer, ".extxyz"),
+    "xsf": (xsf_writer, ".xsf"),
+}
+
+# Species map of a worker process, set once by _init_worker
+_worker_species: conquest_species | None = None
+
+
+@dataclass
+class batch_result:
+    """Outcome of converting one coordinates file.
+
+    :param path: The coordinates file.
+    :type path: ``str``
+    :param outputs: Files written.
+    :type outputs: ``list[str]``
+    :param seconds: Wall time spent on the file.
+    :type seconds: ``float``
+    :param error: Traceback of the failure, or ``None`` if the file was converted.
+    :type error: ``str | None``
+    """
+
+    path: str
+    outputs: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def expand_inputs(patterns: Iterable[str] = (), manifest: str | None = None) -> list[str]:
+    """Collect the coordinates files of a batch.
+
+    :param patterns: Paths or glob patterns; ``**`` matches directories recursively. Patterns that match nothing are kept as paths, so that they are reported as failures.
+    :type patterns: ``Iterable[str]``
+    :param manifest: File listing one path per line. Blank lines and lines starting with ``#`` are ignored. Defaults to ``None``.
+    :type manifest: ``str | None``, optional
+    :return: The files, in order, without duplicates.
+    :rtype: ``list[str]``
+    """
+    paths: list[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        paths.extend(matches if matches else [pattern])
+    if manifest is not None:
+        with open(manifest, "r", encoding="utf-8") as manifest_file:
+            for line in manifest_file:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    paths.append(line)
+    return list(dict.fromkeys(paths))
+
+
+def output_path(path: str, file_format: str, output_dir: str | None = None) -> str:
+    """Path of the ``file_format`` file converted from ``path``: the same name with the extension of the format, in ``output_dir`` or next to ``path``."""
+    source = Path(path)
+    directory = Path(output_dir) if output_dir is not None else source.parent
+    return str(directory / f"{source.stem}{FORMATS[file_format][1]}")
+
+
+def check_outputs(
+    paths: Sequence[str], formats: Sequence[str], output_dir: str | None = None
+) -> None:
+    """Check that no two files of a batch would be written to the same place, e.g. files with the same name from different directories converted into one ``output_dir``.
+
+    :raises ValueError: If two outputs have the same path.
+    """
+    destinations = Counter(
+        os.path.abspath(output_path(path, file_format, output_dir))
+        for path in paths
+        for file_format in formats
+    )
+    clashes = sorted(dest for dest, count in destinations.items() if count > 1)
+    if clashes:
+        raise ValueError(f"Several input files would be written to each of {clashes}.")
+
+
+def _init_worker(species_dict: dict[int, str]) -> None:
+    global _worker_species
+    _worker_species = conquest_species(species_dict)
+
+
+def convert_file(
+    path: str,
+    formats: Sequence[str],
+    output_dir: str | None = None,
+    species: conquest_species | None = None,
+) -> batch_result:
+    """Convert one coordinates file to every format in ``formats``. Exceptions are caught and recorded in the result.
+
+    :param path: The coordinates file.
+    :type path: ``str``
+    :param formats: Names of formats to write, keys of :data:`FORMATS`.
+    :type formats: ``Sequence[str]``
+    :param output_dir: Directory to write to, defaults to ``None`` meaning next to ``path``.
+    :type output_dir: ``str | None``, optional
+    :param species: Species map, defaults to ``None`` meaning the one the worker process was started with.
+    :type species: ``conquest_species | None``, optional
+    :return: The outcome of the conversion.
+    :rtype: :class:`batch_result`
+    """
+    result = batch_result(path=path)
+    start = time.perf_counter()
+    try:
+        species = species if species is not None else _worker_species
+        if species is None:
+            raise RuntimeError("No species map given.")
+        coords = conquest_coordinates_processor(path, species).coords
+        for file_format in formats:
+            writer, _extension = FORMATS[file_format]
+            dest = output_path(path, file_format, output_dir)
+            writer(dest, coords)
+            result.outputs.append(dest)
+    except Exception:
+        result.error = traceback.format_exc()
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def batch_convert(
+    paths: Sequence[str],
+    species_dict: dict[int, str],
+    formats: Sequence[str],
+    output_dir: str | None = None,
+    workers: int | None = None,
+    chunksize: int = 1,
+) -> list[batch_result]:
+    """Convert many coordinates files in parallel.
+
+    Every worker process builds the species map once when it starts, rather than receiving it with each file. With ``workers=1`` files are converted in this process.
+
+    :param paths: The coordinates files, see :func:`expand_inputs`.
+    :type paths: ``Sequence[str]``
+    :param species_dict: Species map shared by every file, see :class:`~conquest2a.conquest.conquest_species`.
+    :type species_dict: ``dict[int, str]``
+    :param formats: Names of formats to write, keys of :data:`FORMATS`.
+    :type formats: ``Sequence[str]``
+    :param output_dir: Directory to write to, defaults to ``None`` meaning next to each file.
+    :type output_dir: ``str | None``, optional
+    :param workers: Number of worker processes, defaults to ``None`` meaning the number of CPUs.
+    :type workers: ``int | None``, optional
+    :param chunksize: Number of files sent to a worker at a time. Larger chunks reduce overhead for many small files, defaults to 1.
+    :type chunksize: ``int``, optional
+    :raises ValueError: If a format is unknown, ``workers`` or ``chunksize`` is not positive, or two files would be written to the same path, see :func:`check_outputs`.
+    :return: One result per file, in the order of ``paths``.
+    :rtype: ``list[batch_result]``
+    """
+    unknown = [file_format for file_format in formats if file_format not in FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown formats {unknown}, expected some of {list(FORMATS)}.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0 or chunksize <= 0:
+        raise ValueError("Number of workers and chunk size must be positive.")
+    check_outputs(paths, formats, output_dir)
+    # Validate the species map before starting any workers
+    species = conquest_species(species_dict)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    if workers == 1 or len(paths) <= 1:
+        return [convert_file(path, formats, output_dir, species) for path in paths]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(paths)), initializer=_init_worker, initargs=(species_dict,)
+    ) as executor:
+        return list(
+            executor.map(
+                convert_file,
+                paths,
+                [formats] * len(paths),
+                [output_dir] * len(paths),
+                chunksize=chunksize,
+            )
+        )
+
+
+def parse_species(items: Sequence[str]) -> dict[int, str]:
+    """Parse a species map given as ``index=label`` strings, e.g. ``["1=Bi", "2=Mn"]``.
+
+    :raises ValueError: If an item is not of the form ``index=label``.
+    """
+    species_dict: dict[int, str] = {}
+    for item in items:
+        index, sep, label = item.partition("=")
+        if not sep or not index.strip().isdigit() or not label.strip():
+            raise ValueError(f"Species must be given as index=label, got {item}.")
+        species_dict[int(index)] = label.strip()
+    return species_dict
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command line entry point. Prints the outcome and timing of every file.
+
+    .. code-block:: console
+
+      conquest2a-batch "runs/**/coord_*.in" --species 1=Bi 2=Mn 3=O --format vasp xyz --workers 8
+
+    :param argv: Command line arguments, defaults to ``None`` meaning :data:`sys.argv`.
+    :type argv: ``Sequence[str] | None``, optional
+    :return: Exit status: 0 if every file was converted, 1 if any failed.
+    :rtype: ``int``
+    """
+    parser = argparse.ArgumentParser(
+        prog="conquest2a-batch", description="Convert many CONQUEST coordinates files."
+    )
+    parser.add_argument("inputs", nargs="*", help="Coordinates files or glob patterns.")
+    parser.add_argument("--manifest", help="File listing one coordinates file per line.")
+    parser.add_argument(
+        "--species", nargs="+", required=True, help="Species map as index=label, e.g. 1=Bi 2=O."
+    )
+    parser.add_argument(
+        "--format", nargs="+", dest="formats", default=["vasp"], choices=list(FORMATS)
+    )
+    parser.add_argument("--output-dir", help="Directory to write to, defaults to next to inputs.")
+    parser.add_argument("--workers", type=int, default=None, help="Defaults to the CPU count.")
+    parser.add_argument("--chunksize", type=int, default=1, help="Files sent to a worker at once.")
+    args = parser.parse_intermixed_args(argv)
+
+    paths = expand_inputs(args.inputs, args.manifest)
+    if not paths:
+        parser.error("No coordinates files given.")
+    try:
+        species_dict = parse_species(args.species)
+    except ValueError as err:
+        parser.error(str(err))
+    start = time.perf_counter()
+    try:
+        results = batch_convert(
+            paths,
+            species_dict,
+            args.formats,
+            output_dir=args.output_dir,
+            workers=args.workers,
+            chunksize=args.chunksize,
+        )
+    except ValueError as err:
+        parser.error(str(err))
+    failures = [result for result in results if not result.ok]
+    for result in results:
+        status = "ok" if result.ok else "FAILED"
+        print(f"{status:>6} {result.seconds:9.3f}s {result.path}")
+    for result in failures:
+        print(f"\n{result.path}:\n{result.error}", file=sys.stderr)
+    print(
+        f"{len(results) - len(failures)}/{len(results)} files converted "
+        f"in {time.perf_counter() - start:.3f}s"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
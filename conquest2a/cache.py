@@ -0,0 +1,162 @@
+"""
+Opt-in on-disk cache of parsed CONQUEST coordinates files.
+
+Each parsed file is stored as an uncompressed ``.npz`` snapshot of its lattice and atom columns.
+Loading a snapshot skips parsing, Cartesian conversion and labelling entirely.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+import numpy as np
+import conquest2a._types as c2at
+from conquest2a.conquest import atom_columns, conquest_coordinates
+
+# Bump when the layout of a snapshot changes, so that old snapshots are ignored
+_SNAPSHOT_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """The default cache location, ``$XDG_CACHE_HOME/conquest2a`` or ``~/.cache/conquest2a``.
+
+    :return: Path to the default cache directory.
+    :rtype: ``Path``
+    """
+    base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return Path(base) / "conquest2a"
+
+
+class coordinates_cache:
+    """Size-bounded cache of parsed CONQUEST coordinates files, see :class:`~conquest2a.conquest.conquest_coordinates_processor`.
+
+    A snapshot is keyed on the absolute path of the coordinates file and the species map used to label it. It is reused if the file's size and modification time are unchanged. If only the modification time changed, the file is re-hashed and the snapshot is reused if its content hash still matches.
+
+    When the total size of the snapshots exceeds ``max_bytes``, the least recently used snapshots are deleted.
+
+    :param cache_dir: Directory to keep snapshots in, defaults to ``None`` meaning :func:`default_cache_dir`.
+    :type cache_dir: ``str | Path | None``, optional
+    :param max_bytes: Maximum total size of the cache in bytes, defaults to 1 GiB.
+    :type max_bytes: ``int``, optional
+    :raises ValueError: If ``max_bytes`` is not positive.
+    """
+
+    def __init__(self, cache_dir: c2at.FILE_PATH | None = None, max_bytes: int = 1 << 30) -> None:
+        if max_bytes <= 0:
+            raise ValueError("Cache size must be positive.")
+        self.cache_dir: Path = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_bytes: int = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def entry_path(self, path: Path, coords: conquest_coordinates) -> Path:
+        """Path of the snapshot for the coordinates file ``path`` read with the species map of ``coords``."""
+        key = hashlib.blake2b(digest_size=16)
+        key.update(str(path.resolve()).encode("utf-8"))
+        key.update(repr(sorted(coords.conquest_input.species_dict.items())).encode("utf-8"))
+        return self.cache_dir / f"{key.hexdigest()}.npz"
+
+    @staticmethod
+    def content_hash(path: Path) -> str:
+        """Hash the contents of ``path``.
+
+        :param path: File to hash.
+        :type path: ``Path``
+        :return: Hex digest of the file contents.
+        :rtype: ``str``
+        """
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "blake2b").hexdigest()
+
+    def load(self, path: Path, coords: conquest_coordinates) -> bool:
+        """Populate ``coords`` from the snapshot of ``path``, if there is a valid one.
+
+        :param path: The CONQUEST coordinates file.
+        :type path: ``Path``
+        :param coords: The :class:`~conquest2a.conquest.conquest_coordinates` to populate.
+        :type coords: ``conquest_coordinates``
+        :return: Whether a valid snapshot was found and loaded.
+        :rtype: ``bool``
+        """
+        entry = self.entry_path(path, coords)
+        if not entry.exists():
+            return False
+        stat = os.stat(path)
+        refreshed_hash: str | None = None
+        try:
+            with np.load(entry, allow_pickle=False) as snapshot:
+                if int(snapshot["version"]) != _SNAPSHOT_VERSION or int(snapshot["size"]) != (
+                    stat.st_size
+                ):
+                    return False
+                if int(snapshot["mtime_ns"]) != stat.st_mtime_ns:
+                    refreshed_hash = str(snapshot["content_hash"])
+                    if refreshed_hash != self.content_hash(path):
+                        return False
+                columns = atom_columns()
+                for name in atom_columns.NAMES:
+                    setattr(columns, name, snapshot[name])
+                coords.lattice_vectors = snapshot["lattice_vectors"]
+                coords.natoms = str(snapshot["natoms"])
+        except (OSError, ValueError, KeyError):
+            # A corrupt or partially-written snapshot is treated as a miss
+            return False
+        coords.columns = columns
+        if refreshed_hash is not None:
+            # Same content, new modification time: record it so the next load skips hashing
+            self.store(path, coords, content_hash=refreshed_hash)
+        else:
+            # Modification time of a snapshot records when it was last used
+            os.utime(entry)
+        return True
+
+    def store(
+        self, path: Path, coords: conquest_coordinates, content_hash: str | None = None
+    ) -> None:
+        """Write a snapshot of ``coords``, parsed from ``path``, then evict old snapshots if the cache is too large.
+
+        :param path: The CONQUEST coordinates file ``coords`` was read from.
+        :type path: ``Path``
+        :param coords: The parsed :class:`~conquest2a.conquest.conquest_coordinates`.
+        :type coords: ``conquest_coordinates``
+        :param content_hash: Content hash of ``path`` if already known, defaults to ``None``.
+        :type content_hash: ``str | None``, optional
+        """
+        stat = os.stat(path)
+        entry = self.entry_path(path, coords)
+        arrays: dict[str, c2at.GENERIC_ARRAY] = {
+            name: getattr(coords.columns, name) for name in atom_columns.NAMES
+        }
+        arrays["lattice_vectors"] = coords.lattice_vectors
+        arrays["natoms"] = np.array(coords.natoms)
+        arrays["content_hash"] = np.array(
+            self.content_hash(path) if content_hash is None else content_hash
+        )
+        arrays["version"] = np.array(_SNAPSHOT_VERSION)
+        arrays["size"] = np.array(stat.st_size)
+        arrays["mtime_ns"] = np.array(stat.st_mtime_ns)
+        # Write to a temporary file first so readers never see a partial snapshot
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.savez(tmp_file, **arrays)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used snapshots until the cache fits in ``max_bytes``."""
+        entries = [(entry.stat(), entry) for entry in self.cache_dir.glob("*.npz")]
+        entries.sort(key=lambda item: item[0].st_mtime_ns)
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def clear(self) -> None:
+        """Delete every snapshot in the cache."""
+        for entry in self.cache_dir.glob("*.npz"):
+            entry.unlink(missing_ok=True)
@@ -4,17 +4,9 @@ from ase.atoms import Atoms
 from ase.io.cube import read_cube
 from ase.units import Bohr
 from scipy.ndimage import map_coordinates
-import matplotlib as mpl
-from matplotlib import colors
-from mpl_toolkits.axes_grid1 import make_axes_locatable as mal
-import matplotlib.pyplot as plt
-import scienceplots
 from conquest2a._types import INT_ARRAY, REAL_ARRAY
 from conquest2a.conquest import processor_base
-from conquest2a.constants import MPLGENERIC
-
-mpl.rcParams.update(MPLGENERIC)
-plt.style.use(["science", "no-latex"])
+from conquest2a.constants import apply_plot_style
 
 _ELEMENT_COLOURS: dict[str, str] = {
     # Alkali metals
@@ -383,6 +375,11 @@ class chden_plot:
             v1, v2 = v2, v1
             transpose_label = True
 
+        from matplotlib import colors
+        from mpl_toolkits.axes_grid1 import make_axes_locatable as mal
+        import matplotlib.pyplot as plt
+
+        apply_plot_style()
         fig_w: float = 5.0
         fig_h = fig_w * (l2 / l1) + 0.5
         fig, ax = plt.subplots(figsize=(fig_w, fig_h))
@@ -1,6 +1,5 @@
-from dataclasses import dataclass, field
 from re import Pattern
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, overload
 import sys
 if sys.version_info >= (3, 12):
     from typing import override
@@ -8,19 +7,121 @@ else:
     from typing_extensions import override
 import os
 import re
-import importlib.resources
+import warnings
+import functools
+import mmap
 from pathlib import Path
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
 import numpy as np
 import ase
 from conquest2a.constants import BOHR_TO_ANGSTROM_VOLUME
+from conquest2a.elements import ELEMENT_FILE, element_labels, element_table
 import conquest2a._types as c2at
 
+if TYPE_CHECKING:
+    from conquest2a.cache import coordinates_cache
+
+# Element symbols are at most two characters long
+_LABEL_DTYPE = "<U2"
+# <double> <double> <double> <int> <char> <char> <char>
+_ATOM_LINE_DTYPE = np.dtype(
+    [("coords", np.float64, 3), ("species", np.int64), ("can_move", "<U1", 3)]
+)
+
+
+class atom_columns:
+    """Structure-of-arrays storage for the per-atom data of a cell.
+
+    Every quantity is held as one contiguous array whose first axis runs over the atoms, in coordinate-file order. Whole-cell operations (Cartesian conversion, labelling, writing) therefore act on columns rather than on individual :class:`Atom` objects.
+
+    :param natoms: Number of rows to allocate, defaults to 0.
+    :type natoms: ``int``, optional
+    """
+
+    # Names of the column attributes
+    NAMES: tuple[str, ...] = (
+        "species",
+        "frac_coords",
+        "cart_coords",
+        "forces",
+        "spins",
+        "can_move",
+        "numbers",
+        "labels",
+    )
+
+    def __init__(self, natoms: int = 0) -> None:
+        self.species: c2at.INT_ARRAY = np.zeros(natoms, dtype=np.int64)
+        self.frac_coords: c2at.REAL_ARRAY = np.zeros((natoms, 3), dtype=np.float64)
+        self.cart_coords: c2at.REAL_ARRAY = np.zeros((natoms, 3), dtype=np.float64)
+        self.forces: c2at.REAL_ARRAY = np.zeros((natoms, 3), dtype=np.float64)
+        self.spins: c2at.REAL_ARRAY = np.zeros((natoms, 3), dtype=np.float64)
+        self.can_move: c2at.BOOL_ARRAY = np.ones((natoms, 3), dtype=np.bool_)
+        self.numbers: c2at.INT_ARRAY = np.arange(1, natoms + 1, dtype=np.int64)
+        self.labels: c2at.STR_ARRAY = np.full(natoms, "", dtype=_LABEL_DTYPE)
+
+    def __len__(self) -> int:
+        return int(self.species.shape[0])
+
+    @classmethod
+    def from_atoms(cls, atoms: Sequence["Atom"]) -> "atom_columns":
+        """Pack a sequence of :class:`Atom` s into a new set of columns.
+
+        :param atoms: The atoms to pack, in order.
+        :type atoms: ``Sequence[Atom]``
+        :return: Columns holding a copy of the data of ``atoms``.
+        :rtype: :class:`atom_columns`
+        """
+        columns = cls(len(atoms))
+        for row, atom in enumerate(atoms):
+            columns.species[row] = atom.species
+            columns.frac_coords[row] = atom.coords
+            columns.cart_coords[row] = atom.cart_coords
+            columns.forces[row] = atom.forces
+            columns.spins[row] = atom.spins
+            columns.can_move[row] = atom.can_move_mask
+            columns.numbers[row] = atom.number
+            columns.labels[row] = atom.label
+        return columns
+
+    def take(self, indices: c2at.INT_ARRAY) -> "atom_columns":
+        """Copy a subset of rows into a new set of columns.
+
+        :param indices: Row indices to copy. Rows may repeat.
+        :type indices: :ref:`INT ARRAY <types>`
+        :return: New columns with ``len(indices)`` rows.
+        :rtype: :class:`atom_columns`
+        """
+        columns = atom_columns()
+        columns.species = self.species[indices]
+        columns.frac_coords = self.frac_coords[indices]
+        columns.cart_coords = self.cart_coords[indices]
+        columns.forces = self.forces[indices]
+        columns.spins = self.spins[indices]
+        columns.can_move = self.can_move[indices]
+        columns.numbers = self.numbers[indices]
+        columns.labels = self.labels[indices]
+        return columns
+
+    def repeat(self, repeats: int) -> "atom_columns":
+        """Copy every row ``repeats`` times in a row, without building an index array.
+
+        :param repeats: Number of copies of each row.
+        :type repeats: ``int``
+        :return: New columns with ``repeats * len(self)`` rows: ``repeats`` copies of row 0, then of row 1, and so on.
+        :rtype: :class:`atom_columns`
+        """
+        columns = atom_columns()
+        for name in atom_columns.NAMES:
+            setattr(columns, name, np.repeat(getattr(self, name), repeats, axis=0))
+        return columns
+
 
-@dataclass
 class Atom:
     """Class which holds Atom data.
 
+    An ``Atom`` is a lightweight view onto one row of an :class:`atom_columns` instance: reading an attribute reads the row, and assigning to it writes the row back. Atoms created directly through the constructor own a private single-row store.
+
     :param species: The integer referring to the species as defined in the ``Conquest_input`` file.
     :type species: ``int``
     :param coords: Fractional coordinates of the atom in the interval :math:`[0,1)`. Numbers outside this range are wrapped back into the range.
@@ -31,22 +132,126 @@ class Atom:
     :type number: ``int``
     :param label: The atom element
     :type label: ``str``
-    :param cart_coords: Cartesian coordinates of the atom.
-    :type cart_coords: :ref:`REAL ARRAY <types>`
     :param forces: Force vector of the atom, defaults to ``np.array([0.0, 0.0, 0.0])``.
     :type forces: :ref:`REAL ARRAY <types>`
     :param spins: Spin moment on the atom,  defaults to ``np.array([0.0, 0.0, 0.0])``.
     :type spins: :ref:`REAL ARRAY <types>`
     """
 
-    species: int
-    coords: c2at.REAL_ARRAY
-    can_move: Sequence[str]
-    number: int
-    label: str = ""
-    cart_coords: c2at.REAL_ARRAY = field(init=False)
-    forces: c2at.REAL_ARRAY = field(default_factory=lambda: np.array([0.0, 0.0, 0.0]))
-    spins: c2at.REAL_ARRAY = field(default_factory=lambda: np.array([0.0, 0.0, 0.0]))
+    __slots__ = ("_columns", "_row")
+
+    def __init__(
+        self,
+        species: int,
+        coords: c2at.REAL_ARRAY,
+        can_move: Sequence[str],
+        number: int,
+        label: str = "",
+        forces: c2at.REAL_ARRAY | None = None,
+        spins: c2at.REAL_ARRAY | None = None,
+    ) -> None:
+        self._columns: atom_columns = atom_columns(1)
+        self._row: int = 0
+        self.species = species
+        self.coords = coords
+        self.can_move = can_move
+        self.number = number
+        self.label = label
+        if forces is not None:
+            self.forces = forces
+        if spins is not None:
+            self.spins = spins
+
+    @classmethod
+    def view(cls, columns: atom_columns, row: int) -> "Atom":
+        """Create an ``Atom`` backed by row ``row`` of ``columns`` without copying any data.
+
+        :param columns: The column store to view.
+        :type columns: :class:`atom_columns`
+        :param row: Row index into ``columns``.
+        :type row: ``int``
+        :return: The atom view.
+        :rtype: :class:`Atom`
+        """
+        atom = cls.__new__(cls)
+        atom._columns = columns
+        atom._row = row
+        return atom
+
+    @property
+    def species(self) -> int:
+        return int(self._columns.species[self._row])
+
+    @species.setter
+    def species(self, value: int) -> None:
+        self._columns.species[self._row] = value
+
+    @property
+    def coords(self) -> c2at.REAL_ARRAY:
+        return self._columns.frac_coords[self._row]
+
+    @coords.setter
+    def coords(self, value: c2at.REAL_ARRAY) -> None:
+        self._columns.frac_coords[self._row] = value
+
+    @property
+    def cart_coords(self) -> c2at.REAL_ARRAY:
+        return self._columns.cart_coords[self._row]
+
+    @cart_coords.setter
+    def cart_coords(self, value: c2at.REAL_ARRAY) -> None:
+        self._columns.cart_coords[self._row] = value
+
+    @property
+    def forces(self) -> c2at.REAL_ARRAY:
+        return self._columns.forces[self._row]
+
+    @forces.setter
+    def forces(self, value: c2at.REAL_ARRAY) -> None:
+        self._columns.forces[self._row] = value
+
+    @property
+    def spins(self) -> c2at.REAL_ARRAY:
+        return self._columns.spins[self._row]
+
+    @spins.setter
+    def spins(self, value: c2at.REAL_ARRAY) -> None:
+        self._columns.spins[self._row] = value
+
+    @property
+    def can_move(self) -> list[str]:
+        return ["T" if flag else "F" for flag in self._columns.can_move[self._row]]
+
+    @can_move.setter
+    def can_move(self, value: Sequence[str]) -> None:
+        self._columns.can_move[self._row] = [flag == "T" for flag in value]
+
+    @property
+    def can_move_mask(self) -> c2at.BOOL_ARRAY:
+        return self._columns.can_move[self._row]
+
+    @property
+    def number(self) -> int:
+        return int(self._columns.numbers[self._row])
+
+    @number.setter
+    def number(self, value: int) -> None:
+        self._columns.numbers[self._row] = value
+
+    @property
+    def label(self) -> str:
+        return str(self._columns.labels[self._row])
+
+    @label.setter
+    def label(self, value: str) -> None:
+        self._columns.labels[self._row] = value
+
+    def __repr__(self) -> str:
+        return (
+            f"Atom(species={self.species}, coords={self.coords!r}, can_move={self.can_move}, "
+            f"number={self.number}, label={self.label!r}, cart_coords={self.cart_coords!r}, "
+            f"forces={self.forces!r}, spins={self.spins!r})"
+        )
 
     def __str__(self) -> str:
         def fmt_array(arr: c2at.REAL_ARRAY) -> str:
@@ -76,10 +281,63 @@ class Atom:
         )
 
 
+class atom_sequence(Sequence[Atom]):
+    """Read-only sequence of :class:`Atom` views over (a subset of) the rows of an :class:`atom_columns` instance.
+
+    Atoms are created on access, so holding an ``atom_sequence`` costs no more than its index array.
+
+    :param columns: The column store to view.
+    :type columns: :class:`atom_columns`
+    :param indices: Rows of ``columns`` in this sequence, defaults to ``None`` meaning every row.
+    :type indices: :ref:`INT ARRAY <types>` ``| None``, optional
+    """
+
+    __slots__ = ("columns", "indices")
+
+    def __init__(self, columns: atom_columns, indices: c2at.INT_ARRAY | None = None) -> None:
+        self.columns: atom_columns = columns
+        self.indices: c2at.INT_ARRAY = (
+            np.arange(len(columns), dtype=np.int64) if indices is None else indices
+        )
+
+    def __len__(self) -> int:
+        return int(self.indices.shape[0])
+
+    @overload
+    def __getitem__(self, key: int | np.integer[Any]) -> Atom: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "atom_sequence": ...
+
+    def __getitem__(self, key: int | np.integer[Any] | slice) -> "Atom | atom_sequence":
+        if isinstance(key, slice):
+            return atom_sequence(self.columns, self.indices[key])
+        return Atom.view(self.columns, int(self.indices[key]))
+
+    def __iter__(self) -> Iterator[Atom]:
+        for row in self.indices.tolist():
+            yield Atom.view(self.columns, row)
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_species(species_items: tuple[tuple[int, str], ...]) -> tuple[str, ...]:
+    """Validate the items of a species map, memoised on those items.
+
+    :raises ValueError: If a label is not a chemical element.
+    :return: The unique element labels of the map.
+    """
+    labels: set[str] = {label for _, label in species_items}
+    if not labels.issubset(element_table()):
+        raise ValueError("Provided species map contains fake chemical elements.")
+    return tuple(labels)
+
+
 class conquest_species:
     def __init__(self, species_dict: dict[int, str]) -> None:
         """`conquest_input` serves as the main entrypoint describing the species involved in the simulation.
 
+        The periodic table is loaded once per process, and validation is memoised on the contents of ``species_dict``, so constructing the same species map again is cheap.
+
         :param species_dict: hashmap species_index <-> element_label
                 It is not completely reliable to directly read conquest_input
                 E.g., for multiple spins, must duplicate an element and call it a
@@ -88,20 +346,31 @@ class conquest_species:
         :type species_dict: ``dict[int, str]``
         :raises ValueError: If incorrect elements are passed in, the code will abort.
         """
-        self.element_file: str = "elements.txt"
+        self.element_file: str = ELEMENT_FILE
         self.species_dict: dict[int, str] = species_dict
-        # elements_from_file = LIBRARY.joinpath(self.element_file)
-        elements_from_file: str = importlib.resources.read_text("conquest2a", self.element_file)
-        self.elements: list[str] = [e.strip() for e in elements_from_file.split(",")]
-        self.allowed_element_labels: list[str] = self.elements
-        # elements_from_file.close()
-        if not self.dict_contains_only_real_elements():
-            raise ValueError("Provided species map contains fake chemical elements.")
-        self.unique_elements: list[str] = list(set(self.species_dict.values()))
+        self.unique_elements: list[str] = list(_validate_species(tuple(species_dict.items())))
+
+    @property
+    def elements(self) -> list[str]:
+        """Every accepted element label, in the order of ``elements.txt``."""
+        return list(element_labels())
+
+    @property
+    def allowed_element_labels(self) -> frozenset[str]:
+        """Set of every accepted element label."""
+        return frozenset(element_table())
 
     def dict_contains_only_real_elements(self) -> bool:
-        species_dict_values: list[str] = list(self.species_dict.values())
-        return set(species_dict_values).issubset(self.allowed_element_labels)
+        return set(self.species_dict.values()).issubset(element_table())
+
+    def atomic_numbers(self) -> dict[int, int]:
+        """Map of species index to the atomic number of its element.
+
+        :return: Atomic number of each species.
+        :rtype: ``dict[int, int]``
+        """
+        table = element_table()
+        return {species: table[label].number for species, label in self.species_dict.items()}
 
 
 class processor_base:
@@ -152,45 +421,131 @@ class conquest_coordinates:
     :type conquest_input: ``conquest_input``
     """
 
+    # Default number of atoms read at a time by iter_chunks and iter_element_chunks
+    chunk_size: int = 100_000
+    # Whether every atom is held in columns, rather than read or computed on demand
+    IN_MEMORY: bool = True
+
     def __init__(
         self,
         conquest_input: conquest_species,
     ) -> None:
 
-        self.atoms: list[Atom] = []
+        self._element_indices: dict[str, c2at.INT_ARRAY] | None = None
+        self._columns: atom_columns = atom_columns()
         self.conquest_input: conquest_species = conquest_input
         self.natoms: str
-        self.element_map: dict[str, list[Atom]]
         self.lattice_vectors: c2at.REAL_ARRAY = np.array([])
-        self.cart_position_vectors: c2at.REAL_ARRAY = np.array([])
+
+    @property
+    def columns(self) -> atom_columns:
+        """The per-atom data of the system, see :class:`atom_columns`. Replacing the columns invalidates :attr:`element_indices`."""
+        return self._columns
+
+    @columns.setter
+    def columns(self, columns: atom_columns) -> None:
+        self._columns = columns
+        self._element_indices = None
+
+    @property
+    def atoms(self) -> atom_sequence:
+        """The :class:`Atom` s in the system, as views onto :attr:`columns`."""
+        return atom_sequence(self.columns)
+
+    @atoms.setter
+    def atoms(self, atoms: Sequence[Atom]) -> None:
+        self.columns = atom_columns.from_atoms(atoms)
+
+    @property
+    def cart_position_vectors(self) -> c2at.REAL_ARRAY:
+        """The ``(N, 3)`` Cartesian positions of all atoms, see :func:`get_cartesian_positions`."""
+        return self.columns.cart_coords
+
+    @cart_position_vectors.setter
+    def cart_position_vectors(self, cart_coords: c2at.REAL_ARRAY) -> None:
+        self.columns.cart_coords = cart_coords
 
     def get_cartesian_positions(self) -> c2at.REAL_ARRAY:
-        """Returns the Cartesian position of all the atoms in the system and attaches to its :class:`Atom` field.
+        """Returns the Cartesian position of all the atoms in the system and stores it in the ``cart_coords`` column.
 
         :return: The 3D vector of the Cartesian position.
         :rtype: :ref:`REAL ARRAY <types>`
         """
-        atom_frac_pos: c2at.REAL_ARRAY = np.vstack([atom.coords for atom in self.atoms])
-        cart_coords: c2at.REAL_ARRAY = atom_frac_pos @ self.lattice_vectors.T
-        for atom, cart_coord in zip(self.atoms, cart_coords):
-            atom.cart_coords = cart_coord
-        self.cart_position_vectors = cart_coords
+        cart_coords: c2at.REAL_ARRAY = self.columns.frac_coords @ self.lattice_vectors.T
+        self.columns.cart_coords = cart_coords
         return cart_coords
 
     def assign_atom_labels(self) -> None:
         """Assign each Atom its label.
         If the ``conquest_input`` does not define labels for all species, these species labels will be silently skipped.
         """
-        for atom in self.atoms:
-            atom.label = self.conquest_input.species_dict[atom.species]
+        self.columns.labels = self.species_to_labels(self.columns.species)
+
+    def species_to_labels(self, species: c2at.INT_ARRAY) -> c2at.STR_ARRAY:
+        """Map an array of species indices to their element labels.
+
+        :param species: Species indices.
+        :type species: :ref:`INT ARRAY <types>`
+        :return: Element label of each entry of ``species``.
+        :rtype: :ref:`STR ARRAY <types>`
+        """
+        unique_species, inverse = np.unique(species, return_inverse=True)
+        species_labels: c2at.STR_ARRAY = np.array(
+            [self.conquest_input.species_dict[int(sp)] for sp in unique_species],
+            dtype=_LABEL_DTYPE,
+        )
+        return species_labels[inverse]
+
+    def group_by_element(self, species: c2at.INT_ARRAY) -> dict[str, c2at.INT_ARRAY]:
+        """Group atom indices by element in a single pass.
+
+        Each species index is mapped to a small integer element code through a lookup table, and the codes are ordered by a stable radix sort. Splitting the ordering at the cumulative element counts then gives every element's indices, in ascending order. Species missing from the species map are left out.
+
+        :param species: Species index of every atom.
+        :type species: :ref:`INT ARRAY <types>`
+        :return: Map of element label to the indices of the atoms of that element.
+        :rtype: ``dict[str, INT_ARRAY]``
+        """
+        elements: list[str] = self.conquest_input.unique_elements
+        if not elements:
+            return {}
+        element_codes: dict[str, int] = {element: code for code, element in enumerate(elements)}
+        species_dict: dict[int, str] = self.conquest_input.species_dict
+        # Lookup table from species index to element code. Unknown species map to the last code
+        max_species = max(max(species_dict), 0)
+        code_lookup = np.full(max_species + 2, len(elements), dtype=np.int16)
+        for species_index, element in species_dict.items():
+            if species_index >= 0:
+                code_lookup[species_index] = element_codes[element]
+        codes = code_lookup[np.clip(species, 0, max_species + 1)]
+        codes[species < 0] = len(elements)
+        # int16 codes let NumPy use a radix sort, which is O(N)
+        order: c2at.INT_ARRAY = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes, minlength=len(elements) + 1)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        return {
+            element: order[starts[code] : ends[code]] for element, code in element_codes.items()
+        }
+
+    @property
+    def element_indices(self) -> dict[str, c2at.INT_ARRAY]:
+        """Map of element label to the ascending indices of the atoms of that element. Built by :func:`group_by_element` on first access and cached until :attr:`columns` is replaced."""
+        if self._element_indices is None:
+            self._element_indices = self.group_by_element(self.columns.species)
+        return self._element_indices
+
+    @property
+    def element_map(self) -> dict[str, atom_sequence]:
+        """Map of element label to all the :class:`Atom` s with that label. External file formats, such as ``.vasp``, require a count of the number of atoms per element."""
+        return {
+            element: atom_sequence(self.columns, indices)
+            for element, indices in self.element_indices.items()
+        }
 
     def index_to_atom_map(self) -> None:
-        """Form a dictionary with keys an element label, and values a list of all the :class:`Atom` s with that label. External file formats, such as ``.vasp``, require a count of the number of atoms per element."""
-        ele_to_atom: dict[str, list[Atom]] = {}
-        for element in self.conquest_input.unique_elements:
-            # print(list(a for a in self.Atoms if a.label == element))
-            ele_to_atom[element] = list(a for a in self.atoms if a.label == element)
-        self.element_map = ele_to_atom
+        """Rebuild :attr:`element_indices`. The grouping is otherwise cached, so call this after changing species in place."""
+        self._element_indices = self.group_by_element(self.columns.species)
 
     def number_of_elements(self) -> dict[str, int]:
         """Function to get the number of atoms of each element.
@@ -198,10 +553,297 @@ class conquest_coordinates:
         :return: Returns a dictionary of the number of atoms per element
         :rtype: ``dict[str, int]``
         """
-        num_eles: dict[str, int] = {}
-        for element in list(self.element_map.keys()):
-            num_eles[element] = len(self.element_map[element])
-        return num_eles
+        return {element: len(indices) for element, indices in self.element_indices.items()}
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def read_rows(self, indices: c2at.INT_ARRAY | slice) -> atom_columns:
+        """Copy a subset of atoms into new columns. Subclasses that do not hold every atom in memory produce the rows here on demand.
+
+        :param indices: Row indices, in the order to return them, or a slice of rows.
+        :type indices: :ref:`INT ARRAY <types>` ``| slice``
+        :return: Columns for the requested rows.
+        :rtype: :class:`atom_columns`
+        """
+        if isinstance(indices, slice):
+            indices = np.arange(len(self), dtype=np.int64)[indices]
+        return self.columns.take(np.asarray(indices, dtype=np.int64))
+
+    def iter_chunks(
+        self, indices: c2at.INT_ARRAY | None = None, chunk_size: int | None = None
+    ) -> Iterator[atom_columns]:
+        """Parse atoms ``chunk_size`` at a time.
+
+        :param indices: Rows to read, defaults to ``None`` meaning every atom in file order.
+        :type indices: :ref:`INT ARRAY <types>` ``| None``, optional
+        :param chunk_size: Atoms per chunk, defaults to ``None`` meaning :attr:`chunk_size`.
+        :type chunk_size: ``int | None``, optional
+        :return: Columns for each successive chunk of rows.
+        :rtype: ``Iterator[atom_columns]``
+        """
+        chunk_size = self.chunk_size if chunk_size is None else chunk_size
+        if indices is None:
+            for start in range(0, len(self), chunk_size):
+                yield self.read_rows(slice(start, start + chunk_size))
+            return
+        for start in range(0, len(indices), chunk_size):
+            yield self.read_rows(indices[start : start + chunk_size])
+
+    def iter_cartesian_positions(
+        self, indices: c2at.INT_ARRAY | None = None, chunk_size: int | None = None
+    ) -> Iterator[c2at.REAL_ARRAY]:
+        """Convert atoms to Cartesian coordinates ``chunk_size`` at a time, see :func:`iter_chunks`.
+
+        :return: ``(chunk_size, 3)`` Cartesian positions of each successive chunk of rows.
+        :rtype: ``Iterator[REAL_ARRAY]``
+        """
+        for columns in self.iter_chunks(indices, chunk_size):
+            yield columns.cart_coords
+
+    def iter_element_chunks(
+        self, chunk_size: int | None = None
+    ) -> Iterator[tuple[c2at.INT_ARRAY, atom_columns]]:
+        """Read atoms grouped by element, in the order of :attr:`element_indices`, ``chunk_size`` at a time. The file writers read atoms this way, so they never need every atom in memory at once.
+
+        :param chunk_size: Atoms per chunk, defaults to ``None`` meaning :attr:`chunk_size`.
+        :type chunk_size: ``int | None``, optional
+        :return: Row indices and columns of each successive chunk.
+        :rtype: ``Iterator[tuple[INT_ARRAY, atom_columns]]``
+        """
+        chunk_size = self.chunk_size if chunk_size is None else chunk_size
+        for indices in self.element_indices.values():
+            for start in range(0, len(indices), chunk_size):
+                rows = indices[start : start + chunk_size]
+                yield rows, self.read_rows(rows)
+
+
+class lazy_conquest_coordinates(conquest_coordinates):
+    """A :class:`conquest_coordinates` whose atoms stay in a memory-mapped CONQUEST coordinates file until they are accessed.
+
+    On construction only the header is parsed and an index of the byte offset of every atom line is built. Rows are parsed on access, by index or slice through :attr:`atoms`, or by species through :attr:`element_map`. :func:`iter_chunks` and :func:`iter_cartesian_positions` walk any subset of atoms in fixed-size chunks, so memory use is bounded by ``chunk_size`` rather than by the size of the cell.
+
+    The file writers read atoms chunk by chunk through :func:`~conquest_coordinates.iter_element_chunks`, so converting the file does not parse it whole. Accessing :attr:`columns` materialises every atom. Changes made to lazily-parsed :class:`Atom` s are not written back to the file.
+
+    :param path: Path of the CONQUEST coordinates file to map.
+    :type path: ``Path``
+    :param conquest_input: :class:`conquest_species` instance.
+    :type conquest_input: ``conquest_species``
+    :param chunk_size: Number of atoms parsed at a time, defaults to 100000.
+    :type chunk_size: ``int``, optional
+    """
+
+    # Bytes of the file scanned at a time when building the line index
+    INDEX_BLOCK_BYTES: int = 1 << 22
+    IN_MEMORY: bool = False
+
+    def __init__(
+        self, path: Path, conquest_input: conquest_species, chunk_size: int = 100_000
+    ) -> None:
+        super().__init__(conquest_input)
+        self._materialised: atom_columns | None = None
+        self._species: c2at.INT_ARRAY | None = None
+        self._cart_coords: c2at.REAL_ARRAY | None = None
+        self.path: Path = path
+        self.chunk_size: int = chunk_size
+        with open(self.path, "rb") as conquest_coord_file:
+            self._mmap: mmap.mmap = mmap.mmap(
+                conquest_coord_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        self._read_header()
+        self.line_offsets: c2at.INT_ARRAY = self._index_atom_lines()
+
+    def _read_header(self) -> None:
+        self._mmap.seek(0)
+        self.lattice_vectors = np.vstack(
+            [np.fromstring(self._mmap.readline().decode("utf-8"), sep=" ") for _ in range(3)]
+        )
+        self.natoms = self._mmap.readline().decode("utf-8").replace("\r\n", "\n")
+        self._atom_block_offset: int = self._mmap.tell()
+
+    def _index_atom_lines(self) -> c2at.INT_ARRAY:
+        """Find the byte offset of every non-blank line of the atom block.
+
+        The file is scanned in line-aligned blocks of :attr:`INDEX_BLOCK_BYTES`, so the scan itself needs little memory. The returned array has one extra entry, the file size, so that row ``i`` spans ``line_offsets[i]:line_offsets[i + 1]``.
+        """
+        size = len(self._mmap)
+        buffer: c2at.GENERIC_ARRAY = np.frombuffer(self._mmap, dtype=np.uint8)
+        offsets: list[c2at.INT_ARRAY] = []
+        pos = self._atom_block_offset
+        while pos < size:
+            end = min(pos + self.INDEX_BLOCK_BYTES, size)
+            if end < size:
+                last_newline = self._mmap.rfind(b"\n", pos, end)
+                if last_newline == -1:
+                    last_newline = self._mmap.find(b"\n", end)
+                end = size if last_newline == -1 else last_newline + 1
+            block = buffer[pos:end]
+            newlines = np.flatnonzero(block == ord("\n"))
+            line_starts = np.concatenate(([0], newlines + 1))
+            line_ends = np.append(newlines, len(block))
+            # All ASCII whitespace sorts at or below the space character
+            content = np.flatnonzero(block > ord(" "))
+            has_content = np.searchsorted(content, line_starts) < np.searchsorted(
+                content, line_ends
+            )
+            offsets.append(line_starts[has_content] + pos)
+            pos = end
+        del buffer
+        offsets.append(np.array([size]))
+        return np.concatenate(offsets).astype(np.int64)
+
+    @override
+    def __len__(self) -> int:
+        return len(self.line_offsets) - 1
+
+    def close(self) -> None:
+        """Release the memory map. Atoms can no longer be read afterwards."""
+        self._mmap.close()
+
+    @override
+    def read_rows(self, indices: c2at.INT_ARRAY | slice) -> atom_columns:
+        """Parse a subset of atoms straight from the mapped file.
+
+        :param indices: Row indices, in the order to return them, or a slice of rows.
+        :type indices: :ref:`INT ARRAY <types>` ``| slice``
+        :return: Columns for the requested rows, including Cartesian coordinates and labels.
+        :rtype: :class:`atom_columns`
+        """
+        if isinstance(indices, slice):
+            indices = np.arange(len(self), dtype=np.int64)[indices]
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(indices) > 0 and np.all(np.diff(indices) == 1):
+            # Contiguous rows are one slice of the map
+            block: bytes = self._mmap[
+                self.line_offsets[indices[0]] : self.line_offsets[indices[-1] + 1]
+            ]
+        else:
+            starts = self.line_offsets[indices].tolist()
+            ends = self.line_offsets[indices + 1].tolist()
+            block = b"".join(self._mmap[start:end] for start, end in zip(starts, ends))
+        columns = conquest_coordinates_processor.parse_atom_block(
+            block.decode("utf-8").splitlines()
+        )
+        columns.numbers = indices + 1
+        columns.cart_coords = columns.frac_coords @ self.lattice_vectors.T
+        columns.labels = self.species_to_labels(columns.species)
+        return columns
+
+    @property
+    def species(self) -> c2at.INT_ARRAY:
+        """Species index of every atom, gathered chunk by chunk on first access, or the column of :attr:`columns` once they are materialised."""
+        if self._materialised is not None:
+            return self._materialised.species
+        if self._species is None:
+            self._species = np.concatenate(
+                [columns.species for columns in self.iter_chunks()] + [np.array([], np.int64)]
+            )
+        return self._species
+
+    @property  # type: ignore[override]
+    def columns(self) -> atom_columns:
+        if self._materialised is None:
+            self._materialised = self.read_rows(slice(None))
+        return self._materialised
+
+    @columns.setter
+    def columns(self, columns: atom_columns) -> None:
+        self._materialised = columns
+        self._element_indices = None
+        self._species = None
+        self._cart_coords = None
+
+    @property
+    @override
+    def atoms(self) -> atom_sequence:
+        return lazy_atom_sequence(self, np.arange(len(self), dtype=np.int64))
+
+    @property
+    @override
+    def element_indices(self) -> dict[str, c2at.INT_ARRAY]:
+        if self._element_indices is None:
+            self._element_indices = self.group_by_element(self.species)
+        return self._element_indices
+
+    @property
+    @override
+    def element_map(self) -> dict[str, atom_sequence]:
+        return {
+            element: lazy_atom_sequence(self, indices)
+            for element, indices in self.element_indices.items()
+        }
+
+    @override
+    def get_cartesian_positions(self) -> c2at.REAL_ARRAY:
+        """Returns the Cartesian position of all the atoms, converted chunk by chunk without materialising the other columns.
+
+        :return: The 3D vector of the Cartesian position.
+        :rtype: :ref:`REAL ARRAY <types>`
+        """
+        if self._materialised is not None:
+            return super().get_cartesian_positions()
+        if self._cart_coords is None:
+            self._cart_coords = np.concatenate(
+                list(self.iter_cartesian_positions()) + [np.empty((0, 3))]
+            )
+        return self._cart_coords
+
+    @property  # type: ignore[override]
+    def cart_position_vectors(self) -> c2at.REAL_ARRAY:
+        """The ``(N, 3)`` Cartesian positions of all atoms: the stored column once :attr:`columns` are materialised, otherwise the cached result of :func:`get_cartesian_positions`."""
+        if self._materialised is not None:
+            return self._materialised.cart_coords
+        return self.get_cartesian_positions()
+
+    @cart_position_vectors.setter
+    def cart_position_vectors(self, cart_coords: c2at.REAL_ARRAY) -> None:
+        # As for in-memory coordinates, the positions are stored in the materialised columns
+        self.columns.cart_coords = cart_coords
+
+    @override
+    def assign_atom_labels(self) -> None:
+        """Labels are assigned as rows are parsed, see :func:`read_rows`."""
+        if self._materialised is not None:
+            super().assign_atom_labels()
+
+    @override
+    def index_to_atom_map(self) -> None:
+        """The element map is built from the species column on first access of :attr:`element_map`."""
+        self._element_indices = None
+
+
+class lazy_atom_sequence(atom_sequence):
+    """:class:`atom_sequence` over the rows of a :class:`lazy_conquest_coordinates`, or of any :class:`conquest_coordinates` that produces rows on demand. Rows are read with :func:`~conquest_coordinates.read_rows` when accessed.
+
+    :param coords: The lazily-read coordinates.
+    :type coords: :class:`conquest_coordinates`
+    :param indices: Rows in this sequence.
+    :type indices: :ref:`INT ARRAY <types>`
+    """
+
+    __slots__ = ("coords",)
+
+    def __init__(self, coords: conquest_coordinates, indices: c2at.INT_ARRAY) -> None:
+        self.coords: conquest_coordinates = coords
+        self.indices = indices
+
+    @overload
+    def __getitem__(self, key: int | np.integer[Any]) -> Atom: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> atom_sequence: ...
+
+    @override
+    def __getitem__(self, key: int | np.integer[Any] | slice) -> "Atom | atom_sequence":
+        if isinstance(key, slice):
+            return lazy_atom_sequence(self.coords, self.indices[key])
+        return Atom.view(self.coords.read_rows(self.indices[[key]]), 0)
+
+    @override
+    def __iter__(self) -> Iterator[Atom]:
+        for columns in self.coords.iter_chunks(self.indices):
+            for row in range(len(columns)):
+                yield Atom.view(columns, row)
 
 
 class conquest_coordinates_processor(processor_base):
@@ -211,17 +853,34 @@ class conquest_coordinates_processor(processor_base):
     :type path: ``str``
     :param conquest_input: :class:`conquest_input` instance.
     :type conquest_input: conquest_input
+    :param lazy: Memory-map the file and parse atoms only when accessed, see :class:`lazy_conquest_coordinates`, defaults to ``False``.
+    :type lazy: ``bool``, optional
+    :param cache: Snapshot cache to load the parsed file from, or store it in, see :class:`~conquest2a.cache.coordinates_cache`. Defaults to ``None``, meaning no caching. Ignored if ``lazy``.
+    :type cache: ``coordinates_cache | None``, optional
     """
 
-    def __init__(self, path: str, conquest_input: conquest_species) -> None:
+    def __init__(
+        self,
+        path: str,
+        conquest_input: conquest_species,
+        lazy: bool = False,
+        cache: "coordinates_cache | None" = None,
+    ) -> None:
         processor_base.__init__(
             self, path=path, err_str="Error opening specified CONQUEST coordinates file."
         )
-        self.coords: conquest_coordinates = conquest_coordinates(conquest_input=conquest_input)
         self.resolve_path()
-        self.open_file()
-        _ = self.coords.get_cartesian_positions()
-        self.coords.assign_atom_labels()
+        self.coords: conquest_coordinates
+        if lazy:
+            self.coords = lazy_conquest_coordinates(self.abs_input_path, conquest_input)
+        else:
+            self.coords = conquest_coordinates(conquest_input=conquest_input)
+            if cache is None or not cache.load(self.abs_input_path, self.coords):
+                self.open_file()
+                _ = self.coords.get_cartesian_positions()
+                self.coords.assign_atom_labels()
+                if cache is not None:
+                    cache.store(self.abs_input_path, self.coords)
         self.coords.index_to_atom_map()
         self.volume_bohr: float = (
             self.coords.lattice_vectors[0][0] * self.coords.lattice_vectors[1][1]
@@ -238,34 +897,55 @@ class conquest_coordinates_processor(processor_base):
             * fourth line is the total number of atoms in the unit cell
             * the following lines describe each atom and look like
                 <double> <double> <double> <int> <char> <char> <char>
+
+        The atom lines are parsed in bulk by :func:`parse_atom_block`.
         """
         with open(self.abs_input_path, "r", encoding="utf-8") as conquest_coord_file:
-            conquest_lattice_data_str: list[str] = [
-                next(conquest_coord_file).strip() for _ in range(3)
-            ]
-            cell_lattice_vectors: list[c2at.REAL_ARRAY] = []
-            for lattice_vect in conquest_lattice_data_str:
-                coords: c2at.REAL_ARRAY = np.fromstring(lattice_vect, sep=" ")
-                cell_lattice_vectors.append(coords)
-            self.coords.lattice_vectors = np.vstack(cell_lattice_vectors)
-            self.coords.natoms = next(conquest_coord_file)
-            atom_data: list[str] = conquest_coord_file.readlines()
-            atom_data_stripped: list[str] = [atom for atom in atom_data if atom.strip()]
-            atom_number = 1
-            for atom in atom_data_stripped:
-                split_atom_data: list[str] = atom.strip().split()
-                self.coords.atoms.append(
-                    Atom(
-                        species=int(split_atom_data[3]),
-                        can_move=split_atom_data[4:],
-                        coords=np.array(split_atom_data[:3]).astype(float),
-                        number=atom_number,
-                    )
-                )
-                atom_number += 1
+            self.coords.lattice_vectors, self.coords.natoms = self.parse_header(conquest_coord_file)
+            self.coords.columns = self.parse_atom_block(conquest_coord_file)
         conquest_coord_file.close()
         _ = self.coords.get_cartesian_positions()
 
+    @staticmethod
+    def parse_header(conquest_coord_file: Iterator[str]) -> tuple[c2at.REAL_ARRAY, str]:
+        """Read the lattice vectors and number of atoms from the first 4 lines of a CONQUEST coordinates file.
+
+        :param conquest_coord_file: An open file positioned at the start of the coordinates file. It is left positioned at the first atom line.
+        :type conquest_coord_file: ``Iterator[str]``
+        :return: The lattice vectors, and the number of atoms line as written in the file.
+        :rtype: ``tuple[REAL_ARRAY, str]``
+        """
+        conquest_lattice_data_str: list[str] = [next(conquest_coord_file).strip() for _ in range(3)]
+        cell_lattice_vectors: list[c2at.REAL_ARRAY] = []
+        for lattice_vect in conquest_lattice_data_str:
+            coords: c2at.REAL_ARRAY = np.fromstring(lattice_vect, sep=" ")
+            cell_lattice_vectors.append(coords)
+        return np.vstack(cell_lattice_vectors), next(conquest_coord_file)
+
+    @staticmethod
+    def parse_atom_block(atom_lines: Iterable[str]) -> atom_columns:
+        """Parse the atom lines of a CONQUEST coordinates file in a single pass.
+
+        The lines are handed to NumPy's C tokenizer with a structured dtype, so no Python objects are created per atom. Blank lines are skipped.
+
+        :param atom_lines: An open file positioned at the first atom line, or any iterable of atom lines.
+        :type atom_lines: ``Iterable[str]``
+        :raises ValueError: If a line does not have exactly 7 columns.
+        :return: The parsed columns. Cartesian coordinates and labels are left unset.
+        :rtype: :class:`atom_columns`
+        """
+        with warnings.catch_warnings():
+            # An atom block with no atoms is valid
+            warnings.simplefilter("ignore", UserWarning)
+            table: c2at.GENERIC_ARRAY = np.loadtxt(
+                atom_lines, dtype=_ATOM_LINE_DTYPE, comments=None, ndmin=1
+            )
+        columns = atom_columns(len(table))
+        columns.frac_coords = np.ascontiguousarray(table["coords"])
+        columns.species = np.ascontiguousarray(table["species"])
+        columns.can_move = table["can_move"] == "T"
+        return columns
+
 
 class atom_charge(processor_base):
     """
@@ -291,7 +971,7 @@ class atom_charge(processor_base):
         self.coordinates: conquest_coordinates = coordinates
         self.atom_charge_path: str = atom_charge_path
         self.abs_atom_charge_path: Path = Path(os.path.abspath(self.atom_charge_path))
-        self.conquest_charge_data: list[c2at.REAL_ARRAY] = []
+        self.conquest_charge_data: c2at.REAL_ARRAY = np.empty((0, 3))
         self.resolve_path()
         self.open_file()
         self.assign_atom_charge()
@@ -301,24 +981,35 @@ class atom_charge(processor_base):
         """Reads in the AtomCharge.dat
         Format of the file is 3 columns: total, spin up spin down
         CONQUEST only deals with collinear spins
+
+        The file is read in bulk into an ``(N, 3)`` array. Blank lines are skipped.
+
+        :raises ValueError: If a line does not have exactly 3 columns.
         """
         with open(self.abs_atom_charge_path, "r", encoding="utf-8") as conquest_charge_file:
-            for line in conquest_charge_file:
-                total_up_down: list[str] = line.split()
-                if total_up_down:
-                    self.conquest_charge_data.append(np.array(total_up_down).astype(float))
-                else:
-                    continue
-
+            self.conquest_charge_data = np.loadtxt(
+                conquest_charge_file, dtype=np.float64, comments=None, ndmin=2
+            )
         conquest_charge_file.close()
+        if self.conquest_charge_data.shape[1] != 3:
+            raise ValueError(
+                f"{self.abs_atom_charge_path} should have 3 columns: total, spin up, spin down."
+            )
 
     def assign_atom_charge(self) -> None:
         """
         Assign each Atom its spin values from the AtomCharge.dat file: up - down
+
+        :raises ValueError: If the number of rows in AtomCharge.dat differs from the number of atoms.
         """
-        for i, atom in enumerate(self.coordinates.atoms):
-            split_charge_data: c2at.REAL_ARRAY = self.conquest_charge_data[i]
-            atom.spins = np.array([0.0, 0.0, split_charge_data[1] - split_charge_data[2]])
+        columns = self.coordinates.columns
+        if len(self.conquest_charge_data) != len(columns):
+            raise ValueError(
+                f"{self.abs_atom_charge_path} has {len(self.conquest_charge_data)} atoms, "
+                f"but the coordinates have {len(columns)}."
+            )
+        columns.spins[:, :2] = 0.0
+        columns.spins[:, 2] = self.conquest_charge_data[:, 1] - self.conquest_charge_data[:, 2]
 
 
 class block_processor:
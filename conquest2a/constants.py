@@ -1,11 +1,7 @@
 from typing import Any
+import functools
 import importlib.resources
 from ase.units import Bohr, Hartree
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-import scienceplots
-
-plt.style.use(["science", "no-latex"])
 
 BOHR_TO_ANGSTROM = Bohr
 ANGSTROM_TO_BOHR = 1 / BOHR_TO_ANGSTROM
@@ -41,4 +37,22 @@ MPLGRID: dict[str, Any] = {
     "grid.alpha": 0.7,
 }
 
-mpl.rcParams.update(MPLGENERIC) 
+
+@functools.cache
+def apply_plot_style() -> None:
+    """Apply the SciencePlots style and :data:`MPLGENERIC` to Matplotlib.
+
+    Matplotlib and SciencePlots are only imported here, the first time a plot is made, so modules that do not plot never pay for importing them. Parameters the user has changed from their ``matplotlibrc`` values are left alone, as they were when the style was applied on import.
+    """
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+    import scienceplots  # noqa: F401 registers the "science" styles
+
+    style: dict[str, Any] = {}
+    for name in ["science", "no-latex"]:
+        style.update(plt.style.library[name])
+    style.update(MPLGENERIC)
+    loaded = mpl.rc_params()
+    mpl.rcParams.update(
+        {key: value for key, value in style.items() if mpl.rcParams[key] == loaded[key]}
+    )
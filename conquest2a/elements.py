@@ -0,0 +1,82 @@
+"""
+Periodic table data, loaded once per process.
+
+The element labels CONQUEST2a accepts are read from ``elements.txt`` on first use. Atomic numbers and masses are taken from :mod:`ase.data`.
+"""
+
+import functools
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+from ase.data import atomic_masses, atomic_numbers
+from conquest2a.constants import LIBRARY
+
+ELEMENT_FILE: str = "elements.txt"
+
+
+class element(NamedTuple):
+    """A chemical element.
+
+    :param label: Chemical symbol, e.g. ``"Bi"``.
+    :type label: ``str``
+    :param number: Atomic number.
+    :type number: ``int``
+    :param mass: Standard atomic mass in atomic mass units.
+    :type mass: ``float``
+    """
+
+    label: str
+    number: int
+    mass: float
+
+
+@functools.cache
+def element_labels() -> tuple[str, ...]:
+    """Element labels, in the order of ``elements.txt``.
+
+    :return: Every accepted chemical symbol.
+    :rtype: ``tuple[str, ...]``
+    """
+    elements_from_file: str = LIBRARY.joinpath(ELEMENT_FILE).read_text(encoding="utf-8")
+    return tuple(e.strip() for e in elements_from_file.split(","))
+
+
+@functools.cache
+def element_table() -> Mapping[str, element]:
+    """Read-only map of chemical symbol to :class:`element`, for every label in ``elements.txt``.
+
+    :return: The periodic table.
+    :rtype: ``Mapping[str, element]``
+    """
+    return MappingProxyType(
+        {
+            label: element(
+                label, atomic_numbers[label], float(atomic_masses[atomic_numbers[label]])
+            )
+            for label in element_labels()
+        }
+    )
+
+
+def lookup_element(label: str) -> element:
+    """Look up a chemical element by its symbol.
+
+    :param label: Chemical symbol.
+    :type label: ``str``
+    :raises ValueError: If ``label`` is not a chemical element.
+    :return: The element.
+    :rtype: :class:`element`
+    """
+    try:
+        return element_table()[label]
+    except KeyError:
+        raise ValueError(f"{label} is not a chemical element.") from None
+
+
+def atomic_number(label: str) -> int:
+    """Atomic number of the element ``label``, see :func:`lookup_element`."""
+    return lookup_element(label).number
+
+
+def atomic_mass(label: str) -> float:
+    """Standard atomic mass of the element ``label`` in atomic mass units, see :func:`lookup_element`."""
+    return lookup_element(label).mass
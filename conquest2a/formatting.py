@@ -0,0 +1,155 @@
+"""
+Vectorised fixed-point formatting of numbers to bytes.
+
+Numbers are formatted as fields of a ``uint8`` matrix, one row per line. Each field is right-aligned and padded on the left with zero bytes, so the fields of a line can be placed side by side and the padding dropped in one pass, see :func:`join_fields`. The output is byte-for-byte the same as ``"%.{precision}f" % x`` and ``"%d" % n``.
+"""
+
+import functools
+import numpy as np
+import numpy.typing as npt
+from conquest2a._types import BOOL_ARRAY, INT_ARRAY, REAL_ARRAY
+
+BYTE_MATRIX = npt.NDArray[np.uint8]
+
+# Highest precision formatted by the vectorised path. Above it, too many coordinates scaled by 10**precision
+# round ambiguously and are formatted by Python anyway
+FAST_MAX_PRECISION: int = 12
+# Largest scaled value whose rounding error is below one unit in the last digit
+_EXACT_LIMIT: float = float(2**52)
+_PAD: int = 0
+_MINUS: int = ord("-")
+_POINT: int = ord(".")
+
+
+@functools.cache
+def _digit_quads() -> BYTE_MATRIX:
+    # ASCII codes of the four digits of every number 0-9999, built on first use
+    return np.array([[ord(digit) for digit in f"{i:04d}"] for i in range(10_000)], dtype=np.uint8)
+
+
+@functools.cache
+def _powers_of_ten(ndigits: int) -> npt.NDArray[np.uint64]:
+    return 10 ** np.arange(ndigits, dtype=np.uint64)
+
+
+def _digits(values: npt.NDArray[np.uint64], ndigits: int) -> BYTE_MATRIX:
+    """ASCII digits of non-negative integers below ``10**ndigits``, as ``ndigits`` columns padded with leading zeros.
+
+    Digits are taken five at a time from the right: one 64-bit division per group, then a table lookup of its last four digits in 32-bit arithmetic.
+    """
+    quads = _digit_quads()
+    out = np.empty((len(values), ndigits), dtype=np.uint8)
+    remaining = values
+    column = ndigits
+    while column > 0:
+        width = min(column, 5)
+        group = (remaining % np.uint64(100_000)).astype(np.uint32)
+        remaining = remaining // np.uint64(100_000)
+        first = group // np.uint32(10_000)
+        quad = np.take(quads, group - first * np.uint32(10_000), axis=0)
+        if width == 5:
+            out[:, column - 5] = ord("0") + first
+            out[:, column - 4 : column] = quad
+        else:
+            out[:, column - width : column] = quad[:, 4 - width :]
+        column -= width
+    return out
+
+
+def _integer_digits(values: npt.NDArray[np.uint64]) -> BYTE_MATRIX:
+    """ASCII digits of non-negative integers, right-aligned and padded with zero bytes."""
+    ndigits = len(str(int(values.max()))) if len(values) else 1
+    out = _digits(values, ndigits)
+    if ndigits > 1:
+        # Number of digits of each value, at least one so that zero is written as "0"
+        lengths = 1 + np.searchsorted(_powers_of_ten(ndigits)[1:], values, side="right")
+        out[np.arange(ndigits) < (ndigits - lengths)[:, None]] = _PAD
+    return out
+
+
+def _place(field: BYTE_MATRIX, rows: INT_ARRAY, texts: list[str]) -> BYTE_MATRIX:
+    """Overwrite the given rows of ``field`` with ``texts``, widening it if needed."""
+    width = max(field.shape[1], max(len(text) for text in texts))
+    if width > field.shape[1]:
+        field = np.hstack([np.zeros((len(field), width - field.shape[1]), dtype=np.uint8), field])
+    for row, text in zip(rows.tolist(), texts):
+        field[row] = _PAD
+        field[row, width - len(text) :] = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return field
+
+
+def fixed_field(values: REAL_ARRAY, precision: int) -> BYTE_MATRIX:
+    """Format floats as ``"%.{precision}f" % x`` would, one field per value.
+
+    Values are scaled by ``10**precision`` and rounded to integers, whose digits are then written out in bulk. The rounding of a scaled value is exact unless it lies within its own rounding error of a half-integer, or is too large, infinite or NaN; those few values are formatted by Python instead.
+
+    :param values: 1D array of floats.
+    :type values: :ref:`REAL ARRAY <types>`
+    :param precision: Number of decimals, from 0 to :data:`FAST_MAX_PRECISION`.
+    :type precision: ``int``
+    :raises ValueError: If ``precision`` is out of range.
+    :return: The fields, of shape ``(len(values), width)``.
+    :rtype: ``NDArray[uint8]``
+    """
+    if not 0 <= precision <= FAST_MAX_PRECISION:
+        raise ValueError(f"Precision must be between 0 and {FAST_MAX_PRECISION}.")
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = np.abs(values) * float(10**precision)
+        fraction = scaled - np.floor(scaled)
+        fallback = ~(scaled < _EXACT_LIMIT) | (np.abs(fraction - 0.5) <= scaled * 2.0**-52)
+    rounded = np.rint(np.where(fallback, 0.0, scaled)).astype(np.uint64)
+    parts = [
+        np.where(np.signbit(values), _MINUS, _PAD).astype(np.uint8)[:, None],
+        _integer_digits(rounded // np.uint64(10**precision)),
+    ]
+    if precision > 0:
+        parts.append(np.full((len(values), 1), _POINT, dtype=np.uint8))
+        parts.append(_digits(rounded % np.uint64(10**precision), precision))
+    field = np.hstack(parts)
+    if fallback.any():
+        rows = np.flatnonzero(fallback)
+        field = _place(field, rows, [f"{x:.{precision}f}" for x in values[rows].tolist()])
+    return field
+
+
+def integer_field(values: INT_ARRAY) -> BYTE_MATRIX:
+    """Format integers as ``"%d" % n`` would, one field per value.
+
+    :param values: 1D array of integers.
+    :type values: :ref:`INT ARRAY <types>`
+    :return: The fields, of shape ``(len(values), width)``.
+    :rtype: ``NDArray[uint8]``
+    """
+    values = np.asarray(values, dtype=np.int64)
+    negative = values < 0
+    magnitude = np.abs(values).astype(np.uint64)
+    sign = np.where(negative, _MINUS, _PAD).astype(np.uint8)[:, None]
+    return np.hstack([sign, _integer_digits(magnitude)])
+
+
+def flag_field(values: BOOL_ARRAY, true: str = "T", false: str = "F") -> BYTE_MATRIX:
+    """Format booleans as one-character fields."""
+    return np.where(values, ord(true), ord(false)).astype(np.uint8)[:, None]
+
+
+def join_fields(fields: list[BYTE_MATRIX | str]) -> bytes:
+    """Join fields into lines, dropping their padding.
+
+    :param fields: Field matrices with the same number of rows, and literal separators such as ``" "`` or ``"\\n"``, which are repeated on every row.
+    :type fields: ``list[NDArray[uint8] | str]``
+    :return: The lines.
+    :rtype: ``bytes``
+    """
+    nrows = next(len(field) for field in fields if not isinstance(field, str))
+    widths = [len(field) if isinstance(field, str) else field.shape[1] for field in fields]
+    lines = np.empty((nrows, sum(widths)), dtype=np.uint8)
+    column = 0
+    for field, width in zip(fields, widths):
+        if isinstance(field, str):
+            lines[:, column : column + width] = np.frombuffer(field.encode("ascii"), np.uint8)
+        else:
+            lines[:, column : column + width] = field
+        column += width
+    flat = lines.ravel()
+    return flat[flat != _PAD].tobytes()
@@ -10,8 +10,8 @@ import os
 import re
 from os.path import abspath
 import numpy as np
-import matplotlib.pyplot as plt
 from conquest2a.conquest import block_processor
+from conquest2a.constants import apply_plot_style
 import conquest2a._types as c2at
 
 
@@ -137,6 +137,9 @@ class pdos_processor(block_processor):
             self.energy_values = {}
             for filename in self.all_pdos_files:
                 self.read_file(filename)
+            import matplotlib.pyplot as plt
+
+            apply_plot_style()
             _fig = plt.figure(figsize=(3, 2))
             # print(self.blocks)
             energy: c2at.REAL_ARRAY = self.blocks[0][:, 0]
@@ -247,6 +250,9 @@ class pdos_l_processor(pdos_processor):
         x_label = r"$E - E_F~[\text{eV}]$" if self.is_shifted_to_fermi else r"$E~[\text{eV}]$"
         y_label = r"$\text{DOS} [\text{states/eV}]$"
 
+        import matplotlib.pyplot as plt
+
+        apply_plot_style()
         _fig = plt.figure()
 
         self.get_pdos(atomno)
@@ -395,6 +401,9 @@ class pdos_lm_processor(pdos_processor):
         # energy_mask = np.ma.masked_inside(self.energy_values[1], x1, x2).mask #type: ignore
         # x_energy = self.energy_values[1][energy_mask]
         # Plot the same orbitals from each atom on the same plot
+        import matplotlib.pyplot as plt
+
+        apply_plot_style()
         _fig = plt.figure()
 
         for atom in atomnos:
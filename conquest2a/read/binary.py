@@ -0,0 +1,28 @@
+"""
+This module reads back structures written by :class:`~conquest2a.writers.npz_writer`.
+"""
+
+import numpy as np
+from conquest2a.conquest import atom_columns, conquest_coordinates, conquest_species
+
+
+def read_npz(path: str, conquest_input: conquest_species) -> conquest_coordinates:
+    """Load a ``.npz`` archive written by :class:`~conquest2a.writers.npz_writer`.
+
+    :param path: Path of the archive.
+    :type path: ``str``
+    :param conquest_input: :class:`~conquest2a.conquest.conquest_species` instance to attach to the coordinates.
+    :type conquest_input: ``conquest_species``
+    :raises KeyError: If the archive is missing an array.
+    :return: The coordinates, with every column as written.
+    :rtype: ``conquest_coordinates``
+    """
+    coords = conquest_coordinates(conquest_input)
+    columns = atom_columns()
+    with np.load(path, allow_pickle=False) as archive:
+        for name in atom_columns.NAMES:
+            setattr(columns, name, archive[name])
+        coords.lattice_vectors = archive["lattice_vectors"]
+        coords.natoms = str(archive["natoms"])
+    coords.columns = columns
+    return coords
@@ -118,13 +118,13 @@ class read_static_output:
             # that conquest_processor.atoms is sorted by coordinate file order
             # which is preserved by CONQUEST after every run
             # so we simply assign index directly
-            self.conquest_processor.coords.atoms[atom_number - 1].forces = forces
+            self.conquest_processor.coords.columns.forces[atom_number - 1] = forces
 
     def get_max_force_atom(self) -> Atom:
-        atom_with_max_force = self.conquest_processor.coords.atoms[0]
-        for atom in self.conquest_processor.coords.atoms[1:]:
-            if np.max(np.abs(atom.forces)) > np.max(np.abs(atom_with_max_force.forces)):
-                atom_with_max_force = atom
+        abs_forces = np.abs(self.conquest_processor.coords.columns.forces)
+        atom_with_max_force = self.conquest_processor.coords.atoms[
+            int(np.argmax(np.max(abs_forces, axis=1)))
+        ]
         index = np.argmax(np.abs(atom_with_max_force.forces))
         direction = "x"
         if index == 1:
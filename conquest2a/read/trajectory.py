@@ -0,0 +1,353 @@
+"""
+This module indexes and reads multi-frame XYZ and ``.extxyz`` trajectories, such as those written by :class:`~conquest2a.writers.trajectory_writer`.
+
+The index is a sidecar file next to the trajectory, ``<trajectory>.idx``, holding the byte offset of the start of every frame as little-endian 64-bit integers. Frame ``i`` therefore starts at the offset stored in bytes ``8 * i`` to ``8 * i + 8`` of the index.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, overload
+from collections.abc import Iterator, Sequence
+import numpy as np
+import conquest2a._types as c2at
+from conquest2a.constants import ANGSTROM_TO_BOHR
+from conquest2a.conquest import atom_columns, conquest_coordinates, conquest_species
+
+INDEX_SUFFIX: str = ".idx"
+INDEX_DTYPE = np.dtype("<i8")
+# key=value or key="quoted value" pairs of an extxyz comment line
+_RE_COMMENT_FIELD = re.compile(r'(\w+)=("[^"]*"|\S+)')
+
+
+def index_path(path: c2at.FILE_PATH) -> Path:
+    """Path of the sidecar index of the trajectory ``path``."""
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def scan_frame_offsets(path: c2at.FILE_PATH) -> c2at.INT_ARRAY:
+    """Find the byte offset of every frame by reading the whole trajectory.
+
+    Each frame is a line with the number of atoms, a comment line, then one line per atom. Blank lines between frames are skipped.
+
+    :param path: The trajectory.
+    :type path: ``str | Path``
+    :raises ValueError: If a frame is truncated or its number of atoms is not an integer.
+    :return: Byte offset of the start of each frame.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    offsets: list[int] = []
+    pos = 0
+    with open(path, "rb") as trajectory:
+        for line in trajectory:
+            if not line.strip():
+                pos += len(line)
+                continue
+            offsets.append(pos)
+            pos += len(line)
+            natoms = int(line)
+            for _ in range(natoms + 1):
+                frame_line = trajectory.readline()
+                if not frame_line:
+                    raise ValueError(f"Frame {len(offsets) - 1} of {path} is truncated.")
+                pos += len(frame_line)
+    return np.array(offsets, dtype=np.int64)
+
+
+def write_frame_offsets(path: c2at.FILE_PATH, offsets: c2at.INT_ARRAY) -> None:
+    """Write the sidecar index of the trajectory ``path``."""
+    with open(index_path(path), "wb") as index_file:
+        index_file.write(np.asarray(offsets, dtype=INDEX_DTYPE).tobytes())
+
+
+def index_is_current(path: c2at.FILE_PATH) -> bool:
+    """Whether the sidecar index of ``path`` exists and is consistent with it.
+
+    The index must be no older than the trajectory, and its offsets must be increasing and inside the file.
+    """
+    index = index_path(path)
+    if not index.exists():
+        return False
+    trajectory_stat = os.stat(path)
+    index_stat = os.stat(index)
+    if index_stat.st_mtime_ns < trajectory_stat.st_mtime_ns:
+        return False
+    if index_stat.st_size % INDEX_DTYPE.itemsize:
+        return False
+    offsets = np.fromfile(index, dtype=INDEX_DTYPE)
+    if len(offsets) == 0:
+        return trajectory_stat.st_size == 0
+    return bool(
+        offsets[0] >= 0 and offsets[-1] < trajectory_stat.st_size and np.all(np.diff(offsets) > 0)
+    )
+
+
+def load_frame_offsets(path: c2at.FILE_PATH) -> c2at.INT_ARRAY:
+    """Byte offset of every frame of the trajectory ``path``, from its sidecar index.
+
+    If the index is missing or out of date, the trajectory is scanned with :func:`scan_frame_offsets` and the index is rewritten, unless its directory is not writable.
+
+    :param path: The trajectory.
+    :type path: ``str | Path``
+    :return: Byte offset of the start of each frame.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    if index_is_current(path):
+        return np.fromfile(index_path(path), dtype=INDEX_DTYPE).astype(np.int64)
+    offsets = scan_frame_offsets(path)
+    try:
+        write_frame_offsets(path, offsets)
+    except OSError:
+        # The index only saves a rescan next time
+        pass
+    return offsets
+
+
+def read_frame_text(
+    path: c2at.FILE_PATH,
+    frame: int,
+    offsets: c2at.INT_ARRAY | None = None,
+    encoding: str = "utf-8",
+) -> str:
+    """Read the text of one frame, seeking straight to it.
+
+    :param path: The trajectory.
+    :type path: ``str | Path``
+    :param frame: Index of the frame. Negative indices count from the end.
+    :type frame: ``int``
+    :param offsets: Frame offsets from :func:`load_frame_offsets`, defaults to ``None`` meaning they are loaded.
+    :type offsets: :ref:`INT ARRAY <types>` ``| None``, optional
+    :param encoding: File encoding, defaults to "utf-8".
+    :type encoding: ``str``, optional
+    :raises IndexError: If there is no such frame.
+    :return: The frame, from its number of atoms line to its last atom line.
+    :rtype: ``str``
+    """
+    if offsets is None:
+        offsets = load_frame_offsets(path)
+    start = int(offsets[frame])
+    with open(path, "rb") as trajectory:
+        trajectory.seek(start)
+        natoms_line = trajectory.readline()
+        lines = [natoms_line]
+        for _ in range(int(natoms_line) + 1):
+            lines.append(trajectory.readline())
+    return b"".join(lines).decode(encoding)
+
+
+def parse_frame(
+    text: str, conquest_input: conquest_species, lattice_is_angstrom: bool = False
+) -> conquest_coordinates:
+    """Parse one XYZ or ``.extxyz`` frame into a :class:`~conquest2a.conquest.conquest_coordinates` instance.
+
+    Positions are read in angstroms and converted to Bohr. The lattice is read from the ``Lattice`` field of the comment line, in Bohr as written by :class:`~conquest2a.writers.extxyz_writer` unless ``lattice_is_angstrom``; fractional coordinates are only set if there is a lattice. The species and position columns are located from the ``Properties`` field, defaulting to ``species:S:1:pos:R:3``. Each label is mapped to the lowest species index with that label.
+
+    :param text: The frame, from its number of atoms line to its last atom line.
+    :type text: ``str``
+    :param conquest_input: :class:`~conquest2a.conquest.conquest_species` instance mapping labels to species.
+    :type conquest_input: ``conquest_species``
+    :param lattice_is_angstrom: Whether the ``Lattice`` field is in angstroms rather than Bohr, defaults to ``False``.
+    :type lattice_is_angstrom: ``bool``, optional
+    :raises ValueError: If a label is not in the species map, or the frame has the wrong number of atoms.
+    :return: The frame's coordinates.
+    :rtype: ``conquest_coordinates``
+    """
+    lines = text.splitlines()
+    natoms = int(lines[0])
+    fields = {key: value.strip('"') for key, value in _RE_COMMENT_FIELD.findall(lines[1])}
+    species_column, pos_column = _property_columns(fields.get("Properties"))
+    atom_lines = lines[2 : 2 + natoms]
+    if len(atom_lines) != natoms:
+        raise ValueError(f"Frame should have {natoms} atoms, found {len(atom_lines)}.")
+    labels: c2at.STR_ARRAY = np.loadtxt(
+        atom_lines, dtype=str, usecols=species_column, comments=None, ndmin=1
+    )
+    positions: c2at.REAL_ARRAY = np.loadtxt(
+        atom_lines,
+        dtype=np.float64,
+        usecols=(pos_column, pos_column + 1, pos_column + 2),
+        comments=None,
+        ndmin=2,
+    ).reshape(natoms, 3)
+
+    coords = conquest_coordinates(conquest_input)
+    coords.natoms = f"{natoms}\n"
+    columns = atom_columns(natoms)
+    columns.labels = labels.astype(columns.labels.dtype)
+    columns.species = _labels_to_species(labels, conquest_input)
+    columns.cart_coords = positions * ANGSTROM_TO_BOHR
+    if "Lattice" in fields:
+        lattice = np.array(fields["Lattice"].split(), dtype=np.float64).reshape(3, 3)
+        coords.lattice_vectors = lattice * ANGSTROM_TO_BOHR if lattice_is_angstrom else lattice
+        columns.frac_coords = np.linalg.solve(coords.lattice_vectors.T, columns.cart_coords.T).T
+    else:
+        coords.lattice_vectors = np.zeros((3, 3))
+    coords.columns = columns
+    return coords
+
+
+def _property_columns(properties: str | None) -> tuple[int, int]:
+    """Column of the species and first column of the positions, from an extxyz ``Properties`` field."""
+    if properties is None:
+        return 0, 1
+    parts = properties.split(":")
+    columns: dict[str, int] = {}
+    column = 0
+    for name, _kind, width in zip(parts[0::3], parts[1::3], parts[2::3]):
+        columns[name] = column
+        column += int(width)
+    if "species" not in columns or "pos" not in columns:
+        raise ValueError(f"Properties {properties} should have species and pos columns.")
+    return columns["species"], columns["pos"]
+
+
+def _labels_to_species(labels: c2at.STR_ARRAY, conquest_input: conquest_species) -> c2at.INT_ARRAY:
+    label_to_species: dict[str, int] = {}
+    for species_index, label in sorted(conquest_input.species_dict.items()):
+        label_to_species.setdefault(label, species_index)
+    unique_labels, inverse = np.unique(labels, return_inverse=True)
+    unknown = [str(label) for label in unique_labels if label not in label_to_species]
+    if unknown:
+        raise ValueError(f"Labels {unknown} are not in the species map.")
+    species = np.array([label_to_species[str(label)] for label in unique_labels], dtype=np.int64)
+    return species[inverse.reshape(-1)]
+
+
+def _read_frame_at(
+    path: str,
+    offset: int,
+    conquest_input: conquest_species,
+    encoding: str,
+    lattice_is_angstrom: bool,
+) -> conquest_coordinates:
+    text = read_frame_text(path, 0, np.array([offset]), encoding=encoding)
+    return parse_frame(text, conquest_input, lattice_is_angstrom)
+
+
+class trajectory_reader(Sequence[conquest_coordinates]):
+    """Random access to the frames of an XYZ or ``.extxyz`` trajectory.
+
+    The frame index is loaded, or built once, by :func:`load_frame_offsets`. Frames are parsed on access by :func:`parse_frame`: indexing gives one frame, and slicing gives a lazy view of the selected frames. :func:`iter_frames` streams frames one at a time, and :func:`read_frames` parses many frames in worker processes.
+
+    :param path: Path of the trajectory.
+    :type path: ``str``
+    :param conquest_input: :class:`~conquest2a.conquest.conquest_species` instance mapping labels to species.
+    :type conquest_input: ``conquest_species``
+    :param encoding: File encoding, defaults to "utf-8".
+    :type encoding: ``str``, optional
+    :param lattice_is_angstrom: Whether the ``Lattice`` field is in angstroms rather than Bohr, see :func:`parse_frame`. Defaults to ``False``.
+    :type lattice_is_angstrom: ``bool``, optional
+    :param offsets: Byte offsets of the frames to expose, defaults to ``None`` meaning every frame, from :func:`load_frame_offsets`.
+    :type offsets: :ref:`INT ARRAY <types>` ``| None``, optional
+    """
+
+    # Number of frames below which read_frames does not start worker processes
+    PARALLEL_MIN_FRAMES: int = 8
+
+    def __init__(
+        self,
+        path: str,
+        conquest_input: conquest_species,
+        encoding: str = "utf-8",
+        lattice_is_angstrom: bool = False,
+        offsets: c2at.INT_ARRAY | None = None,
+    ) -> None:
+        self.path: str = path
+        self.conquest_input: conquest_species = conquest_input
+        self.encoding: str = encoding
+        self.lattice_is_angstrom: bool = lattice_is_angstrom
+        self.offsets: c2at.INT_ARRAY = load_frame_offsets(path) if offsets is None else offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @overload
+    def __getitem__(self, key: int | np.integer[Any]) -> conquest_coordinates: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "trajectory_reader": ...
+
+    def __getitem__(
+        self, key: int | np.integer[Any] | slice
+    ) -> "conquest_coordinates | trajectory_reader":
+        if isinstance(key, slice):
+            return trajectory_reader(
+                self.path,
+                self.conquest_input,
+                self.encoding,
+                self.lattice_is_angstrom,
+                offsets=self.offsets[key],
+            )
+        return _read_frame_at(
+            self.path,
+            int(self.offsets[key]),
+            self.conquest_input,
+            self.encoding,
+            self.lattice_is_angstrom,
+        )
+
+    def iter_frames(self) -> Iterator[conquest_coordinates]:
+        """Parse the frames one at a time, in order, reading the file sequentially. Only one frame is held in memory at a time.
+
+        :return: Iterator over the frames.
+        :rtype: ``Iterator[conquest_coordinates]``
+        """
+        with open(self.path, "rb") as trajectory:
+            for offset in self.offsets:
+                trajectory.seek(int(offset))
+                natoms_line = trajectory.readline()
+                lines = [natoms_line]
+                for _ in range(int(natoms_line) + 1):
+                    lines.append(trajectory.readline())
+                yield parse_frame(
+                    b"".join(lines).decode(self.encoding),
+                    self.conquest_input,
+                    self.lattice_is_angstrom,
+                )
+
+    def __iter__(self) -> Iterator[conquest_coordinates]:
+        return self.iter_frames()
+
+    def read_frames(
+        self, indices: Sequence[int] | None = None, workers: int | None = None, chunksize: int = 1
+    ) -> list[conquest_coordinates]:
+        """Parse many frames, in parallel worker processes.
+
+        :param indices: Frames to parse, defaults to ``None`` meaning all of them.
+        :type indices: ``Sequence[int] | None``, optional
+        :param workers: Number of worker processes, defaults to ``None`` meaning the number of CPUs. With ``workers=1``, or fewer than :attr:`PARALLEL_MIN_FRAMES` frames, frames are parsed in this process.
+        :type workers: ``int | None``, optional
+        :param chunksize: Number of frames sent to a worker at a time, defaults to 1.
+        :type chunksize: ``int``, optional
+        :return: The frames, in the order of ``indices``.
+        :rtype: ``list[conquest_coordinates]``
+        """
+        offsets = self.offsets if indices is None else self.offsets[np.asarray(indices, dtype=int)]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        count = len(offsets)
+        if workers == 1 or count < self.PARALLEL_MIN_FRAMES:
+            return [
+                _read_frame_at(
+                    self.path,
+                    int(offset),
+                    self.conquest_input,
+                    self.encoding,
+                    self.lattice_is_angstrom,
+                )
+                for offset in offsets
+            ]
+        with ProcessPoolExecutor(max_workers=min(workers, count)) as executor:
+            return list(
+                executor.map(
+                    _read_frame_at,
+                    [self.path] * count,
+                    offsets.tolist(),
+                    [self.conquest_input] * count,
+                    [self.encoding] * count,
+                    [self.lattice_is_angstrom] * count,
+                    chunksize=chunksize,
+                )
+            )
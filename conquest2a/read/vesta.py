@@ -7,7 +7,12 @@ import re
 import numpy as np
 import conquest2a._types as c2at
 from conquest2a.constants import ANGSTROM_TO_BOHR
-from conquest2a.conquest import processor_base, conquest_species, conquest_coordinates, Atom
+from conquest2a.conquest import (
+    processor_base,
+    conquest_species,
+    conquest_coordinates,
+    atom_columns,
+)
 from conquest2a.writers import conquest_writer
 
 
@@ -51,6 +56,10 @@ class vesta_to_conquest(processor_base):
         if not match:
             raise ValueError("STRUC block not found or not properly terminated.")
         lines = match.group(1).splitlines()
+        species: list[int] = []
+        numbers: list[int] = []
+        labels: list[str] = []
+        frac_coords: list[list[float]] = []
         i = 0
         while i < len(lines):
             line = lines[i].strip()
@@ -63,17 +72,18 @@ class vesta_to_conquest(processor_base):
                 sp_dict = self.conquest_input.species_dict.items()
                 species_int = [k for k, v in sp_dict if v == str(parts[1])][0]
                 # choose first element as species int, fix spin later
-                self.conq_coords.atoms.append(
-                    Atom(
-                        species=species_int,
-                        can_move=["T", "T", "T"],
-                        number=int(parts[0]),
-                        coords=np.array([float(parts[4]), float(parts[5]), float(parts[6])]),
-                        label=str(parts[1]),
-                    )
-                )
+                species.append(species_int)
+                numbers.append(int(parts[0]))
+                labels.append(str(parts[1]))
+                frac_coords.append([float(parts[4]), float(parts[5]), float(parts[6])])
                 i += 1
-        self.conq_coords.natoms = str(len(self.conq_coords.atoms))
+        columns = atom_columns(len(species))
+        columns.species = np.array(species, dtype=np.int64)
+        columns.numbers = np.array(numbers, dtype=np.int64)
+        columns.labels[:] = labels
+        columns.frac_coords = np.array(frac_coords, dtype=np.float64).reshape(-1, 3)
+        self.conq_coords.columns = columns
+        self.conq_coords.natoms = str(len(columns))
 
     def parse_vectr(self) -> None:
         match = re.search(r"VECTR\n(.*?)\nVECTT", self.content, re.DOTALL)
@@ -125,15 +135,16 @@ class vesta_to_conquest(processor_base):
 
     def assign_species(self) -> None:
         spin_species_map = self.build_spin_species_map()
-        for atom in self.conq_coords.atoms:
-            spin = self.atom_to_spin.get(atom.number, 0)
-            key = (atom.label, spin)
+        columns = self.conq_coords.columns
+        for row, (number, label) in enumerate(zip(columns.numbers.tolist(), columns.labels)):
+            spin = self.atom_to_spin.get(number, 0)
+            key = (str(label), spin)
             if key not in spin_species_map:
                 raise ValueError(
-                    f"No species found for element '{atom.label}' with spin {spin}. "
+                    f"No species found for element '{label}' with spin {spin}. "
                     "Check your species_dict."
                 )
-            atom.species = spin_species_map[key]  # set species for spin
+            columns.species[row] = spin_species_map[key]  # set species for spin
 
 
 if __name__ == "__main__":
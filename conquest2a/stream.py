@@ -0,0 +1,194 @@
+"""
+Streaming conversion of CONQUEST coordinates files that do not fit in memory.
+
+The atom block is read and written in fixed-size chunks, so memory use is bounded by the chunk size rather than by the number of atoms in the cell.
+"""
+
+import shutil
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Literal
+from collections.abc import Iterator
+import numpy as np
+from conquest2a.conquest import (
+    atom_columns,
+    conquest_coordinates,
+    conquest_coordinates_processor,
+    conquest_species,
+    processor_base,
+)
+from conquest2a.writers import atomic_output, extxyz_writer, vasp_writer, xsf_writer, xyz_writer
+
+
+class coordinates_stream(processor_base):
+    """Reads a CONQUEST coordinates file chunk by chunk, and converts it to other formats without holding every atom in memory.
+
+    Only the header is read on construction; :attr:`coords` holds the lattice vectors and number of atoms but no atoms.
+
+    XYZ, ``.extxyz`` and XSF files are written in a single pass, with atoms in the order of the coordinates file. POSCAR files group atoms by element, so each chunk is split by element into temporary files next to ``dest`` which are joined once the whole file has been read. The output is the same as that of :class:`~conquest2a.writers.vasp_writer`.
+
+    As with the writers, output is compressed if ``dest`` ends in ``.gz``, ``.xz`` or ``.zst``, see :func:`~conquest2a.writers.open_output`. Files are written atomically, see :func:`~conquest2a.writers.atomic_output`.
+
+    :param path: Path of the CONQUEST coordinates file to read.
+    :type path: ``str``
+    :param conquest_input: :class:`~conquest2a.conquest.conquest_species` instance.
+    :type conquest_input: ``conquest_species``
+    :param chunk_size: Number of atoms read at a time, defaults to 100000.
+    :type chunk_size: ``int``, optional
+    :raises ValueError: If ``chunk_size`` is not positive.
+    """
+
+    def __init__(
+        self, path: str, conquest_input: conquest_species, chunk_size: int = 100_000
+    ) -> None:
+        processor_base.__init__(
+            self, path=path, err_str="Error opening specified CONQUEST coordinates file."
+        )
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive.")
+        self.resolve_path()
+        self.chunk_size: int = chunk_size
+        self.coords: conquest_coordinates = conquest_coordinates(conquest_input=conquest_input)
+        with open(self.abs_input_path, "r", encoding="utf-8") as conquest_coord_file:
+            self.coords.lattice_vectors, self.coords.natoms = (
+                conquest_coordinates_processor.parse_header(conquest_coord_file)
+            )
+
+    def iter_chunks(self) -> Iterator[atom_columns]:
+        """Parse the atom block of the file :attr:`chunk_size` lines at a time.
+
+        :return: Iterator over the atoms, with atom numbers, Cartesian coordinates and labels set.
+        :rtype: ``Iterator[atom_columns]``
+        """
+        first_number = 1
+        with open(self.abs_input_path, "r", encoding="utf-8") as conquest_coord_file:
+            _ = conquest_coordinates_processor.parse_header(conquest_coord_file)
+            while True:
+                lines = list(islice(conquest_coord_file, self.chunk_size))
+                if not lines:
+                    break
+                columns = conquest_coordinates_processor.parse_atom_block(lines)
+                if len(columns) == 0:
+                    continue
+                columns.numbers = np.arange(first_number, first_number + len(columns))
+                columns.cart_coords = columns.frac_coords @ self.coords.lattice_vectors.T
+                columns.labels = self.coords.species_to_labels(columns.species)
+                first_number += len(columns)
+                yield columns
+
+    def write_xyz(
+        self, dest: str, encoding: str = "utf-8", comment_line: str = "comment line"
+    ) -> None:
+        """Write the file as an XYZ file, see :class:`~conquest2a.writers.xyz_writer`.
+
+        :param dest: Path to write the XYZ file.
+        :type dest: ``str``
+        :param encoding: File encoding, defaults to "utf-8".
+        :type encoding: ``str``, optional
+        :param comment_line: What string to write as the comment line.
+        :type comment_line: ``str``, optional
+        """
+        with atomic_output(dest.strip(), encoding=encoding) as file:
+            file.write(f"{self.coords.natoms}")
+            file.write(f"{comment_line}\n")
+            for columns in self.iter_chunks():
+                file.write(xyz_writer.format_atoms(columns.labels, columns.cart_coords))
+
+    def write_extxyz(self, dest: str, encoding: str = "utf-8", time: float = 0.0) -> None:
+        """Write the file as an ``.extxyz`` file, see :class:`~conquest2a.writers.extxyz_writer`.
+
+        :param dest: Path to write the ``.extxyz`` file.
+        :type dest: ``str``
+        :param encoding: File encoding, defaults to "utf-8".
+        :type encoding: ``str``, optional
+        :param time: The instance of time of the cell, defaults to `0.0`.
+        :type time: ``float``, optional
+        """
+        self.write_xyz(
+            dest,
+            encoding=encoding,
+            comment_line=extxyz_writer.format_comment_line(self.coords.lattice_vectors, time),
+        )
+
+    def write_xsf(self, dest: str, encoding: str = "utf-8") -> None:
+        """Write the file as an XSF file, see :class:`~conquest2a.writers.xsf_writer`.
+
+        A coordinates file has no forces or spins, so the extra vector of every atom is zero.
+
+        :param dest: Path to write the XSF file.
+        :type dest: ``str``
+        :param encoding: File encoding, defaults to "utf-8".
+        :type encoding: ``str``, optional
+        """
+        with atomic_output(dest.strip(), encoding=encoding) as file:
+            file.write(xsf_writer.format_header(self.coords.lattice_vectors, self.coords.natoms))
+            for columns in self.iter_chunks():
+                file.write(
+                    xsf_writer.format_atoms(columns.labels, columns.cart_coords, columns.spins)
+                )
+
+    def write_vasp(self, dest: str, encoding: str = "utf-8") -> None:
+        """Write the file as a POSCAR file, see :class:`~conquest2a.writers.vasp_writer`.
+
+        Positions are spilled to one temporary file per element, in the directory of ``dest``, and copied into ``dest`` once the number of atoms of each element is known.
+
+        :param dest: Path to write the POSCAR file.
+        :type dest: ``str``
+        :param encoding: File encoding, defaults to "utf-8".
+        :type encoding: ``str``, optional
+        """
+        dest_path = Path(dest.strip())
+        elements: list[str] = list(self.coords.conquest_input.unique_elements)
+        counts: dict[str, int] = {element: 0 for element in elements}
+        spill_files: dict[str, IO[Any]] = {}
+        try:
+            for element in elements:
+                spill_files[element] = tempfile.TemporaryFile(
+                    mode="w+", encoding=encoding, dir=dest_path.parent
+                )
+            for columns in self.iter_chunks():
+                for element, indices in self.coords.group_by_element(columns.species).items():
+                    counts[element] += len(indices)
+                    spill_files[element].write(
+                        vasp_writer.format_atoms(columns.frac_coords[indices])
+                    )
+            ele_string: str = " ".join(elements)
+            num_string: str = " ".join(str(counts[element]) for element in elements)
+            with atomic_output(str(dest_path), encoding=encoding) as file:
+                file.write(
+                    vasp_writer.format_header(self.coords.lattice_vectors, ele_string, num_string)
+                )
+                for element in elements:
+                    spill_files[element].seek(0)
+                    shutil.copyfileobj(spill_files[element], file)
+        finally:
+            for spill_file in spill_files.values():
+                spill_file.close()
+
+    def convert(
+        self,
+        dest: str,
+        file_format: Literal["xyz", "extxyz", "xsf", "vasp"],
+        encoding: str = "utf-8",
+    ) -> None:
+        """Write the file in ``file_format``, with the default options of each format.
+
+        :param dest: Path to write the new file.
+        :type dest: ``str``
+        :param file_format: Format to write.
+        :type file_format: ``Literal["xyz", "extxyz", "xsf", "vasp"]``
+        :param encoding: File encoding, defaults to "utf-8".
+        :type encoding: ``str``, optional
+        :raises ValueError: If ``file_format`` is not supported.
+        """
+        if file_format == "xyz":
+            self.write_xyz(dest, encoding=encoding)
+        elif file_format == "extxyz":
+            self.write_extxyz(dest, encoding=encoding)
+        elif file_format == "xsf":
+            self.write_xsf(dest, encoding=encoding)
+        elif file_format == "vasp":
+            self.write_vasp(dest, encoding=encoding)
+        else:
+            raise ValueError(f"Unsupported file format {file_format}.")
@@ -1,6 +1,37 @@
-import copy
+import sys
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+from collections.abc import Iterator
 import numpy as np
-from conquest2a.conquest import conquest_coordinates, conquest_coordinates_processor, Atom
+import conquest2a._types as c2at
+from conquest2a.conquest import (
+    atom_columns,
+    atom_sequence,
+    conquest_coordinates,
+    conquest_coordinates_processor,
+    lazy_atom_sequence,
+)
+
+
+def image_offsets(repeats_x: int, repeats_y: int, repeats_z: int) -> c2at.REAL_ARRAY:
+    """Lattice translations :math:`(l, m, n)` of every image of the original cell, in fractional coordinates of the original cell.
+
+    :param repeats_x: Number of repeats along the :math:`a` lattice vector
+    :type repeats_x: ``int``
+    :param repeats_y: Number of repeats along the :math:`b` lattice vector
+    :type repeats_y: ``int``
+    :param repeats_z: Number of repeats along the :math:`c` lattice vector
+    :type repeats_z: ``int``
+    :return: Array of shape ``(I, 3)``, ordered by :math:`l`, then :math:`m`, then :math:`n`, with :math:`n` varying fastest.
+    :rtype: :ref:`REAL ARRAY <types>`
+    """
+    l, m, n = np.meshgrid(
+        np.arange(repeats_x + 1), np.arange(repeats_y + 1), np.arange(repeats_z + 1), indexing="ij"
+    )
+    return np.stack([l.ravel(), m.ravel(), n.ravel()], axis=1).astype(np.float64)
 
 
 class supercell:
@@ -73,8 +104,12 @@ class supercell:
             return [0]
         return range(0, upper_bound + 1, 1)
 
+    def image_offsets(self) -> c2at.REAL_ARRAY:
+        """Lattice translations of every image of the original cell, see :func:`image_offsets`."""
+        return image_offsets(self.repeats_x, self.repeats_y, self.repeats_z)
+
     def create_supercell(self) -> None:
-        """This method creates the :class:`Atom` s of the new supercell, looping through the original atoms, creating new ones corresponding to the repeats in each direction.
+        """This method creates the atom columns of the new supercell, copying the original atoms into every image of the cell.
 
         In terms of fractional coordinates, we set new coords of the original atoms to be
         :math:`x' = x/N_x, y' = y/N_y, z' = z/N_z`
@@ -94,30 +129,426 @@ class supercell:
 
         However, the original (0,0,0) now has duplicates in x,y,z,
         namely the new atoms at (0,0,0) + {(1/3, 0, 0), (0, 1/2, 0), (0,0,1/2), ...}
+
+        The positions of all images are computed in one broadcast operation, written straight into the new column, and every other column (species, ``can_move``, forces, spins, labels) is repeated as a whole array. Apart from the new columns themselves, no memory proportional to the size of the supercell is allocated.
+
+        Atoms are ordered atom by atom: all images of the first original atom, then all images of the second, and so on. The images of an atom follow :func:`image_offsets`. Atoms are renumbered from 1 in this order.
         """
+        original = self.coords_proc.coords.columns
         # No repeats at all -> just return original crystal
         if self.repeats_x == 0 and self.repeats_y == 0 and self.repeats_z == 0:
-            self.supercell_coords.atoms = copy.deepcopy(self.coords_proc.coords.atoms)
+            self.supercell_coords.columns = original.take(np.arange(len(original)))
             self.supercell_coords.natoms = self.coords_proc.coords.natoms
             return
-        for atom in self.coords_proc.coords.atoms:
-            for l in self.range(self.repeats_x):
-                for m in self.range(self.repeats_y):
-                    for n in self.range(self.repeats_z):
-                        new_atom = Atom(
-                            atom.species,
-                            np.array(
-                                [
-                                    (atom.coords[0] + l) / (self.repeats_x + 1),
-                                    (atom.coords[1] + m) / (self.repeats_y + 1),
-                                    (atom.coords[2] + n) / (self.repeats_z + 1),
-                                ]
-                            ),
-                            can_move=atom.can_move,
-                            label=atom.label,
-                            number=len(self.supercell_coords.atoms) + 1,
-                            spins=atom.spins,
-                            forces=atom.forces,
-                        )
-                        self.supercell_coords.atoms.append(new_atom)
-        self.supercell_coords.get_cartesian_positions()
+        offsets = self.image_offsets()
+        nimages = len(offsets)
+        columns = original.repeat(nimages)
+        frac_coords = columns.frac_coords.reshape(len(original), nimages, 3)
+        np.add(original.frac_coords[:, None, :], offsets[None, :, :], out=frac_coords)
+        frac_coords /= np.array(
+            [self.repeats_x + 1, self.repeats_y + 1, self.repeats_z + 1], dtype=np.float64
+        )
+        columns.numbers = np.arange(1, len(columns) + 1, dtype=np.int64)
+        # As get_cartesian_positions, but into the repeated column rather than a new array
+        np.matmul(
+            columns.frac_coords, self.supercell_coords.lattice_vectors.T, out=columns.cart_coords
+        )
+        self.supercell_coords.columns = columns
+
+
+class virtual_supercell(conquest_coordinates):
+    """A supercell whose atoms are computed on demand from the original cell, rather than stored.
+
+    It holds the same atoms, in the same order, as :attr:`supercell.supercell_coords`: atom ``k`` is image ``k % I`` of original atom ``k // I``, where ``I`` is the number of images and images follow :func:`image_offsets`. Only the lattice vectors and the original cell are stored, so memory use does not grow with the number of repeats.
+
+    Rows are produced by :func:`read_rows`, so the file writers, which read atoms chunk by chunk through :func:`~conquest2a.conquest.conquest_coordinates.iter_element_chunks`, stream the supercell without building it. Accessing :attr:`columns` materialises every atom.
+
+    :param repeats_x: Number of repeats along the :math:`a` lattice vector
+    :type repeats_x: ``int``
+    :param repeats_y: Number of repeats along the :math:`b` lattice vector
+    :type repeats_y: ``int``
+    :param repeats_z: Number of repeats along the :math:`c` lattice vector
+    :type repeats_z: ``int``
+    :param coords_proc: The :class:`conquest_coordinates_processor` to use.
+    :type coords_proc: conquest_coordinates_processor
+    :raises ValueError: If any of the ``repeats_*`` is not a positive integer
+    """
+
+    IN_MEMORY: bool = False
+
+    def __init__(
+        self,
+        repeats_x: int,
+        repeats_y: int,
+        repeats_z: int,
+        coords_proc: conquest_coordinates_processor,
+    ) -> None:
+        if repeats_x < 0 or repeats_y < 0 or repeats_z < 0:
+            raise ValueError(
+                "One of, or multiple of, repeats_x repeats_y, repeats_z was not at least 0."
+            )
+        self.parent: conquest_coordinates = coords_proc.coords
+        super().__init__(self.parent.conquest_input)
+        self._materialised: atom_columns | None = None
+        self._cart_coords: c2at.REAL_ARRAY | None = None
+        self.scale: c2at.REAL_ARRAY = np.array(
+            [repeats_x + 1, repeats_y + 1, repeats_z + 1], dtype=np.float64
+        )
+        self.offsets: c2at.REAL_ARRAY = image_offsets(repeats_x, repeats_y, repeats_z)
+        self.nimages: int = len(self.offsets)
+        # As supercell.scale_lattice_vectors
+        self.lattice_vectors = np.matmul(
+            self.parent.lattice_vectors, np.diag([repeats_x + 1, repeats_y + 1, repeats_z + 1])
+        )
+        self.natoms = str(len(self))
+
+    @override
+    def __len__(self) -> int:
+        return len(self.parent) * self.nimages
+
+    @override
+    def read_rows(self, indices: c2at.INT_ARRAY | slice) -> atom_columns:
+        """Compute a subset of atoms from their original atom and image.
+
+        :param indices: Row indices, in the order to return them, or a slice of rows.
+        :type indices: :ref:`INT ARRAY <types>` ``| slice``
+        :return: Columns for the requested rows, including Cartesian coordinates and labels.
+        :rtype: :class:`atom_columns`
+        """
+        if self._materialised is not None:
+            return super().read_rows(indices)
+        if isinstance(indices, slice):
+            indices = np.arange(len(self), dtype=np.int64)[indices]
+        indices = np.asarray(indices, dtype=np.int64)
+        parent_rows, images = np.divmod(indices, self.nimages)
+        if self.parent.IN_MEMORY:
+            columns = self.parent.columns.take(parent_rows)
+        else:
+            # Read each original atom once, however many of its images are requested
+            unique_rows, inverse = np.unique(parent_rows, return_inverse=True)
+            columns = self.parent.read_rows(unique_rows).take(inverse)
+        frac_coords = columns.frac_coords
+        frac_coords += self.offsets[images]
+        frac_coords /= self.scale
+        columns.numbers = indices + 1
+        columns.cart_coords = frac_coords @ self.lattice_vectors.T
+        return columns
+
+    def _element_rows(
+        self, parent_indices: c2at.INT_ARRAY, start: int, stop: int
+    ) -> c2at.INT_ARRAY:
+        # Rows start:stop of the element whose original atoms are parent_indices
+        flat = np.arange(start, stop, dtype=np.int64)
+        return parent_indices[flat // self.nimages] * self.nimages + flat % self.nimages
+
+    @override
+    def iter_element_chunks(
+        self, chunk_size: int | None = None
+    ) -> Iterator[tuple[c2at.INT_ARRAY, atom_columns]]:
+        """Compute atoms grouped by element ``chunk_size`` at a time, without building :attr:`element_indices`.
+
+        :param chunk_size: Atoms per chunk, defaults to ``None`` meaning :attr:`chunk_size`.
+        :type chunk_size: ``int | None``, optional
+        :return: Row indices and columns of each successive chunk.
+        :rtype: ``Iterator[tuple[INT_ARRAY, atom_columns]]``
+        """
+        if self._materialised is not None:
+            yield from super().iter_element_chunks(chunk_size)
+            return
+        chunk_size = self.chunk_size if chunk_size is None else chunk_size
+        for parent_indices in self.parent.element_indices.values():
+            count = len(parent_indices) * self.nimages
+            for start in range(0, count, chunk_size):
+                rows = self._element_rows(parent_indices, start, min(start + chunk_size, count))
+                yield rows, self.read_rows(rows)
+
+    @override
+    def number_of_elements(self) -> dict[str, int]:
+        """Function to get the number of atoms of each element, from those of the original cell.
+
+        :return: Returns a dictionary of the number of atoms per element
+        :rtype: ``dict[str, int]``
+        """
+        if self._materialised is not None:
+            return super().number_of_elements()
+        return {
+            element: count * self.nimages
+            for element, count in self.parent.number_of_elements().items()
+        }
+
+    @property  # type: ignore[override]
+    def columns(self) -> atom_columns:
+        if self._materialised is None:
+            self._materialised = self.read_rows(slice(None))
+        return self._materialised
+
+    @columns.setter
+    def columns(self, columns: atom_columns) -> None:
+        self._materialised = columns
+        self._element_indices = None
+        self._cart_coords = None
+
+    @property
+    @override
+    def atoms(self) -> atom_sequence:
+        return lazy_atom_sequence(self, np.arange(len(self), dtype=np.int64))
+
+    @property
+    @override
+    def element_indices(self) -> dict[str, c2at.INT_ARRAY]:
+        if self._materialised is not None:
+            return super().element_indices
+        if self._element_indices is None:
+            self._element_indices = {
+                element: self._element_rows(parent_indices, 0, len(parent_indices) * self.nimages)
+                for element, parent_indices in self.parent.element_indices.items()
+            }
+        return self._element_indices
+
+    @property
+    @override
+    def element_map(self) -> dict[str, atom_sequence]:
+        return {
+            element: lazy_atom_sequence(self, indices)
+            for element, indices in self.element_indices.items()
+        }
+
+    @override
+    def get_cartesian_positions(self) -> c2at.REAL_ARRAY:
+        """Returns the Cartesian position of all the atoms, computed chunk by chunk without materialising the other columns. The positions are computed once and cached.
+
+        :return: The 3D vector of the Cartesian position.
+        :rtype: :ref:`REAL ARRAY <types>`
+        """
+        if self._materialised is not None:
+            return super().get_cartesian_positions()
+        if self._cart_coords is None:
+            self._cart_coords = np.concatenate(
+                list(self.iter_cartesian_positions()) + [np.empty((0, 3))]
+            )
+        return self._cart_coords
+
+    @property  # type: ignore[override]
+    def cart_position_vectors(self) -> c2at.REAL_ARRAY:
+        """The ``(N, 3)`` Cartesian positions of all atoms: the stored column once :attr:`columns` are materialised, otherwise the cached result of :func:`get_cartesian_positions`."""
+        if self._materialised is not None:
+            return self._materialised.cart_coords
+        return self.get_cartesian_positions()
+
+    @cart_position_vectors.setter
+    def cart_position_vectors(self, cart_coords: c2at.REAL_ARRAY) -> None:
+        # Positions of a computed cell can only be stored once its columns are materialised
+        self.columns.cart_coords = cart_coords
+
+    @override
+    def assign_atom_labels(self) -> None:
+        """Labels are copied from the original cell as rows are computed, see :func:`read_rows`."""
+        if self._materialised is not None:
+            super().assign_atom_labels()
+
+    @override
+    def index_to_atom_map(self) -> None:
+        """The element map is built from the original cell on first access of :attr:`element_map`."""
+        self._element_indices = None
+
+
+def hermite_normal_form(matrix: c2at.INT_ARRAY) -> c2at.INT_ARRAY:
+    """Lower-triangular Hermite normal form :math:`H = PU` of an integer matrix :math:`P`, with :math:`U` unimodular.
+
+    The columns of :math:`H` generate the same lattice as the columns of :math:`P`. Its diagonal is positive, and every entry left of the diagonal lies in :math:`[0, H_{ii})`.
+
+    :param matrix: ``(3, 3)`` integer matrix.
+    :type matrix: :ref:`INT ARRAY <types>`
+    :raises ValueError: If ``matrix`` is singular.
+    :return: The Hermite normal form.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    hnf = np.array(matrix, dtype=np.int64)
+    for i in range(3):
+        # Euclid's algorithm on the columns, clearing row i right of the diagonal
+        for j in range(i + 1, 3):
+            while hnf[i, j] != 0:
+                hnf[:, i] -= (hnf[i, i] // hnf[i, j]) * hnf[:, j]
+                hnf[:, [i, j]] = hnf[:, [j, i]]
+        if hnf[i, i] == 0:
+            raise ValueError("Supercell matrix must not be singular.")
+        if hnf[i, i] < 0:
+            hnf[:, i] = -hnf[:, i]
+        for j in range(i):
+            hnf[:, j] -= (hnf[i, j] // hnf[i, i]) * hnf[:, i]
+    return hnf
+
+
+def lattice_points(matrix: c2at.INT_ARRAY) -> c2at.INT_ARRAY:
+    """Lattice points of the original cell that lie inside the supercell spanned by the columns of ``matrix``, one per image of the original cell.
+
+    The points are enumerated from the diagonal of the :func:`hermite_normal_form` of ``matrix``: since it is triangular, the box :math:`[0, H_{11}) \\times [0, H_{22}) \\times [0, H_{33})` holds exactly one point of every translation of the supercell.
+
+    :param matrix: ``(3, 3)`` integer matrix.
+    :type matrix: :ref:`INT ARRAY <types>`
+    :return: Array of shape ``(|det(matrix)|, 3)``, in fractional coordinates of the original cell, ordered as :func:`image_offsets`.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    diagonal = np.diag(hermite_normal_form(matrix))
+    return image_offsets(*(diagonal - 1)).astype(np.int64)
+
+
+def most_cubic_matrix(
+    lattice_vectors: c2at.REAL_ARRAY, ncells: int, max_entry: int = 3, tolerance: float = 1e-6
+) -> c2at.INT_ARRAY:
+    """Find the supercell matrix of ``ncells`` original cells whose lattice vectors are orthogonal and closest to a cube.
+
+    Every integer vector with entries in ``[-max_entry, max_entry]`` is a candidate lattice vector, as is every diagonal matrix of determinant ``ncells``. All triples of mutually orthogonal candidates with determinant ``ncells`` are scored at once by the deviation of their lengths from the edge of a cube of the same volume. Ties go to matrices closest to diagonal, then with fewest negative entries.
+
+    The number of candidate triples grows as ``(2 * max_entry + 1) ** 6``, so large ``max_entry`` is expensive.
+
+    :param lattice_vectors: Lattice vectors of the original cell, as in :attr:`conquest_coordinates.lattice_vectors`.
+    :type lattice_vectors: :ref:`REAL ARRAY <types>`
+    :param ncells: Number of original cells in the supercell.
+    :type ncells: ``int``
+    :param max_entry: Largest absolute entry of non-diagonal candidates, defaults to 3.
+    :type max_entry: ``int``, optional
+    :param tolerance: Largest cosine of the angle between two lattice vectors considered orthogonal, defaults to 1e-6.
+    :type tolerance: ``float``, optional
+    :raises ValueError: If ``ncells`` is not positive, or if no candidate is orthogonal.
+    :return: The ``(3, 3)`` supercell matrix, with positive determinant.
+    :rtype: :ref:`INT ARRAY <types>`
+    """
+    if ncells < 1:
+        raise ValueError("Number of cells must be positive.")
+    box = image_offsets(*(3 * [2 * max_entry])).astype(np.int64) - max_entry
+    diagonal = [
+        (a, b, ncells // (a * b))
+        for a in range(1, ncells + 1)
+        for b in range(1, ncells // a + 1)
+        if ncells % (a * b) == 0
+    ]
+    # Each factor of each factorisation along its own axis, e.g. (2, 1, 4) gives (2, 0, 0), (0, 1, 0) and (0, 0, 4)
+    axis_vectors = np.einsum("fi,ij->fij", np.array(diagonal), np.eye(3, dtype=np.int64))
+    vectors = np.unique(
+        np.vstack([box[np.any(box != 0, axis=1)], axis_vectors.reshape(-1, 3)]), axis=0
+    )
+    vectors = vectors[np.any(vectors != 0, axis=1)]
+    cart = vectors @ np.asarray(lattice_vectors, dtype=np.float64).T
+    lengths = np.linalg.norm(cart, axis=1)
+    orthogonal = np.abs(cart @ cart.T) <= tolerance * np.outer(lengths, lengths)
+    pairs = np.argwhere(orthogonal)
+    pair_index, third = np.nonzero(orthogonal[pairs[:, 0]] & orthogonal[pairs[:, 1]])
+    triples = np.column_stack([pairs[pair_index], third])
+    # (T, 3, 3) matrices whose columns are the candidate vectors
+    matrices = np.transpose(vectors[triples], (0, 2, 1))
+    first, second, third_vectors = vectors[triples[:, 0]], vectors[triples[:, 1]], vectors[third]
+    determinants = np.einsum("ti,ti->t", first, np.cross(second, third_vectors))
+    matches = determinants == ncells
+    if not np.any(matches):
+        raise ValueError(
+            f"No orthogonal supercell of {ncells} cells found, try a larger max_entry."
+        )
+    matrices, triples = matrices[matches], triples[matches]
+    edge = (abs(np.linalg.det(lattice_vectors)) * ncells) ** (1 / 3)
+    score = np.sum((lengths[triples] / edge - 1) ** 2, axis=1)
+    diagonal_sum = np.abs(np.diagonal(matrices, axis1=1, axis2=2)).sum(axis=1)
+    off_diagonal = np.abs(matrices).sum(axis=(1, 2)) - diagonal_sum
+    negative = np.count_nonzero(matrices < 0, axis=(1, 2))
+    # Scores equal up to rounding are ties
+    best = np.lexsort((negative, off_diagonal, np.round(score, 12)))[0]
+    return matrices[best]
+
+
+class transformed_supercell:
+    """Class to produce supercells from a general integer transformation matrix :math:`P`. The lattice vectors of the supercell are the columns of :math:`LP`, where the columns of :math:`L` are those of the original cell, so a diagonal :math:`P` gives the same cell as :class:`supercell`.
+
+    Every original atom is copied to each lattice point of :func:`lattice_points` and wrapped back into the supercell, in fractional coordinates :math:`x' = P^{-1}(x + t) \\bmod 1`. Atoms are ordered as in :class:`supercell`: all images of the first original atom, then all images of the second, and so on.
+
+    CONQUEST only accepts orthorhombic cells along the Cartesian axes. If the new lattice vectors are orthogonal but not along the axes, they are rotated onto them, which leaves the fractional coordinates unchanged. Forces and spins are rotated with them, by :attr:`rotation`. :func:`most_cubic` picks such a matrix.
+
+    :param matrix: ``(3, 3)`` integer matrix with positive determinant, whose columns are the supercell lattice vectors in units of the original ones.
+    :type matrix: :ref:`INT ARRAY <types>`
+    :param coords_proc: The :class:`conquest_coordinates_processor` to use.
+    :type coords_proc: conquest_coordinates_processor
+    :param align: Rotate orthogonal lattice vectors onto the Cartesian axes, defaults to ``True``.
+    :type align: ``bool``, optional
+    :raises ValueError: If ``matrix`` is not a ``(3, 3)`` integer matrix with positive determinant.
+    """
+
+    def __init__(
+        self,
+        matrix: c2at.INT_ARRAY,
+        coords_proc: conquest_coordinates_processor,
+        align: bool = True,
+    ) -> None:
+        matrix = np.asarray(matrix)
+        if matrix.shape != (3, 3) or not np.array_equal(matrix, np.round(matrix)):
+            raise ValueError("Supercell matrix must be a 3x3 integer matrix.")
+        self.matrix: c2at.INT_ARRAY = matrix.astype(np.int64)
+        self.ncells: int = round(np.linalg.det(self.matrix))
+        if self.ncells <= 0:
+            raise ValueError("Supercell matrix must have a positive determinant.")
+        self.align = align
+        # Rotation applied to Cartesian vectors, set by scale_lattice_vectors
+        self.rotation: c2at.REAL_ARRAY = np.eye(3)
+        self.coords_proc = coords_proc
+        self.supercell_coords: conquest_coordinates = conquest_coordinates(
+            self.coords_proc.coords.conquest_input
+        )
+        self.scale_lattice_vectors()
+        self.create_supercell()
+        self.supercell_coords.natoms = str(len(self.supercell_coords.columns))
+        self.supercell_coords.index_to_atom_map()
+
+    @classmethod
+    def most_cubic(
+        cls,
+        target_atoms: int,
+        coords_proc: conquest_coordinates_processor,
+        max_entry: int = 3,
+    ) -> "transformed_supercell":
+        """Build the most cubic orthorhombic supercell with about ``target_atoms`` atoms, see :func:`most_cubic_matrix`.
+
+        :param target_atoms: Number of atoms wanted. The supercell holds the nearest whole number of original cells, and at least one.
+        :type target_atoms: ``int``
+        :param coords_proc: The :class:`conquest_coordinates_processor` to use.
+        :type coords_proc: conquest_coordinates_processor
+        :param max_entry: Largest absolute entry of non-diagonal candidates, defaults to 3.
+        :type max_entry: ``int``, optional
+        :return: The supercell.
+        :rtype: :class:`transformed_supercell`
+        """
+        ncells = max(1, round(target_atoms / len(coords_proc.coords.columns)))
+        matrix = most_cubic_matrix(coords_proc.coords.lattice_vectors, ncells, max_entry)
+        return cls(matrix, coords_proc)
+
+    def scale_lattice_vectors(self) -> None:
+        """
+        Produce the supercell's lattice vectors, rotated onto the Cartesian axes if they are orthogonal and ``align`` is set. The rotation :math:`R = D (LP)^{-1}`, where :math:`D` is the diagonal matrix of the lengths of the new lattice vectors, is stored in :attr:`rotation`.
+        """
+        lattice_vectors = np.matmul(self.coords_proc.coords.lattice_vectors, self.matrix)
+        metric = lattice_vectors.T @ lattice_vectors
+        lengths = np.sqrt(np.diag(metric))
+        off_diagonal = metric - np.diag(np.diag(metric))
+        is_orthogonal = np.all(np.abs(off_diagonal) <= 1e-10 * np.outer(lengths, lengths))
+        is_diagonal = np.array_equal(lattice_vectors, np.diag(np.diag(lattice_vectors)))
+        if self.align and is_orthogonal and not is_diagonal:
+            self.rotation = np.diag(lengths) @ np.linalg.inv(lattice_vectors)
+            lattice_vectors = np.diag(lengths)
+        self.supercell_coords.lattice_vectors = lattice_vectors
+
+    def create_supercell(self) -> None:
+        """Create the atom columns of the new supercell, copying the original atoms to every lattice point in one broadcast operation, as :func:`supercell.create_supercell`."""
+        original = self.coords_proc.coords.columns
+        points = lattice_points(self.matrix)
+        columns = original.repeat(len(points))
+        frac_coords = columns.frac_coords.reshape(len(original), len(points), 3)
+        np.add(original.frac_coords[:, None, :], points[None, :, :], out=frac_coords)
+        frac_coords[...] = frac_coords @ np.linalg.inv(self.matrix).T
+        frac_coords -= np.floor(frac_coords)
+        # Tiny negative coordinates wrap to exactly 1
+        frac_coords[frac_coords >= 1.0] = 0.0
+        columns.numbers = np.arange(1, len(columns) + 1, dtype=np.int64)
+        np.matmul(
+            columns.frac_coords, self.supercell_coords.lattice_vectors.T, out=columns.cart_coords
+        )
+        if not np.array_equal(self.rotation, np.eye(3)):
+            columns.forces = columns.forces @ self.rotation.T
+            columns.spins = columns.spins @ self.rotation.T
+        self.supercell_coords.columns = columns
@@ -1,17 +1,196 @@
-from io import TextIOWrapper
+import gzip
+import hashlib
+import lzma
+import os
+import secrets
+import shutil
+import stat
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BufferedReader, BufferedWriter, TextIOWrapper
+from itertools import chain, islice
+from pathlib import Path
 from typing import IO, Any, Literal
+from collections.abc import Iterator, Mapping, Sequence
+from types import TracebackType
 import sys
 if sys.version_info >= (3, 12):
     from typing import override
 else:
     from typing_extensions import override
-from conquest2a.conquest import Atom, conquest_coordinates, atom_charge
+import numpy as np
+from conquest2a.conquest import atom_charge, atom_columns, conquest_coordinates
 from conquest2a.constants import BOHR_TO_ANGSTROM
+from conquest2a.formatting import (
+    FAST_MAX_PRECISION,
+    fixed_field,
+    flag_field,
+    integer_field,
+    join_fields,
+)
+from conquest2a._types import GENERIC_ARRAY, REAL_ARRAY, STR_ARRAY
+from conquest2a.read.trajectory import INDEX_DTYPE, index_path, load_frame_offsets
+
+# Number of atoms formatted at a time, which bounds the size of each formatted block
+WRITE_CHUNK_ATOMS: int = 1 << 16
+# Size of the buffer of files opened by writers
+WRITE_BUFFER_BYTES: int = 1 << 20
+# Extensions of files that open_output compresses
+COMPRESSED_SUFFIXES: tuple[str, ...] = (".gz", ".xz", ".zst", ".zstd")
+
+
+def format_block(line_format: str, columns: Sequence[GENERIC_ARRAY]) -> str:
+    """Format a block of rows with a single ``%`` operation, instead of one f-string per value.
+
+    Values are converted to Python objects first, so ``%r`` of a float gives the same shortest round-trip string as ``str`` of a NumPy float.
+
+    :param line_format: ``%``-style format of one line, with one field per column of ``columns``.
+    :type line_format: ``str``
+    :param columns: Arrays of the same length, either 1D or 2D. Each column of a 2D array is one field.
+    :type columns: ``Sequence[GENERIC_ARRAY]``
+    :return: The formatted lines.
+    :rtype: ``str``
+    """
+    fields: list[list[Any]] = []
+    for column in columns:
+        if column.ndim == 1:
+            fields.append(column.tolist())
+        else:
+            fields.extend(column[:, i].tolist() for i in range(column.shape[1]))
+    nrows = len(fields[0]) if fields else 0
+    return (line_format * nrows) % tuple(chain.from_iterable(zip(*fields)))
+
+
+def is_compressed(dest: str) -> bool:
+    """Whether :func:`open_output` compresses ``dest``, i.e. its extension is one of :data:`COMPRESSED_SUFFIXES`."""
+    return Path(dest.strip()).suffix.lower() in COMPRESSED_SUFFIXES
+
+
+def open_output(dest: str, mode: str = "w", encoding: str = "utf-8") -> IO[Any]:
+    """Open a file to write, compressing it if its extension is ``.gz`` (gzip), ``.xz`` (xz) or ``.zst`` (Zstandard).
+
+    Zstandard needs Python 3.14 or the ``zstandard`` package.
+
+    :param dest: Path of the file.
+    :type dest: ``str``
+    :param mode: File mode, defaults to "w". ``encoding`` is ignored in binary modes.
+    :type mode: ``str``, optional
+    :param encoding: File encoding, defaults to "utf-8".
+    :type encoding: ``str``, optional
+    :raises ImportError: If ``dest`` ends in ``.zst`` and no Zstandard module is available.
+    :return: The open file.
+    :rtype: ``IO[Any]``
+    """
+    binary = "b" in mode
+    file_encoding = None if binary else encoding
+    compressed_mode = mode if binary else f"{mode}t"
+    if not is_compressed(dest):
+        return open(dest, mode=mode, encoding=file_encoding, buffering=WRITE_BUFFER_BYTES)
+    suffix = Path(dest).suffix.lower()
+    if suffix == ".gz":
+        return gzip.open(dest, compressed_mode, encoding=file_encoding)
+    if suffix == ".xz":
+        return lzma.open(dest, compressed_mode, encoding=file_encoding)
+    # .zst or .zstd
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd.open(dest, compressed_mode, encoding=file_encoding)  # type: ignore[no-any-return]
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "Writing .zst files needs Python 3.14 or the zstandard package."
+        ) from None
+    return zstandard.open(dest, compressed_mode, encoding=file_encoding)
+
+
+def temporary_path(dest: str) -> str:
+    """Create an empty file in the directory of ``dest`` to write to before moving it onto ``dest``.
+
+    The name keeps the extension of ``dest``, so :func:`open_output` compresses it the same way. The file has the permissions of ``dest`` if it exists, and otherwise those a new file would have: it is created with mode ``0o666`` less the umask, as by :func:`open`.
+
+    :param dest: Path the file will be moved to, with symlinks already resolved, see :func:`replace_target`.
+    :type dest: ``str``
+    :raises FileExistsError: If no unused name is found.
+    :return: Path of the temporary file.
+    :rtype: ``str``
+    """
+    path = Path(dest)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(tempfile.TMP_MAX):
+        tmp_name = str(path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp{path.suffix}")
+        try:
+            fd = os.open(tmp_name, flags, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        try:
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(dest).st_mode))
+        except FileNotFoundError:
+            pass
+        return tmp_name
+    raise FileExistsError(f"No unused temporary file name next to {dest}.")
+
+
+def replace_target(dest: str) -> str:
+    """The file that writing ``dest`` replaces: ``dest`` itself, or the file it links to, so that symlinks are kept.
+
+    :param dest: Path to write.
+    :type dest: ``str``
+    :return: ``dest`` with symlinks resolved.
+    :rtype: ``str``
+    """
+    return os.path.realpath(dest)
+
+
+@contextmanager
+def atomic_output(dest: str, mode: str = "w", encoding: str = "utf-8") -> Iterator[IO[Any]]:
+    """Open a file to write as with :func:`open_output`, but write to a temporary file that replaces ``dest`` only once the ``with`` block exits without an error.
+
+    Readers of ``dest`` never see a partial file, and if writing fails ``dest`` is left as it was. If ``dest`` is a symlink, the file it links to is replaced, and an existing file keeps its permissions, see :func:`temporary_path`.
+
+    .. code-block:: python
+
+      with atomic_output("POSCAR.gz") as file:
+          file.write(text)
+
+    :param dest: Path of the file.
+    :type dest: ``str``
+    :param mode: File mode, defaults to "w".
+    :type mode: ``str``, optional
+    :param encoding: File encoding, defaults to "utf-8".
+    :type encoding: ``str``, optional
+    :return: The open temporary file.
+    :rtype: ``Iterator[IO[Any]]``
+    """
+    target = replace_target(dest)
+    tmp_name = temporary_path(target)
+    try:
+        with open_output(tmp_name, mode=mode, encoding=encoding) as file:
+            yield file
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def chunk_slices(nrows: int, chunk_size: int = WRITE_CHUNK_ATOMS) -> list[slice]:
+    """Split ``nrows`` rows into slices of at most ``chunk_size`` rows."""
+    return [slice(start, start + chunk_size) for start in range(0, nrows, chunk_size)]
 
 
 class file_writer:
     """Generic parent class to define file operations and variables.
 
+    Files are opened with :func:`open_output`, so text formats are compressed when ``dest`` ends in ``.gz``, ``.xz`` or ``.zst``.
+
+    Unless ``mode`` appends, the file is written to a temporary file next to ``dest`` (see :func:`temporary_path`) which :func:`close_file` moves onto ``dest``, or onto the file it links to, keeping the permissions of an existing file. Subclasses write with :func:`write_and_close`, so that a failed write deletes the temporary file and leaves ``dest`` as it was.
+
     :param dest: _description_
     :type dest: str
     :param mode: _description_, defaults to "w"
@@ -20,31 +199,116 @@ class file_writer:
     :type encoding: str, optional
     :param is_angstrom: _description_, defaults to False
     :type is_angstrom: bool, optional
+    :param defer_open: Leave the file unopened, for subclasses that may not write at all. They assign :func:`open_file` to :attr:`file` before writing. Defaults to False.
+    :type defer_open: bool, optional
     """
 
     def __init__(
-        self, dest: str, mode: str = "w", encoding: str = "utf-8", is_angstrom: bool = False
+        self,
+        dest: str,
+        mode: str = "w",
+        encoding: str = "utf-8",
+        is_angstrom: bool = False,
+        defer_open: bool = False,
     ) -> None:
         self.mode: str = mode
         self.dest_path: str = dest.strip()
         self.encoding: str = encoding
         self.is_ang: bool = is_angstrom
-        self.file: IO[Any] = self.open_file()
+        self.tmp_path: str | None = None
+        self.file: IO[Any]
+        if not defer_open:
+            self.file = self.open_file()
 
     def open_file(self) -> IO[Any]:
-        file: IO[Any] = open(self.dest_path, mode=self.mode, encoding=self.encoding)
+        if "a" in self.mode:
+            return open_output(self.dest_path, mode=self.mode, encoding=self.encoding)
+        self.tmp_path = temporary_path(replace_target(self.dest_path))
+        file: IO[Any] = open_output(self.tmp_path, mode=self.mode, encoding=self.encoding)
         return file
 
     def close_file(self, file: TextIOWrapper | IO[Any]) -> None:
         file.close()
+        if self.tmp_path is not None and file is self.file:
+            os.replace(self.tmp_path, replace_target(self.dest_path))
+            self.tmp_path = None
+
+    def discard(self) -> None:
+        """Close the file and delete the temporary file, leaving ``dest`` as it was."""
+        self.file.close()
+        if self.tmp_path is not None:
+            Path(self.tmp_path).unlink(missing_ok=True)
+            self.tmp_path = None
+
+    def write_and_close(self) -> None:
+        """Call :func:`write`, then :func:`close_file`. If writing fails, :func:`discard` the file and re-raise."""
+        try:
+            self.write()
+        except BaseException:
+            self.discard()
+            raise
+        self.close_file(file=self.file)
 
     def write(self) -> None:
         pass
 
 
+# Extension of the patch records written by conquest_writer(..., delta="patch")
+PATCH_SUFFIX: str = ".patch"
+# First word of a patch record
+_PATCH_MAGIC: str = "conquest2a-patch"
+
+
+class digest_record:
+    """SHA-256 digests of files written by :class:`conquest_writer` in delta mode, with the size and modification time each file had when written.
+
+    Records are kept for the life of the process, or until :func:`clear`, and are safe to use from several threads, e.g. by :func:`export_formats`. :data:`written_digests` is the record shared by every writer.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Absolute path -> (size, modification time, SHA-256)
+        self._digests: dict[str, tuple[int, int, str]] = {}
+
+    def remember(self, dest: str, digest: str) -> None:
+        """Record the digest of the file just written at ``dest``."""
+        stat = os.stat(dest)
+        with self._lock:
+            self._digests[os.path.abspath(dest)] = (stat.st_size, stat.st_mtime_ns, digest)
+
+    def unchanged_on_disk(self, dest: str, content: bytes, digest: str) -> bool | None:
+        """Whether ``dest`` holds ``content``, decided from the digest recorded when it was written if it is unchanged since, or ``None`` if that is unknown."""
+        try:
+            stat = os.stat(dest)
+        except FileNotFoundError:
+            return False
+        if stat.st_size != len(content):
+            return False
+        with self._lock:
+            cached = self._digests.get(os.path.abspath(dest))
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2] == digest
+        return None
+
+    def clear(self) -> None:
+        """Forget every recorded digest, so that files are read back to compare them."""
+        with self._lock:
+            self._digests.clear()
+
+
+written_digests: digest_record = digest_record()
+
+
 class conquest_writer(file_writer):
     """Class to write a CONQUEST coordinates file given a :class:`conquest_coordinates` instance.
 
+    By default ``dest`` is always rewritten. Workflows that write nearly the same cell many times can instead compare against the file already at ``dest``, with ``delta``:
+
+    - ``"skip"``: leave ``dest`` untouched if it already holds the same text, i.e. nothing changed within ``precision``. A file written by this class in ``"skip"`` or ``"patch"`` mode is compared by the SHA-256 recorded when it was written, see :class:`digest_record`, without reading it, as long as its size and modification time are unchanged.
+    - ``"patch"``: as ``"skip"``, but if only atom lines changed, leave ``dest`` untouched and write the changed atom lines to ``<dest>.patch`` instead, see :func:`apply_conquest_patch`. A patch always describes the change from ``dest`` to the latest cell, and is deleted when ``dest`` is skipped or rewritten.
+
+    :attr:`skipped` and :attr:`patch_path` record what was written. If ``dest`` is left untouched, no file is opened and the instance has no :attr:`file`. Delta modes compare bytes on disk, so they cannot be used with a compressed ``dest``.
+
     :param dest: Path to write the new coordinates file.
     :type dest: ``str``
     :param coords: :class:`conquest_coordinates` instance to write.
@@ -53,45 +317,179 @@ class conquest_writer(file_writer):
     :type encoding: ``str``, optional
     :param precision: Float precision, defaults to 10
     :type precision: ``int``, optional
-    :raises ValueError: If the float precision is not at least 1.
+    :param delta: Whether to compare against the existing file, one of "off", "skip" or "patch", defaults to "off".
+    :type delta: ``Literal["off", "skip", "patch"]``, optional
+    :raises ValueError: If the float precision is not at least 1, ``delta`` is unknown, or ``delta`` is not "off" and ``dest`` ends in ``.gz``, ``.xz`` or ``.zst``.
     """
 
     def __init__(
         self,
-
+        dest: str,
         coords: conquest_coordinates,
         encoding: str = "utf-8",
         precision: int = 10,
+        delta: Literal["off", "skip", "patch"] = "off",
     ) -> None:
-        super().__init__(dest=dest, encoding=encoding)
+        if precision < 1:
+            raise ValueError("Cannot have less than 1 decimal of float precision.")
+        if delta not in ("off", "skip", "patch"):
+            raise ValueError(f"Unknown delta mode {delta}, expected off, skip or patch.")
+        if delta != "off" and is_compressed(dest):
+            raise ValueError(f"Delta mode {delta} cannot compare against compressed file {dest}.")
         self.coords: conquest_coordinates = coords
         self.precision: int = precision
-        if self.precision < 1:
-            raise ValueError("Cannot have less than 1 decimal of float precision.")
-        self.write()
-        self.close_file(file=self.file)
+        self.delta: Literal["off", "skip", "patch"] = delta
+        self.skipped: bool = False
+        self.patch_path: str | None = None
+        super().__init__(dest=dest, encoding=encoding, defer_open=delta != "off")
+        if delta == "off":
+            self.write_and_close()
+            return
+        self._header: str = self.format_header()
+        self._atoms: str = "".join(self.format_atom_blocks())
+        if self.write_delta():
+            return
+        self.file = self.open_file()
+        self.write_and_close()
+        Path(self.dest_path + PATCH_SUFFIX).unlink(missing_ok=True)
+        written_digests.remember(self.dest_path, self._digest)
 
-    @override
-    def write(self) -> None:
-        prec = self.precision
-        self.file.write(
-            f"{self.coords.lattice_vectors[0][0]:.{prec}f} {0.0:.{prec}f} {0.0:.{prec}f}\n"
-        )
-        self.file.write(
-            f"{0.0:.{prec}f} {self.coords.lattice_vectors[1][1]:.{prec}f} {0.0:.{prec}f}\n"
+    def write_delta(self) -> bool:
+        """Compare the formatted cell against the file at ``dest``, and skip it or write a patch according to :attr:`delta`.
+
+        :return: Whether ``dest`` is left as it is, so that the full file need not be written.
+        :rtype: ``bool``
+        """
+        header = self._header.encode(self.encoding)
+        atoms = self._atoms.encode(self.encoding)
+        content = header + atoms
+        self._digest: str = hashlib.sha256(content).hexdigest()
+        patch_path = self.dest_path + PATCH_SUFFIX
+        unchanged = written_digests.unchanged_on_disk(self.dest_path, content, self._digest)
+        previous: bytes | None = None
+        if unchanged is None or (not unchanged and self.delta == "patch"):
+            try:
+                with open(self.dest_path, "rb") as previous_file:
+                    previous = previous_file.read()
+            except FileNotFoundError:
+                pass
+            unchanged = previous == content
+        if unchanged:
+            self.skipped = True
+            Path(patch_path).unlink(missing_ok=True)
+            return True
+        if self.delta != "patch" or previous is None or not previous.startswith(header):
+            return False
+        old_lines = previous[len(header) :].splitlines(keepends=True)
+        new_lines = atoms.splitlines(keepends=True)
+        if len(old_lines) != len(new_lines):
+            return False
+        changed = [row for row, (old, new) in enumerate(zip(old_lines, new_lines)) if old != new]
+        record = (
+            f"{_PATCH_MAGIC} {hashlib.sha256(previous).hexdigest()} {len(header)} {len(changed)}\n"
         )
-        self.file.write(
-            f"{0.0:.{prec}f} {0.0:.{prec}f} {self.coords.lattice_vectors[2][2]:.{prec}f}\n"
+        with atomic_output(patch_path, mode="wb") as patch_file:
+            patch_file.write(record.encode(self.encoding))
+            patch_file.write(b"".join(b"%d " % row + new_lines[row] for row in changed))
+        self.patch_path = patch_path
+        return True
+
+    def format_header(self) -> str:
+        """Format the lattice vectors and number of atoms lines.
+
+        :return: The lines that come before the atoms.
+        :rtype: ``str``
+        """
+        prec = self.precision
+        lattice = self.coords.lattice_vectors
+        return (
+            f"{lattice[0][0]:.{prec}f} {0.0:.{prec}f} {0.0:.{prec}f}\n"
+            f"{0.0:.{prec}f} {lattice[1][1]:.{prec}f} {0.0:.{prec}f}\n"
+            f"{0.0:.{prec}f} {0.0:.{prec}f} {lattice[2][2]:.{prec}f}\n"
+            f"{self.coords.natoms}\n"
         )
-        self.file.write(self.coords.natoms)
-        self.file.write("\n")
-        for atom in self.coords.atoms:
-            move_str: str = f"{atom.can_move[0]} {atom.can_move[1]} {atom.can_move[2]}"
-            atom_str: str = (
-                f"{atom.coords[0]:.{prec}f} {atom.coords[1]:.{prec}f} {atom.coords[2]:.{prec}f}"
+
+    def format_atom_blocks(self) -> Iterator[str]:
+        """Format the atom lines in chunks of :data:`WRITE_CHUNK_ATOMS`.
+
+        Up to a precision of :data:`~conquest2a.formatting.FAST_MAX_PRECISION`, lines are built as whole byte buffers by :mod:`conquest2a.formatting`; the text is the same as formatting each number with ``%``.
+
+        :return: Iterator over blocks of lines, each ending in a newline.
+        :rtype: ``Iterator[str]``
+        """
+        prec = self.precision
+        chunks = self.coords.iter_chunks(chunk_size=WRITE_CHUNK_ATOMS)
+        if prec > FAST_MAX_PRECISION:
+            line_format = f"%.{prec}f %.{prec}f %.{prec}f %d %s %s %s\n"
+            for columns in chunks:
+                move_flags: STR_ARRAY = np.where(columns.can_move, "T", "F")
+                yield format_block(line_format, [columns.frac_coords, columns.species, move_flags])
+            return
+        for columns in chunks:
+            frac_coords = columns.frac_coords
+            can_move = columns.can_move
+            block = join_fields(
+                [
+                    fixed_field(frac_coords[:, 0], prec),
+                    " ",
+                    fixed_field(frac_coords[:, 1], prec),
+                    " ",
+                    fixed_field(frac_coords[:, 2], prec),
+                    " ",
+                    integer_field(columns.species),
+                    " ",
+                    flag_field(can_move[:, 0]),
+                    " ",
+                    flag_field(can_move[:, 1]),
+                    " ",
+                    flag_field(can_move[:, 2]),
+                    "\n",
+                ]
             )
-            self.file.write(f"{atom_str} {atom.species} {move_str}")
-            self.file.write("\n")
+            yield block.decode("ascii")
+
+    @override
+    def write(self) -> None:
+        if self.delta != "off":
+            # Already formatted to compare against the existing file
+            self.file.write(self._header)
+            self.file.write(self._atoms)
+            return
+        self.file.write(self.format_header())
+        for block in self.format_atom_blocks():
+            self.file.write(block)
+
+
+def apply_conquest_patch(patch: str, base: str | None = None, dest: str | None = None) -> None:
+    """Apply a patch record written by :class:`conquest_writer` with ``delta="patch"``, writing the full coordinates file.
+
+    :param patch: Path of the patch record.
+    :type patch: ``str``
+    :param base: The coordinates file the patch was made against, defaults to ``None`` meaning ``patch`` without its ``.patch`` extension.
+    :type base: ``str | None``, optional
+    :param dest: Path to write the patched file, defaults to ``None`` meaning ``base``. The file is written atomically.
+    :type dest: ``str | None``, optional
+    :raises ValueError: If ``patch`` is not a patch record, or ``base`` is not the file it was made against.
+    """
+    if base is None:
+        base = patch.removesuffix(PATCH_SUFFIX)
+    with open(patch, "rb") as patch_file:
+        fields = patch_file.readline().split()
+        records = patch_file.read().splitlines(keepends=True)
+    if len(fields) != 4 or fields[0].decode() != _PATCH_MAGIC:
+        raise ValueError(f"{patch} is not a CONQUEST coordinates patch.")
+    with open(base, "rb") as base_file:
+        previous = base_file.read()
+    if hashlib.sha256(previous).hexdigest() != fields[1].decode() or len(records) != int(fields[3]):
+        raise ValueError(f"{patch} does not apply to {base}.")
+    header_size = int(fields[2])
+    lines = previous[header_size:].splitlines(keepends=True)
+    for record in records:
+        row, line = record.split(b" ", 1)
+        lines[int(row)] = line
+    with atomic_output(dest if dest is not None else base, mode="wb") as patched:
+        patched.write(previous[:header_size])
+        patched.write(b"".join(lines))
 
 
 class vasp_writer(file_writer):
@@ -116,8 +514,7 @@ class vasp_writer(file_writer):
     ) -> None:
         super().__init__(dest=dest, encoding=encoding, is_angstrom=is_angstrom)
         self.data: conquest_coordinates = data
-        self.write()
-        self.close_file(file=self.file)
+        self.write_and_close()
 
     def create_atoms_str(self) -> tuple[str, str]:
         num_ele: dict[str, int] = self.data.number_of_elements()
@@ -125,27 +522,50 @@ class vasp_writer(file_writer):
         num_string: str = " ".join(str(x) for x in num_ele.values())
         return ele_string, num_string
 
+    @staticmethod
+    def format_header(
+        lattice_vectors: REAL_ARRAY, ele_string: str, num_string: str, is_angstrom: bool = False
+    ) -> str:
+        """Format the lines of a POSCAR file that come before the atomic positions.
+
+        :param lattice_vectors: Lattice vectors of the cell, in Bohr unless ``is_angstrom``.
+        :type lattice_vectors: :ref:`REAL ARRAY <types>`
+        :param ele_string: Space-separated element labels.
+        :type ele_string: ``str``
+        :param num_string: Space-separated number of atoms of each element.
+        :type num_string: ``str``
+        :param is_angstrom: Whether ``lattice_vectors`` is already in angstroms, defaults to ``False``.
+        :type is_angstrom: ``bool``, optional
+        :return: The header, ending in a newline.
+        :rtype: ``str``
+        """
+        scale = 1.0 if is_angstrom else BOHR_TO_ANGSTROM
+        lines = [ele_string, "1.0"]
+        for lattice_vect in lattice_vectors:
+            lines.append(rf'  {" ".join(str(x * scale) for x in lattice_vect)}')
+        lines += [ele_string, num_string, "Direct"]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def format_atoms(frac_coords: REAL_ARRAY) -> str:
+        """Format atomic positions as POSCAR ``Direct`` lines.
+
+        :param frac_coords: Fractional coordinates, of shape ``(N, 3)``.
+        :type frac_coords: :ref:`REAL ARRAY <types>`
+        :return: One line per atom, each ending in a newline.
+        :rtype: ``str``
+        """
+        return format_block(" %r %r %r\n", [frac_coords])
+
     @override
     def write(self) -> None:
         ele_string, num_string = self.create_atoms_str()
         with self.file as file:
-            file.write(f"{ele_string}\n")
-            file.write("1.0\n")
-            if self.is_ang:
-                for lattice_vect in self.data.lattice_vectors:
-                    file.write(rf'  {" ".join(str(x) for x in lattice_vect)}')
-                    file.write("\n")
-            else:
-                for lattice_vect in self.data.lattice_vectors:
-                    file.write(rf'  {" ".join(str(x * BOHR_TO_ANGSTROM) for x in lattice_vect)}')
-                    file.write("\n")
-            file.write(f"{ele_string}\n")
-            file.write(f"{num_string}\n")
-            file.write("Direct\n")
-            for atoms in self.data.element_map:
-                for atom in self.data.element_map[atoms]:
-                    file.write(rf' {" ".join(str(x) for x in atom.coords)}')
-                    file.write("\n")
+            file.write(
+                self.format_header(self.data.lattice_vectors, ele_string, num_string, self.is_ang)
+            )
+            for _indices, columns in self.data.iter_element_chunks(WRITE_CHUNK_ATOMS):
+                file.write(self.format_atoms(columns.frac_coords))
 
 
 class xyz_writer(file_writer):
@@ -159,6 +579,8 @@ class xyz_writer(file_writer):
     :type encoding: ``str``, optional
     :param comment_line: What string to write as the comment line
     :type comment_line: ``str``, optional
+    :param angstrom_coords: Cartesian coordinates of ``data`` already converted to angstroms, so that writers of the same cell can share one conversion, defaults to ``None`` meaning converted here.
+    :type angstrom_coords: :ref:`REAL ARRAY <types>` ``| None``, optional
     """
 
     def __init__(
@@ -167,12 +589,13 @@ class xyz_writer(file_writer):
         data: conquest_coordinates,
         encoding: str = "utf-8",
         comment_line: str = "comment line",
+        angstrom_coords: REAL_ARRAY | None = None,
     ) -> None:
         super().__init__(dest=dest, encoding=encoding)
         self.data: conquest_coordinates = data
         self.comment_line: str = comment_line
-        self.write()
-        self.close_file(file=self.file)
+        self.angstrom_coords: REAL_ARRAY | None = angstrom_coords
+        self.write_and_close()
 
     def create_comment_line(self) -> str:
         return self.comment_line
@@ -198,18 +621,36 @@ class xyz_writer(file_writer):
         with self.file as file:
             file.write(f"{self.data.natoms}")
             file.write(f"{self.create_comment_line()}\n")
-            for atoms in self.data.element_map:
-                for atom in self.data.element_map[atoms]:
+            for indices, columns in self.data.iter_element_chunks(WRITE_CHUNK_ATOMS):
+                if self.angstrom_coords is not None:
                     file.write(
-                        rf'{atoms} {" ".join(str(x * BOHR_TO_ANGSTROM) for x in atom.cart_coords)}'
+                        self.format_atoms(columns.labels, self.angstrom_coords[indices], True)
                     )
-                    file.write("\n")
+                else:
+                    file.write(self.format_atoms(columns.labels, columns.cart_coords))
+
+    @staticmethod
+    def format_atoms(labels: STR_ARRAY, cart_coords: REAL_ARRAY, is_angstrom: bool = False) -> str:
+        """Format atoms as XYZ lines, converting positions from Bohr to angstroms.
+
+        :param labels: Element label of each atom.
+        :type labels: :ref:`STR ARRAY <types>`
+        :param cart_coords: Cartesian coordinates in Bohr unless ``is_angstrom``, of shape ``(N, 3)``.
+        :type cart_coords: :ref:`REAL ARRAY <types>`
+        :param is_angstrom: Whether ``cart_coords`` is already in angstroms, defaults to ``False``.
+        :type is_angstrom: ``bool``, optional
+        :return: One line per atom, each ending in a newline.
+        :rtype: ``str``
+        """
+        if not is_angstrom:
+            cart_coords = cart_coords * BOHR_TO_ANGSTROM
+        return format_block("%s %r %r %r\n", [labels, cart_coords])
 
 
 class extxyz_writer(xyz_writer):
     """Class to write a ``.extxyz`` for a basic XYZ file given a :class:`~conquest.conquest_coordinates` instance.
 
-    The main advantage of `.extxyz` is the ability to specify columns and the time, which is very useful for animations. I recommend just using CONQUEST's ability to output ``.extxyz`` files at different timesteps.
+    The main advantage of `.extxyz` is the ability to specify columns and the time, which is very useful for animations. I recommend just using CONQUEST's ability to output ``.extxyz`` files at different timesteps. To assemble a trajectory from many :class:`~conquest.conquest_coordinates`, use :class:`trajectory_writer`.
 
     :param dest: Path to write the new coordinates file.
     :type dest: ``str``
@@ -219,6 +660,8 @@ class extxyz_writer(xyz_writer):
     :type encoding: ``str``, optional
     :param time: The instance of time of the cell, defaults to `0.0`.
     :type time: ``float``, optional
+    :param angstrom_coords: Cartesian coordinates already converted to angstroms, see :class:`xyz_writer`, defaults to ``None``.
+    :type angstrom_coords: :ref:`REAL ARRAY <types>` ``| None``, optional
     """
 
     def __init__(
@@ -227,10 +670,11 @@ class extxyz_writer(xyz_writer):
         data: conquest_coordinates,
         encoding: str = "utf-8",
         time: float = 0.0,
+        angstrom_coords: REAL_ARRAY | None = None,
     ) -> None:
 
         self.time: float = time
-        super().__init__(dest=dest, data=data, encoding=encoding)
+        super().__init__(dest=dest, data=data, encoding=encoding, angstrom_coords=angstrom_coords)
 
     @override
     def create_comment_line(self) -> str:
@@ -239,17 +683,115 @@ class extxyz_writer(xyz_writer):
         :return: The file's comment line.
         :rtype: ``str``
         """
+        return self.format_comment_line(self.data.lattice_vectors, self.time)
+
+    @staticmethod
+    def format_comment_line(lattice_vectors: REAL_ARRAY, time: float = 0.0) -> str:
+        """Format the ``.extxyz`` comment line for a cell.
+
+        :param lattice_vectors: Lattice vectors of the cell.
+        :type lattice_vectors: :ref:`REAL ARRAY <types>`
+        :param time: The instance of time of the cell, defaults to `0.0`.
+        :type time: ``float``, optional
+        :return: The comment line, without a newline.
+        :rtype: ``str``
+        """
         lattice: list[float] = []
-        for single_vector in self.data.lattice_vectors:
+        for single_vector in lattice_vectors:
             lattice.append(single_vector[0])
             lattice.append(single_vector[1])
             lattice.append(single_vector[2])
         property_str = "Properties=species:S:1:pos:R:3"
-        time_str: str = f"Time={str(self.time)}"
+        time_str: str = f"Time={str(time)}"
         lat: str = " ".join(str(x) for x in lattice)
         return f'Lattice="{lat}" {property_str} {time_str}'
 
 
+class trajectory_writer(file_writer):
+    """Class to write a multi-frame ``.extxyz`` trajectory, one :class:`~conquest.conquest_coordinates` instance per frame.
+
+    The file stays open between frames. Each frame is written as by :class:`extxyz_writer`, with its own ``Time=`` field, and the byte offset of its start is appended to a sidecar index, ``<dest>.idx``. A frame can then be read without scanning the file, see :func:`~conquest2a.read.trajectory.read_frame_text`.
+
+    Use as a context manager, or call :func:`close` when done.
+
+    .. code-block:: python
+
+      with trajectory_writer("md.extxyz") as trajectory:
+          for step, coords in enumerate(snapshots):
+              trajectory.write_frame(coords, time=step * 0.5)
+
+    :param dest: Path to write the trajectory.
+    :type dest: ``str``
+    :param encoding: File encoding, defaults to "utf-8".
+    :type encoding: ``str``, optional
+    :param append: Whether to add frames to the end of an existing trajectory rather than overwrite it, defaults to ``False``. A missing or out-of-date index is rebuilt first.
+    :type append: ``bool``, optional
+    :raises ValueError: If ``dest`` has a compressed extension, since compressed files cannot be seeked into.
+    """
+
+    def __init__(self, dest: str, encoding: str = "utf-8", append: bool = False) -> None:
+        if is_compressed(dest):
+            raise ValueError("Trajectories cannot be compressed, as frames are read by seeking.")
+        nframes = 0
+        if append and os.path.exists(dest.strip()):
+            nframes = len(load_frame_offsets(dest.strip()))
+        else:
+            append = False
+        super().__init__(dest=dest, mode="ab" if append else "wb", encoding=encoding)
+        self.index_file: IO[bytes] = open(index_path(self.dest_path), "ab" if append else "wb")
+        self.nframes: int = nframes
+
+    @override
+    def open_file(self) -> IO[Any]:
+        # Offsets must be byte offsets into the file, so it is opened in binary mode, uncompressed
+        file: IO[Any] = open(self.dest_path, mode=self.mode, buffering=WRITE_BUFFER_BYTES)
+        return file
+
+    def write_frame(self, data: conquest_coordinates, time: float = 0.0) -> int:
+        """Append a frame.
+
+        :param data: :class:`~conquest.conquest_coordinates` instance to write.
+        :type data: ``conquest_coordinates``
+        :param time: The instance of time of the frame, defaults to `0.0`.
+        :type time: ``float``, optional
+        :return: Index of the frame in the trajectory.
+        :rtype: ``int``
+        """
+        offset: int = self.file.tell()
+        header = f"{data.natoms.strip()}\n"
+        header += f"{extxyz_writer.format_comment_line(data.lattice_vectors, time)}\n"
+        self.file.write(header.encode(self.encoding))
+        for _indices, columns in data.iter_element_chunks(WRITE_CHUNK_ATOMS):
+            atoms = xyz_writer.format_atoms(columns.labels, columns.cart_coords)
+            self.file.write(atoms.encode(self.encoding))
+        self.index_file.write(np.array([offset], dtype=INDEX_DTYPE).tobytes())
+        self.nframes += 1
+        return self.nframes - 1
+
+    def flush(self) -> None:
+        """Flush the trajectory, then its index, to disk."""
+        self.file.flush()
+        self.index_file.flush()
+
+    def close(self) -> None:
+        """Flush and close the trajectory and its index."""
+        if not self.file.closed:
+            self.flush()
+            self.close_file(file=self.file)
+            self.index_file.close()
+
+    def __enter__(self) -> "trajectory_writer":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
 class xsf_writer(file_writer):
     """Class to write `.xsf` files given a :class:`~conquest.conquest_coordinates` instance.
 
@@ -265,6 +807,8 @@ class xsf_writer(file_writer):
     :type encoding: ``str``, optional
     :param write_extra: Whether to extract the force vector or spin vector of atoms, defaults to "spin".
     :type write_extra: Literal["spin", "force"], optional
+    :param angstrom_coords: Cartesian coordinates already converted to angstroms, see :class:`xyz_writer`, defaults to ``None``.
+    :type angstrom_coords: :ref:`REAL ARRAY <types>` ``| None``, optional
     """
 
     def __init__(
@@ -273,36 +817,110 @@ class xsf_writer(file_writer):
         data: conquest_coordinates,
         write_extra: Literal["spin", "force"] = "spin",
         encoding: str = "utf-8",
+        angstrom_coords: REAL_ARRAY | None = None,
     ) -> None:
         super().__init__(dest=dest, encoding=encoding)
         self.data: conquest_coordinates = data
         self.write_extra: Literal["spin", "force"] = write_extra
-        self.write()
-        self.close_file(file=self.file)
+        self.angstrom_coords: REAL_ARRAY | None = angstrom_coords
+        self.write_and_close()
 
-    def _format_extra(self, atom: Atom) -> str:
+    def _extra_column(self, columns: atom_columns) -> REAL_ARRAY | None:
         if self.write_extra == "spin":
-            return " ".join(str(x) for x in atom.spins)
+            return columns.spins
         elif self.write_extra == "force":
-            return " ".join(str(x) for x in atom.forces)
-        return ""
+            return columns.forces
+        return None
 
     @override
     def write(self) -> None:
         with self.file as file:
-            file.write("CRYSTAL\n")
-            file.write("PRIMVEC\n")
-            for lattice_vect in self.data.lattice_vectors:
-                file.write(rf' {" ".join(str(x * BOHR_TO_ANGSTROM) for x in lattice_vect)}')
-                file.write("\n")
-            file.write("PRIMCOORD\n")
-            natom_line: str = f'{" ".join(self.data.natoms.split())} 1\n'
-            file.write(natom_line)
-            for element, atoms in self.data.element_map.items():
-                for atom in atoms:
-                    pos_string: str = " ".join(str(x * BOHR_TO_ANGSTROM) for x in atom.cart_coords)
-                    extra: str = self._format_extra(atom)
-                    file.write(f" {element} {pos_string} {extra}\n")
+            file.write(self.format_header(self.data.lattice_vectors, self.data.natoms))
+            for indices, columns in self.data.iter_element_chunks(WRITE_CHUNK_ATOMS):
+                is_angstrom = self.angstrom_coords is not None
+                file.write(
+                    self.format_atoms(
+                        columns.labels,
+                        self.angstrom_coords[indices] if is_angstrom else columns.cart_coords,
+                        self._extra_column(columns),
+                        is_angstrom,
+                    )
+                )
+
+    @staticmethod
+    def format_header(lattice_vectors: REAL_ARRAY, natoms: str) -> str:
+        """Format the ``CRYSTAL``, ``PRIMVEC`` and ``PRIMCOORD`` header lines of an XSF file.
+
+        :param lattice_vectors: Lattice vectors of the cell, in Bohr.
+        :type lattice_vectors: :ref:`REAL ARRAY <types>`
+        :param natoms: Number of atoms, as read from the coordinates file.
+        :type natoms: ``str``
+        :return: The header, ending in a newline.
+        :rtype: ``str``
+        """
+        lines = ["CRYSTAL", "PRIMVEC"]
+        for lattice_vect in lattice_vectors:
+            lines.append(rf' {" ".join(str(x * BOHR_TO_ANGSTROM) for x in lattice_vect)}')
+        lines += ["PRIMCOORD", f'{" ".join(natoms.split())} 1']
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def format_atoms(
+        labels: STR_ARRAY,
+        cart_coords: REAL_ARRAY,
+        extra_column: REAL_ARRAY | None = None,
+        is_angstrom: bool = False,
+    ) -> str:
+        """Format atoms as XSF ``PRIMCOORD`` lines, converting positions from Bohr to angstroms.
+
+        :param labels: Element label of each atom.
+        :type labels: :ref:`STR ARRAY <types>`
+        :param cart_coords: Cartesian coordinates in Bohr unless ``is_angstrom``, of shape ``(N, 3)``.
+        :type cart_coords: :ref:`REAL ARRAY <types>`
+        :param extra_column: Vector written after each position, e.g. forces or spins, defaults to ``None``.
+        :type extra_column: :ref:`REAL ARRAY <types>` ``| None``, optional
+        :param is_angstrom: Whether ``cart_coords`` is already in angstroms, defaults to ``False``.
+        :type is_angstrom: ``bool``, optional
+        :return: One line per atom, each ending in a newline.
+        :rtype: ``str``
+        """
+        if not is_angstrom:
+            cart_coords = cart_coords * BOHR_TO_ANGSTROM
+        if extra_column is None:
+            return format_block(" %s %r %r %r \n", [labels, cart_coords])
+        return format_block(" %s %r %r %r %r %r %r\n", [labels, cart_coords, extra_column])
+
+
+class npz_writer(file_writer):
+    """Class to write a NumPy ``.npz`` archive given a :class:`~conquest.conquest_coordinates` instance.
+
+    The archive holds the lattice vectors, the number of atoms and every column of :class:`~conquest.atom_columns` as binary arrays, so it loads much faster than any text format. Read it back with :func:`~conquest2a.read.binary.read_npz`.
+
+    :param dest: Path to write the archive.
+    :type dest: ``str``
+    :param data: :class:`~conquest.conquest_coordinates` instance to write.
+    :type data: ``conquest_coordinates``
+    :param compressed: Whether to compress the arrays with zlib, defaults to ``False``.
+    :type compressed: ``bool``, optional
+    """
+
+    def __init__(self, dest: str, data: conquest_coordinates, compressed: bool = False) -> None:
+        super().__init__(dest=dest, mode="wb")
+        self.data: conquest_coordinates = data
+        self.compressed: bool = compressed
+        self.write_and_close()
+
+    @override
+    def write(self) -> None:
+        arrays: dict[str, GENERIC_ARRAY] = {
+            name: getattr(self.data.columns, name) for name in atom_columns.NAMES
+        }
+        arrays["lattice_vectors"] = self.data.lattice_vectors
+        arrays["natoms"] = np.array(self.data.natoms)
+        if self.compressed:
+            np.savez_compressed(self.file, **arrays)
+        else:
+            np.savez(self.file, **arrays)
 
 
 class xsf_writer_spins(file_writer):
@@ -310,6 +928,8 @@ class xsf_writer_spins(file_writer):
     XSF writer class that includes spin information from the AtomCharge.dat file,
     by editing an existing XSF file generated by PostProcessCQ.
 
+    The original file is streamed rather than read into memory, so XSF files with large ``DATAGRID`` blocks can be processed, see :func:`process_xsf_file`.
+
     :param dest: Path to write the new coordinates file.
     :type dest: ``str``
     :param data: :class:`~conquest.conquest_coordinates` instance to write.
@@ -333,32 +953,157 @@ class xsf_writer_spins(file_writer):
                 "Destination path for modified XSF file "
                 + "cannot be the same as the original XSF file path"
             )
-        super().__init__(dest=dest, encoding=self.encoding)
+        # Lines outside the atoms are copied as bytes, so the file is written in binary mode
+        super().__init__(dest=dest, mode="wb", encoding=self.encoding)
+        self.write_and_close()
+
+    @override
+    def write(self) -> None:
         self.process_xsf_file()
 
     def process_xsf_file(self) -> None:
         """
         Process an existing XSF file to include spin information.
+
+        Lines up to and including the first ``PRIMCOORD`` line and its atom count are copied unchanged. The atom lines that follow are read in chunks of :data:`WRITE_CHUNK_ATOMS`, and the spin of each atom is appended to its line; blank lines among them are copied as they are. The rest of the file, e.g. ``DATAGRID`` blocks, is copied in bulk without being decoded.
+
+        :raises ValueError: If the file has no ``PRIMCOORD`` section, or it is truncated, or its number of atoms differs from the number of spins.
         """
-        header_data: list[str] = []
-        lines: list[str] = []
-        with open(self.original_xsf_file, mode="r", encoding=self.encoding) as original_xsf:
-            header_data = [next(original_xsf) for _ in range(7)]
-            lines = original_xsf.readlines()
-        original_xsf.close()
-        with open(self.dest_path, "w", encoding=self.encoding) as modified_xsf:
-            atom_index = 0
-            for header_line in header_data:
-                modified_xsf.write(header_line)
-            for line in lines:
-                if line.strip() and atom_index < len(self.charges.coordinates.atoms):
-                    atom: Atom = self.charges.coordinates.atoms[atom_index]
-                    spin_info: str = (
-                        f"{atom.spins[0]:.10f} {atom.spins[1]:.10f} {atom.spins[2]:.10f}"
-                    )
-                    modified_line: str = f"{line.strip()} {spin_info}\n"
-                    modified_xsf.write(modified_line)
-                    atom_index += 1
-                else:
-                    modified_xsf.write(line)
-        modified_xsf.close()
+        spins = self.charges.coordinates.columns.spins
+        with open(self.original_xsf_file, "rb") as original_xsf, self.file as modified_xsf:
+            for line in original_xsf:
+                modified_xsf.write(line)
+                if line.split()[:1] == [b"PRIMCOORD"]:
+                    break
+            else:
+                raise ValueError(f"No PRIMCOORD section in {self.original_xsf_file}.")
+            count_line = original_xsf.readline()
+            modified_xsf.write(count_line)
+            try:
+                natoms = int(count_line.split()[0])
+            except (IndexError, ValueError):
+                raise ValueError(
+                    f"Invalid PRIMCOORD atom count in {self.original_xsf_file}."
+                ) from None
+            if natoms != len(spins):
+                raise ValueError(
+                    f"{self.original_xsf_file} has {natoms} atoms, but there are {len(spins)} spins."
+                )
+            for rows in chunk_slices(natoms):
+                lines, atom_rows = self._read_atom_lines(original_xsf, len(spins[rows]))
+                atom_lines = [lines[row].decode(self.encoding).strip() for row in atom_rows]
+                block = format_block(
+                    "%s %.10f %.10f %.10f\n", [np.array(atom_lines, dtype=object), spins[rows]]
+                ).encode(self.encoding)
+                if len(atom_rows) < len(lines):
+                    # Put the atom lines back among the blank ones
+                    for row, atom_line in zip(atom_rows, block.splitlines(keepends=True)):
+                        lines[row] = atom_line
+                    block = b"".join(lines)
+                modified_xsf.write(block)
+            copy_remaining(original_xsf, modified_xsf)
+
+    def _read_atom_lines(self, file: IO[bytes], count: int) -> tuple[list[bytes], list[int]]:
+        """Read up to the ``count``-th non-blank line; return the lines and the non-blank indices."""
+        lines: list[bytes] = []
+        atom_rows: list[int] = []
+        while len(atom_rows) < count:
+            chunk = list(islice(file, count - len(atom_rows)))
+            if not chunk:
+                raise ValueError(f"PRIMCOORD section of {self.original_xsf_file} is truncated.")
+            atom_rows.extend(len(lines) + i for i, line in enumerate(chunk) if line.strip())
+            lines.extend(chunk)
+        return lines, atom_rows
+
+
+def copy_remaining(src: IO[bytes], dst: IO[bytes]) -> None:
+    """Copy the rest of ``src``, from its current position, to the end of ``dst``.
+
+    If ``dst`` is an uncompressed file, the kernel copies the data directly between the files with :func:`os.sendfile` where available. Otherwise it is copied in blocks of :data:`WRITE_BUFFER_BYTES`.
+
+    :param src: File to copy from, opened for reading in binary mode.
+    :type src: ``IO[bytes]``
+    :param dst: File to copy to, opened for writing in binary mode.
+    :type dst: ``IO[bytes]``
+    """
+    if (
+        hasattr(os, "sendfile")
+        and isinstance(src, BufferedReader)
+        and isinstance(dst, BufferedWriter)
+    ):
+        dst.flush()
+        offset = src.tell()
+        try:
+            while sent := os.sendfile(dst.fileno(), src.fileno(), offset, WRITE_BUFFER_BYTES):
+                offset += sent
+            return
+        except OSError:
+            # Not supported between these files: carry on from wherever sendfile stopped
+            src.seek(offset)
+    shutil.copyfileobj(src, dst, WRITE_BUFFER_BYTES)
+
+
+# Formats written by export_formats
+EXPORT_FORMATS: tuple[str, ...] = ("vasp", "xyz", "extxyz", "xsf", "conquest")
+
+
+def export_formats(
+    data: conquest_coordinates,
+    outputs: Mapping[str, Literal["vasp", "xyz", "extxyz", "xsf", "conquest"]],
+    workers: int | None = None,
+    encoding: str = "utf-8",
+    time: float = 0.0,
+) -> None:
+    """Write one cell to several files at once, each with the default options of its writer.
+
+    The grouping of atoms by element and the conversion of Cartesian coordinates to angstroms are done once and shared by every writer. Files are written concurrently by a pool of threads, which mostly overlaps compression and disk writes. Every file is written atomically, so a failed file is not left half-written.
+
+    .. code-block:: python
+
+      export_formats(coords, {"POSCAR": "vasp", "cell.xyz.gz": "xyz", "cell.xsf": "xsf"})
+
+    :param data: :class:`~conquest.conquest_coordinates` instance to write.
+    :type data: ``conquest_coordinates``
+    :param outputs: Map of path to write to the name of its format, one of :data:`EXPORT_FORMATS`.
+    :type outputs: ``Mapping[str, Literal["vasp", "xyz", "extxyz", "xsf", "conquest"]]``
+    :param workers: Number of threads, defaults to ``None`` meaning one per file.
+    :type workers: ``int | None``, optional
+    :param encoding: File encoding, defaults to "utf-8".
+    :type encoding: ``str``, optional
+    :param time: The instance of time of the cell written to ``.extxyz`` files, defaults to `0.0`.
+    :type time: ``float``, optional
+    :raises ValueError: If a format is unknown or ``workers`` is not positive. Nothing is written.
+    :raises Exception: The first error raised by a writer, once every other file has been written.
+    """
+    unknown = sorted({file_format for file_format in outputs.values()} - set(EXPORT_FORMATS))
+    if unknown:
+        raise ValueError(f"Unknown formats {unknown}, expected some of {list(EXPORT_FORMATS)}.")
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of workers must be positive.")
+    if not outputs:
+        return
+    # Compute the shared work before starting threads, so it is done once rather than per writer.
+    # Cells that are not held in memory are read chunk by chunk by each writer instead
+    _ = data.number_of_elements()
+    angstrom_coords: REAL_ARRAY | None = None
+    if data.IN_MEMORY:
+        angstrom_coords = data.columns.cart_coords * BOHR_TO_ANGSTROM
+
+    def write_one(dest: str, file_format: str) -> None:
+        if file_format == "vasp":
+            vasp_writer(dest, data, encoding=encoding)
+        elif file_format == "xyz":
+            xyz_writer(dest, data, encoding=encoding, angstrom_coords=angstrom_coords)
+        elif file_format == "extxyz":
+            extxyz_writer(dest, data, encoding=encoding, time=time, angstrom_coords=angstrom_coords)
+        elif file_format == "xsf":
+            xsf_writer(dest, data, encoding=encoding, angstrom_coords=angstrom_coords)
+        else:
+            conquest_writer(dest, data, encoding=encoding)
+
+    with ThreadPoolExecutor(max_workers=workers or len(outputs)) as executor:
+        futures = [
+            executor.submit(write_one, dest, file_format) for dest, file_format in outputs.items()
+        ]
+    for future in futures:
+        future.result()
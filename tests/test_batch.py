@@ -0,0 +1,67 @@
+from pathlib import Path
+from conquest2a.batch import *
+from conquest2a.conquest import *
+from conquest2a.writers import *
+import pytest
+
+species_dict = {1: "Bi", 2: "Mn", 3: "O"}
+
+
+def test_batch_convert(tmp_path: Path) -> None:
+    paths = ["tests/data/test.dat", str(tmp_path / "missing.dat")]
+    results = batch_convert(
+        paths, species_dict, ["vasp", "xyz"], output_dir=str(tmp_path / "out"), workers=2
+    )
+    assert [result.path for result in results] == paths
+    assert results[0].ok and not results[1].ok
+    assert "FileNotFoundError" in str(results[1].error)
+    assert results[0].outputs == [
+        str(tmp_path / "out" / "test.vasp"),
+        str(tmp_path / "out" / "test.xyz"),
+    ]
+    coords = conquest_coordinates_processor("tests/data/test.dat", conquest_species(species_dict))
+    vasp_writer(str(tmp_path / "direct.vasp"), coords.coords)
+    assert (tmp_path / "out" / "test.vasp").read_text() == (tmp_path / "direct.vasp").read_text()
+
+
+def test_batch_convert_bad_arguments() -> None:
+    with pytest.raises(ValueError):
+        batch_convert(["tests/data/test.dat"], species_dict, ["pdf"])
+    with pytest.raises(ValueError):
+        batch_convert(["tests/data/test.dat"], {1: "Xx"}, ["vasp"])
+
+
+def test_expand_inputs(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# snapshots\ntests/data/test.dat\n\nother.dat\n")
+    assert expand_inputs(["tests/data/test.d?t"], str(manifest)) == [
+        "tests/data/test.dat",
+        "other.dat",
+    ]
+
+
+def test_main(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    argv = ["tests/data/test.dat", "--species", "1=Bi", "2=Mn", "3=O", "--output-dir"]
+    assert main([*argv, str(tmp_path), "--format", "xsf", "--workers", "1"]) == 0
+    assert (tmp_path / "test.xsf").exists()
+    assert main([*argv, str(tmp_path), "missing.dat", "--workers", "1"]) == 1
+    assert "1/2 files converted" in capsys.readouterr().out
+
+
+def test_batch_convert_clashing_outputs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    paths = []
+    for run in ["run1", "run2"]:
+        (tmp_path / run).mkdir()
+        paths.append(str(tmp_path / run / "coord.dat"))
+        (tmp_path / run / "coord.dat").write_text(Path("tests/data/test.dat").read_text())
+    out = tmp_path / "out"
+    with pytest.raises(ValueError):
+        batch_convert(paths, species_dict, ["vasp"], output_dir=str(out), workers=2)
+    assert not out.exists()
+    with pytest.raises(SystemExit):
+        main([*paths, "--species", "1=Bi", "2=Mn", "3=O", "--output-dir", str(out)])
+    assert "coord.vasp" in capsys.readouterr().err
+    # Next to each input, the names do not clash
+    results = batch_convert(paths, species_dict, ["vasp"], workers=1)
+    assert all(result.ok for result in results)
+    assert (tmp_path / "run1" / "coord.vasp").exists() and (tmp_path / "run2" / "coord.vasp").exists()
@@ -0,0 +1,44 @@
+import os
+import shutil
+from conquest2a.conquest import *
+from conquest2a.cache import coordinates_cache
+import numpy as np
+
+test_input = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+
+
+def test_cache_round_trip(tmp_path) -> None:
+    coords_path = tmp_path / "test.dat"
+    shutil.copy("tests/data/test.dat", coords_path)
+    cache = coordinates_cache(tmp_path / "cache")
+    parsed = conquest_coordinates_processor(str(coords_path), test_input, cache=cache)
+    assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+    cached = conquest_coordinates_processor(str(coords_path), test_input, cache=cache)
+    for name in ["frac_coords", "cart_coords", "species", "can_move", "labels", "numbers"]:
+        assert np.array_equal(getattr(parsed.coords.columns, name), getattr(cached.coords.columns, name))
+    assert np.array_equal(parsed.coords.lattice_vectors, cached.coords.lattice_vectors)
+    assert parsed.coords.natoms == cached.coords.natoms
+    assert parsed.coords.number_of_elements() == cached.coords.number_of_elements()
+
+
+def test_cache_invalidation(tmp_path) -> None:
+    coords_path = tmp_path / "test.dat"
+    shutil.copy("tests/data/test.dat", coords_path)
+    cache = coordinates_cache(tmp_path / "cache")
+    conquest_coordinates_processor(str(coords_path), test_input, cache=cache)
+    # Touching the file without changing it keeps the snapshot valid
+    os.utime(coords_path, ns=(0, 0))
+    assert cache.load(coords_path, conquest_coordinates(test_input))
+    # Changing the file invalidates it
+    contents = coords_path.read_text().replace("0.568551360660", "0.568551360661")
+    coords_path.write_text(contents)
+    os.utime(coords_path, ns=(10**9, 10**9))
+    assert not cache.load(coords_path, conquest_coordinates(test_input))
+    reparsed = conquest_coordinates_processor(str(coords_path), test_input, cache=cache)
+    assert reparsed.coords.columns.frac_coords[0][0] == 0.568551360661
+
+
+def test_cache_eviction(tmp_path) -> None:
+    cache = coordinates_cache(tmp_path / "cache", max_bytes=1)
+    conquest_coordinates_processor("tests/data/test.dat", test_input, cache=cache)
+    assert not list((tmp_path / "cache").glob("*.npz"))
@@ -1,5 +1,335 @@
 from conquest2a.conquest import *
+from conquest2a.elements import *
 from conquest2a.supercell import *
 from conquest2a.writers import *
+import numpy as np
+import pytest
 
 # def test_fake_element():
+
+test_input = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+test_coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+
+
+def test_columns_shapes() -> None:
+    columns = test_coords_proc.coords.columns
+    assert len(columns) == 20
+    assert columns.frac_coords.shape == (20, 3)
+    assert columns.cart_coords.shape == (20, 3)
+    assert columns.forces.shape == (20, 3)
+    assert columns.spins.shape == (20, 3)
+    assert columns.can_move.shape == (20, 3)
+    assert columns.can_move.dtype == np.bool_
+    assert columns.species.shape == (20,)
+    assert np.array_equal(columns.numbers, np.arange(1, 21))
+
+
+def test_atom_is_view() -> None:
+    coords = conquest_coordinates(test_input)
+    coords.columns = test_coords_proc.coords.columns.take(np.arange(20))
+    atom = coords.atoms[3]
+    assert atom.number == 4
+    assert atom.species == 1
+    assert atom.label == "Bi"
+    assert atom.can_move == ["T", "T", "T"]
+    atom.spins = np.array([0.0, 0.0, 2.5])
+    atom.coords[0] = 0.25
+    assert coords.columns.spins[3][2] == 2.5
+    assert coords.columns.frac_coords[3][0] == 0.25
+
+
+def test_standalone_atom() -> None:
+    atom = Atom(species=2, coords=np.array([0.1, 0.2, 0.3]), can_move=["T", "F", "T"], number=7)
+    assert atom.can_move == ["T", "F", "T"]
+    assert np.array_equal(atom.forces, np.zeros(3))
+    coords = conquest_coordinates(test_input)
+    coords.atoms = [atom]
+    assert np.array_equal(coords.columns.can_move, np.array([[True, False, True]]))
+    assert coords.atoms[0].number == 7
+
+
+def test_element_map() -> None:
+    counts = test_coords_proc.coords.number_of_elements()
+    assert counts == {"Bi": 4, "Mn": 4, "O": 12}
+    for element, atoms in test_coords_proc.coords.element_map.items():
+        assert all(atom.label == element for atom in atoms)
+
+
+def test_bulk_parse_matches_line_parse() -> None:
+    with open("tests/data/test_output_input_coords.in", "r", encoding="utf-8") as f:
+        lines = f.readlines()[4:]
+    split_lines = [line.split() for line in lines if line.strip()]
+    # Blank and whitespace-only lines are skipped
+    columns = conquest_coordinates_processor.parse_atom_block(
+        lines[:10] + ["\n", "   \n"] + lines[10:]
+    )
+    assert np.array_equal(
+        columns.frac_coords, np.array([line[:3] for line in split_lines]).astype(float)
+    )
+    assert np.array_equal(columns.species, [int(line[3]) for line in split_lines])
+    assert np.array_equal(columns.can_move, [[f == "T" for f in line[4:]] for line in split_lines])
+
+
+def test_bulk_parse_bad_line() -> None:
+    with pytest.raises(ValueError):
+        conquest_coordinates_processor.parse_atom_block(["0.1 0.2 0.3 1 T T\n"])
+
+
+def test_lazy_matches_eager(tmp_path) -> None:
+    species = conquest_species({1: "O", 2: "Bi", 3: "Mn", 4: "Mn", 5: "Mn", 6: "Mn"})
+    path = "tests/data/test_output_input_coords.in"
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    # Blank lines inside the atom block must not become rows
+    blank_path = tmp_path / "blank.in"
+    blank_path.write_text("".join(lines[:4] + ["\n"] + lines[4:10] + ["  \n"] + lines[10:]))
+    eager = conquest_coordinates_processor(path, species).coords
+    lazy = conquest_coordinates_processor(str(blank_path), species, lazy=True).coords
+    assert isinstance(lazy, lazy_conquest_coordinates)
+    assert len(lazy) == 40
+    assert lazy.number_of_elements() == eager.number_of_elements()
+    assert np.array_equal(lazy.get_cartesian_positions(), eager.cart_position_vectors)
+    assert str(lazy.atoms[8]) == str(eager.atoms[8])
+    assert [atom.number for atom in lazy.atoms[3:9:2]] == [4, 6, 8]
+    for element, atoms in eager.element_map.items():
+        assert np.array_equal(lazy.element_map[element].indices, atoms.indices)
+    chunks = list(lazy.iter_chunks(lazy.element_map["O"].indices, chunk_size=7))
+    assert sum(len(chunk) for chunk in chunks) == len(eager.element_map["O"])
+    assert all(np.all(chunk.labels == "O") for chunk in chunks)
+    # Assigned columns replace the species and positions read from the file
+    replaced = eager.columns.take(np.arange(len(eager))[::-1])
+    lazy.columns = replaced
+    assert np.array_equal(lazy.species, replaced.species)
+    assert np.array_equal(lazy.element_indices["O"], eager.group_by_element(replaced.species)["O"])
+    assert lazy.cart_position_vectors is replaced.cart_coords
+    moved = replaced.cart_coords + 1.0
+    lazy.cart_position_vectors = moved
+    assert lazy.cart_position_vectors is moved and lazy.columns.cart_coords is moved
+    lazy.close()
+
+
+def test_element_indices_cached() -> None:
+    coords = conquest_coordinates(test_input)
+    coords.columns = test_coords_proc.coords.columns.take(np.arange(20))
+    first = coords.element_indices
+    assert coords.element_indices is first
+    for element, indices in first.items():
+        assert np.array_equal(indices, np.flatnonzero(coords.columns.labels == element))
+    # Replacing the columns invalidates the grouping
+    coords.columns = test_coords_proc.coords.columns.take(np.arange(5))
+    assert coords.number_of_elements() == {"Bi": 4, "Mn": 1, "O": 0}
+
+
+def test_species_validation() -> None:
+    with pytest.raises(ValueError):
+        conquest_species({1: "Bi", 2: "Xx"})
+    # A rejected map is not memoised as valid
+    with pytest.raises(ValueError):
+        conquest_species({1: "Bi", 2: "Xx"})
+    species = conquest_species({1: "Bi", 2: "Mn", 3: "O", 4: "Mn"})
+    assert sorted(species.unique_elements) == ["Bi", "Mn", "O"]
+    assert species.atomic_numbers() == {1: 83, 2: 25, 3: 8, 4: 25}
+    assert "Bi" in species.allowed_element_labels
+    assert species.dict_contains_only_real_elements()
+
+
+def test_element_lookup() -> None:
+    assert atomic_number("Fe") == 26
+    assert atomic_mass("H") == pytest.approx(1.008)
+    assert element_table()["O"].number == 8
+    with pytest.raises(ValueError):
+        atomic_number("Xx")
+
+
+def test_atom_charge_spins(tmp_path) -> None:
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+    charges = atom_charge(coords_proc.coords, "tests/data/test_original_AtomCharge.dat")
+    assert charges.conquest_charge_data.shape == (20, 3)
+    up_down = np.loadtxt("tests/data/test_original_AtomCharge.dat")
+    spins = coords_proc.coords.columns.spins
+    assert np.array_equal(spins[:, :2], np.zeros((20, 2)))
+    assert np.array_equal(spins[:, 2], up_down[:, 1] - up_down[:, 2])
+    short = tmp_path / "AtomCharge.dat"
+    short.write_text("".join(open("tests/data/test_original_AtomCharge.dat").readlines()[:5]))
+    with pytest.raises(ValueError):
+        atom_charge(coords_proc.coords, str(short))
+
+
+def test_format_block_matches_str() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal((50, 3)) * 10.0 ** rng.integers(-8, 18, (50, 3))
+    labels = np.array(["Bi", "O"])[rng.integers(0, 2, 50)]
+    expected = "".join(
+        f'{label} {" ".join(str(x) for x in row)}\n' for label, row in zip(labels, values)
+    )
+    assert format_block("%s %r %r %r\n", [labels, values]) == expected
+    assert format_block("%r\n", [np.empty(0)]) == ""
+    assert [len(range(100)[rows]) for rows in chunk_slices(100, 40)] == [40, 40, 20]
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".xz", ".zst"])
+def test_compressed_output(tmp_path, suffix: str) -> None:
+    import gzip
+    import lzma
+
+    vasp_writer(str(tmp_path / "plain.vasp"), test_coords_proc.coords)
+    dest = tmp_path / f"test.vasp{suffix}"
+    try:
+        vasp_writer(str(dest), test_coords_proc.coords)
+    except ImportError:
+        pytest.skip("No Zstandard module available")
+    if suffix == ".gz":
+        text = gzip.decompress(dest.read_bytes()).decode()
+    elif suffix == ".xz":
+        text = lzma.decompress(dest.read_bytes()).decode()
+    else:
+        import zstandard
+
+        text = zstandard.ZstdDecompressor().decompressobj().decompress(dest.read_bytes()).decode()
+    assert text == (tmp_path / "plain.vasp").read_text()
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_npz_round_trip(tmp_path, compressed: bool) -> None:
+    from conquest2a.read.binary import read_npz
+
+    npz_writer(str(tmp_path / "test.npz"), test_coords_proc.coords, compressed=compressed)
+    coords = read_npz(str(tmp_path / "test.npz"), test_input)
+    assert np.array_equal(coords.lattice_vectors, test_coords_proc.coords.lattice_vectors)
+    assert coords.natoms == test_coords_proc.coords.natoms
+    for name in atom_columns.NAMES:
+        assert np.array_equal(
+            getattr(coords.columns, name), getattr(test_coords_proc.coords.columns, name)
+        )
+    assert coords.number_of_elements() == test_coords_proc.coords.number_of_elements()
+
+
+def test_failed_write_keeps_dest(tmp_path) -> None:
+    dest = tmp_path / "test.vasp"
+    dest.write_text("previous")
+    with pytest.raises(AttributeError):
+        vasp_writer(str(dest), None)  # type: ignore[arg-type]
+    assert dest.read_text() == "previous"
+    with pytest.raises(RuntimeError):
+        with atomic_output(str(dest)) as file:
+            file.write("partial")
+            raise RuntimeError
+    assert dest.read_text() == "previous"
+    assert [path.name for path in tmp_path.iterdir()] == ["test.vasp"]
+
+
+def test_replace_keeps_mode_and_symlink(tmp_path) -> None:
+    import os
+    import stat
+
+    coords = test_coords_proc.coords
+    target = tmp_path / "target.vasp"
+    target.write_text("previous")
+    target.chmod(0o640)
+    link = tmp_path / "link.vasp"
+    link.symlink_to(target)
+    vasp_writer(str(link), coords)
+    assert link.is_symlink() and target.read_text() != "previous"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+    with atomic_output(str(link)) as file:
+        file.write("text")
+    assert link.is_symlink() and target.read_text() == "text"
+    assert stat.S_IMODE(target.stat().st_mode) == 0o640
+    umask = os.umask(0o022)
+    try:
+        vasp_writer(str(tmp_path / "new.vasp"), coords)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE((tmp_path / "new.vasp").stat().st_mode) == 0o644
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["link.vasp", "new.vasp", "target.vasp"]
+
+
+def test_export_formats(tmp_path) -> None:
+    coords = test_coords_proc.coords
+    vasp_writer(str(tmp_path / "ref.vasp"), coords)
+    xyz_writer(str(tmp_path / "ref.xyz"), coords)
+    extxyz_writer(str(tmp_path / "ref.extxyz"), coords, time=2.0)
+    xsf_writer(str(tmp_path / "ref.xsf"), coords)
+    conquest_writer(str(tmp_path / "ref.dat"), coords)
+    outputs = {
+        str(tmp_path / "out.vasp"): "vasp",
+        str(tmp_path / "out.xyz"): "xyz",
+        str(tmp_path / "out.extxyz"): "extxyz",
+        str(tmp_path / "out.xsf"): "xsf",
+        str(tmp_path / "out.dat"): "conquest",
+    }
+    export_formats(coords, outputs, time=2.0)
+    for suffix in (".vasp", ".xyz", ".extxyz", ".xsf", ".dat"):
+        assert (tmp_path / f"out{suffix}").read_text() == (tmp_path / f"ref{suffix}").read_text()
+    with pytest.raises(ValueError):
+        export_formats(coords, {str(tmp_path / "out.cif"): "cif"})  # type: ignore[dict-item]
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+def test_xsf_writer_spins(tmp_path, suffix: str) -> None:
+    import gzip
+
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+    charges = atom_charge(coords_proc.coords, "tests/data/test_original_AtomCharge.dat")
+    original = open("tests/data/test_orig_xsf.xsf").read().splitlines(keepends=True)
+    grid = "BEGIN_BLOCK_DATAGRID_3D\n density\n 2 2 2\n" + "1.0 2.0\n" * 4 + "END_BLOCK_DATAGRID_3D\n"
+    source = tmp_path / "source.xsf"
+    source.write_text("".join(original) + "\n" + grid)
+    dest = tmp_path / f"spins.xsf{suffix}"
+    xsf_writer_spins(str(dest), charges, str(source))
+    text = gzip.decompress(dest.read_bytes()).decode() if suffix else dest.read_text()
+    spins = coords_proc.coords.columns.spins
+    expected = original[:7] + [
+        f"{line.strip()} {spin[0]:.10f} {spin[1]:.10f} {spin[2]:.10f}\n"
+        for line, spin in zip(original[7:], spins)
+    ]
+    assert text == "".join(expected) + "\n" + grid
+    # Blank lines inside the atom block are kept where they are
+    source.write_text("".join(original[:9] + ["\n", "  \n"] + original[9:]))
+    xsf_writer_spins(str(dest), charges, str(source))
+    text = gzip.decompress(dest.read_bytes()).decode() if suffix else dest.read_text()
+    assert text == "".join(expected[:9] + ["\n", "  \n"] + expected[9:])
+    source.write_text("".join(original[:-1]))
+    with pytest.raises(ValueError):
+        xsf_writer_spins(str(tmp_path / "truncated.xsf"), charges, str(source))
+    assert not (tmp_path / "truncated.xsf").exists()
+
+
+def test_conquest_writer_delta(tmp_path) -> None:
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+    coords = coords_proc.coords
+    dest = tmp_path / "coords.dat"
+    conquest_writer(str(tmp_path / "reference.dat"), coords)
+    assert not conquest_writer(str(dest), coords, delta="skip").skipped
+    assert dest.read_bytes() == (tmp_path / "reference.dat").read_bytes()
+    mtime = dest.stat().st_mtime_ns
+    assert conquest_writer(str(dest), coords, delta="skip").skipped
+    assert conquest_writer(str(tmp_path / "reference.dat"), coords, delta="patch").skipped
+    assert dest.stat().st_mtime_ns == mtime
+    # Changes below the precision are not changes
+    coords.columns.frac_coords[0, 0] += 1e-13
+    assert conquest_writer(str(dest), coords, delta="skip").skipped
+    coords.columns.frac_coords[[2, 7], 1] += 0.01
+    writer = conquest_writer(str(dest), coords, delta="patch")
+    assert not writer.skipped and writer.patch_path == str(dest) + ".patch"
+    assert dest.stat().st_mtime_ns == mtime
+    assert len(open(writer.patch_path).readlines()) == 3
+    apply_conquest_patch(writer.patch_path, dest=str(tmp_path / "patched.dat"))
+    conquest_writer(str(tmp_path / "full.dat"), coords)
+    assert (tmp_path / "patched.dat").read_bytes() == (tmp_path / "full.dat").read_bytes()
+    assert conquest_writer(str(tmp_path / "patched.dat"), coords, delta="patch").skipped
+    with pytest.raises(ValueError):
+        apply_conquest_patch(writer.patch_path, base=str(tmp_path / "full.dat"))
+    # A full rewrite removes the now stale patch
+    assert not conquest_writer(str(dest), coords, delta="skip").skipped
+    assert not (tmp_path / "coords.dat.patch").exists()
+    assert dest.read_bytes() == (tmp_path / "full.dat").read_bytes()
+    skipped = conquest_writer(str(dest), coords, delta="skip")
+    assert skipped.skipped and skipped.dest_path == str(dest) and skipped.tmp_path is None
+    assert skipped.mode == "w" and skipped.encoding == "utf-8" and not hasattr(skipped, "file")
+    # Without a recorded digest the file is read back
+    written_digests.clear()
+    assert conquest_writer(str(dest), coords, delta="skip").skipped
+    with pytest.raises(ValueError):
+        conquest_writer(str(tmp_path / "coords.dat.gz"), coords, delta="skip")
+    assert not (tmp_path / "coords.dat.gz").exists()
@@ -0,0 +1,64 @@
+from pathlib import Path
+from conquest2a.conquest import *
+from conquest2a.formatting import *
+from conquest2a.writers import *
+import numpy as np
+import pytest
+
+test_input = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+
+rng = np.random.default_rng(18)
+# Random coordinates, plus values that are exact ties or sit on either side of one
+test_values = np.concatenate(
+    [
+        rng.random(5000),
+        -rng.random(500),
+        rng.standard_normal(500) * 1e3,
+        rng.standard_normal(500) * 1e-8,
+        (np.arange(2000) + 0.5) / 2 ** rng.integers(1, 20, 2000),
+        np.nextafter(np.arange(1, 200) / 8, 0),
+        np.nextafter(np.arange(1, 200) / 8, 1),
+        [0.0, -0.0, 0.5, 1.5, 2.5, 0.125, 0.05, 0.15, 1 - 1e-16, 5e-324, 1e300, np.inf, np.nan],
+    ]
+)
+
+
+@pytest.mark.parametrize("precision", range(FAST_MAX_PRECISION + 1))
+def test_fixed_field_matches_percent_format(precision: int) -> None:
+    expected = "".join(f"{x:.{precision}f}\n" for x in test_values.tolist())
+    assert join_fields([fixed_field(test_values, precision), "\n"]).decode() == expected
+
+
+def test_integer_and_flag_fields() -> None:
+    values = np.concatenate([rng.integers(-(10**12), 10**12, 1000), [0, -1, 9, 10, 99, 100]])
+    flags = rng.random(len(values)) < 0.5
+    expected = "".join(f"{n} {'T' if f else 'F'}\n" for n, f in zip(values.tolist(), flags))
+    assert join_fields([integer_field(values), " ", flag_field(flags), "\n"]).decode() == expected
+    assert join_fields([fixed_field(np.empty(0), 3), "\n"]) == b""
+    with pytest.raises(ValueError):
+        fixed_field(test_values, FAST_MAX_PRECISION + 1)
+
+
+@pytest.mark.parametrize("precision", [1, 3, 6, 10, 12, 16])
+def test_conquest_writer_round_trip(tmp_path: Path, precision: int) -> None:
+    coords = conquest_coordinates_processor("tests/data/test.dat", test_input).coords
+    coords.columns.frac_coords = rng.random((len(coords.columns), 3))
+    coords.columns.can_move = rng.random((len(coords.columns), 3)) < 0.5
+    dest = tmp_path / "coords.dat"
+    conquest_writer(str(dest), coords, precision=precision)
+    columns = coords.columns
+    expected = "".join(
+        f"{x:.{precision}f} {y:.{precision}f} {z:.{precision}f} {s} "
+        + " ".join("T" if flag else "F" for flag in move)
+        + "\n"
+        for (x, y, z), s, move in zip(
+            columns.frac_coords.tolist(), columns.species.tolist(), columns.can_move
+        )
+    )
+    atom_lines = dest.read_text().splitlines(keepends=True)[-len(columns) :]
+    assert "".join(atom_lines) == expected
+    reread = conquest_coordinates_processor(str(dest), test_input).coords
+    assert np.allclose(reread.lattice_vectors, coords.lattice_vectors, atol=10**-precision)
+    assert np.allclose(reread.columns.frac_coords, columns.frac_coords, atol=10**-precision)
+    assert np.array_equal(reread.columns.species, columns.species)
+    assert np.array_equal(reread.columns.can_move, columns.can_move)
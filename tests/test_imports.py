@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+# Modules that must import without the plotting stack
+NON_PLOTTING_MODULES = [
+    "conquest2a.conquest",
+    "conquest2a.writers",
+    "conquest2a.stream",
+    "conquest2a.cache",
+    "conquest2a.supercell",
+    "conquest2a.read.quantities",
+    "conquest2a.read.vesta",
+]
+
+
+def imported_modules(modules: list[str]) -> set[str]:
+    """Every module imported by ``modules``, from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+
+def test_no_plotting_imports() -> None:
+    names = imported_modules(NON_PLOTTING_MODULES)
+    assert not [name for name in names if name.split(".")[0] in ("matplotlib", "scienceplots")]
+
+
+def test_plot_style_keeps_user_settings() -> None:
+    script = (
+        "import matplotlib as mpl\n"
+        "from conquest2a.constants import apply_plot_style\n"
+        "mpl.rcParams['savefig.dpi'] = 123\n"
+        "apply_plot_style()\n"
+        "print(mpl.rcParams['savefig.dpi'], mpl.rcParams['xtick.direction'], mpl.rcParams['legend.framealpha'])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["123.0", "in", "0.5"]
@@ -0,0 +1,185 @@
+from itertools import product
+from conquest2a.conquest import *
+from conquest2a.algo.nn import *
+from conquest2a.supercell import virtual_supercell
+import numpy as np
+import pytest
+
+test_input = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+
+
+def brute_force(positions: np.ndarray, box: np.ndarray, cutoff: float) -> set[tuple[int, int, tuple[int, ...]]]:
+    bonds = set()
+    for shift in product([-2, -1, 0, 1, 2], repeat=3):
+        vectors = positions[None, :, :] + np.array(shift) * box - positions[:, None, :]
+        for i, j in np.argwhere(np.linalg.norm(vectors, axis=2) <= cutoff):
+            if i != j or any(shift):
+                bonds.add((int(i), int(j), shift))
+    return bonds
+
+
+def random_coords_proc(natoms: int, box: list[float], seed: int) -> conquest_coordinates_processor:
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+    rng = np.random.default_rng(seed)
+    columns = atom_columns(natoms)
+    # Some atoms lie outside the cell
+    columns.frac_coords = rng.random((natoms, 3)) * 1.2 - 0.1
+    columns.species = rng.integers(1, 4, natoms)
+    coords_proc.coords.columns = columns
+    coords_proc.coords.lattice_vectors = np.diag(box)
+    coords_proc.coords.get_cartesian_positions()
+    return coords_proc
+
+
+# Cutoffs giving cell lists with one, several and fewer than three bins along some axis
+@pytest.mark.parametrize("cutoff", [1.0, 2.5, 3.9])
+@pytest.mark.parametrize("method", ["kdtree", "cell_list"])
+def test_neighbour_list_matches_brute_force(cutoff: float, method: str) -> None:
+    coords_proc = random_coords_proc(300, [10.0, 12.0, 8.0], seed=22)
+    nlist = neighbour_list(coords_proc, cutoff, method=method)
+    assert nlist.method == method
+    positions = coords_proc.coords.cart_position_vectors
+    centres = nlist.centres()
+    found = {(int(i), int(j), tuple(s)) for i, j, s in zip(centres, nlist.indices, nlist.shifts.tolist())}
+    assert found == brute_force(positions, nlist.box, cutoff)
+    assert len(found) == len(nlist.indices)
+    assert np.allclose(np.linalg.norm(nlist.bond_vectors(), axis=1), nlist.distances)
+    assert np.all(nlist.distances <= cutoff)
+    assert nlist.coordination_numbers().sum() == len(nlist.indices)
+    indices, distances, shifts = nlist.neighbours(0)
+    assert np.all(np.diff(indices) >= 0)
+    assert len(indices) == len(distances) == len(shifts) == nlist.coordination_numbers()[0]
+
+
+def test_neighbour_list_errors() -> None:
+    coords_proc = random_coords_proc(10, [10.0, 12.0, 8.0], seed=22)
+    with pytest.raises(ValueError):
+        neighbour_list(coords_proc, 4.0)
+    with pytest.raises(ValueError):
+        neighbour_list(coords_proc, 0.0)
+    with pytest.raises(ValueError):
+        neighbour_list(coords_proc, 1.0, method="octree")
+    coords_proc.coords.lattice_vectors = np.array([[10.0, 1.0, 0.0], [0.0, 12.0, 0.0], [0.0, 0.0, 8.0]])
+    with pytest.raises(ValueError):
+        neighbour_list(coords_proc, 1.0)
+
+
+def test_choose_method() -> None:
+    box = np.full(3, 300.0)
+    assert choose_method(CELL_LIST_MIN_ATOMS, box, 3.0) == "cell_list"
+    assert choose_method(CELL_LIST_MIN_ATOMS - 1, box, 3.0) == "kdtree"
+    # Too dense, and too few bins along one axis
+    assert choose_method(CELL_LIST_MIN_ATOMS, box, 12.0) == "kdtree"
+    assert choose_method(CELL_LIST_MIN_ATOMS, np.array([300.0, 300.0, 8.0]), 3.0) == "kdtree"
+    assert neighbour_list(random_coords_proc(100, [10.0, 12.0, 8.0], seed=22), 2.0).method == "kdtree"
+
+
+def test_nearest_neighbours_shared_kdtree() -> None:
+    coords_proc = random_coords_proc(200, [10.0, 12.0, 8.0], seed=24)
+    coords = coords_proc.coords
+    coords.columns.frac_coords %= 1.0
+    coords.get_cartesian_positions()
+    first = nearest_neighbours(coords_proc, coords.atoms[0])
+    second = nearest_neighbours(coords_proc, coords.atoms[1])
+    tree = shared_kdtree(coords)
+    assert first.kdtree is second.kdtree is tree
+    assert tree.data is coords.cart_position_vectors
+    # Recomputing the positions replaces the array, so the tree is rebuilt
+    coords.get_cartesian_positions()
+    rebuilt = first.kdtree
+    assert rebuilt is not tree
+    assert rebuilt.data is coords.cart_position_vectors
+    assert nearest_neighbours(coords_proc).kdtree is rebuilt
+    clear_kdtree_cache(coords)
+    assert shared_kdtree(coords) is not rebuilt
+
+
+def test_nearest_neighbours_batched_query() -> None:
+    coords_proc = random_coords_proc(200, [10.0, 12.0, 8.0], seed=24)
+    coords = coords_proc.coords
+    coords.columns.frac_coords %= 1.0
+    coords.get_cartesian_positions()
+    nn = nearest_neighbours(coords_proc)
+    indices = np.arange(0, 200, 7)
+    distances, neighbours = nn.query(indices, 4)
+    assert distances.shape == neighbours.shape == (len(indices), 4)
+    assert np.array_equal(neighbours[:, 0], indices)
+    atom_distances, atom_neighbours = nn.query([coords.atoms[int(i)] for i in indices], 4)
+    assert np.allclose(atom_distances, distances)
+    assert np.array_equal(atom_neighbours, neighbours)
+    for i, row_distances, row_neighbours in zip(indices, distances, neighbours):
+        single_distances, single_neighbours = nn._knn(coords.atoms[int(i)], 4)
+        assert np.allclose(single_distances, row_distances)
+        assert np.array_equal(single_neighbours, row_neighbours)
+
+
+def test_nearest_neighbours_outside_box() -> None:
+    # Some atoms lie outside the cell, see random_coords_proc
+    coords_proc = random_coords_proc(200, [10.0, 12.0, 8.0], seed=25)
+    coords = coords_proc.coords
+    box = np.array([10.0, 12.0, 8.0])
+    unwrapped = coords.cart_position_vectors.copy()
+    assert np.any((unwrapped < 0.0) | (unwrapped >= box))
+    frac_coords = coords.columns.frac_coords.copy()
+    nn = nearest_neighbours(coords_proc, coords.atoms[0])
+    # The tree holds a wrapped copy, and the coordinates are left as they were
+    data = nn.kdtree.data
+    assert data is not coords.cart_position_vectors
+    assert np.all((data >= 0.0) & (data < box))
+    assert np.allclose((data - unwrapped) / box, np.rint((data - unwrapped) / box))
+    assert np.array_equal(coords.cart_position_vectors, unwrapped)
+    assert np.array_equal(coords.columns.frac_coords, frac_coords)
+    assert nearest_neighbours(coords_proc).kdtree is nn.kdtree
+    vectors = unwrapped[None, :, :] - unwrapped[:, None, :]
+    vectors -= box * np.rint(vectors / box)
+    expected = np.sort(np.linalg.norm(vectors, axis=2), axis=1)[:, :5]
+    distances, _ = nn.query(np.arange(200), 5)
+    assert np.allclose(distances, expected)
+    distances, _ = nn.query(list(coords.atoms), 5)
+    assert np.allclose(distances, expected)
+    single_distances, _ = nn._knn(coords.atoms[0], 5)
+    assert np.allclose(single_distances, expected[0])
+    edge, cells = wrap_positions(np.array([[-1e-17, 10.0, 16.0]]), box)
+    assert np.array_equal(edge, [[0.0, 10.0, 0.0]])
+    assert np.array_equal(cells, [[0.0, 0.0, 2.0]])
+    # One ulp below a multiple of the box, and a negative denormal, whose quotients round to whole numbers
+    below = np.array([[np.nextafter(20.0, 0.0), np.nextafter(-12.0, 0.0), -5e-324]])
+    edge, cells = wrap_positions(below, box)
+    assert np.all((edge >= 0.0) & (edge < box))
+    assert np.allclose(edge + cells * box, below)
+    assert np.array_equal(cells, [[1.0, -1.0, 0.0]])
+
+
+def test_neighbour_list_after_nearest_neighbours() -> None:
+    coords_proc = random_coords_proc(300, [10.0, 12.0, 8.0], seed=22)
+    coords = coords_proc.coords
+    unwrapped = coords.cart_position_vectors.copy()
+    nlist = neighbour_list(coords_proc, 2.5)
+    bonds = nlist.bond_vectors()
+    assert np.allclose(np.linalg.norm(bonds, axis=1), nlist.distances)
+    # Neighbour queries leave the stored positions, and so the list, as they were
+    nearest_neighbours(coords_proc).query(np.arange(10), 3)
+    assert np.array_equal(coords.cart_position_vectors, unwrapped)
+    assert np.array_equal(nlist.positions, unwrapped)
+    assert np.array_equal(nlist.bond_vectors(), bonds)
+    # Edits to the stored positions do not affect an existing list
+    coords.cart_position_vectors[:] = 0.0
+    assert np.array_equal(nlist.bond_vectors(), bonds)
+
+
+@pytest.mark.parametrize("materialise", [False, True])
+@pytest.mark.parametrize("virtual", [False, True])
+def test_shared_kdtree_lazy(materialise: bool, virtual: bool) -> None:
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input, lazy=True)
+    if virtual:
+        coords_proc.coords = virtual_supercell(1, 1, 0, coords_proc)
+    coords = coords_proc.coords
+    if materialise:
+        _ = coords.columns
+    tree = shared_kdtree(coords)
+    assert shared_kdtree(coords) is tree
+    assert tree.data is coords.cart_position_vectors
+    assert nearest_neighbours(coords_proc).kdtree is tree
+    distances, indices = nearest_neighbours(coords_proc).query(np.arange(len(coords)), 2)
+    assert np.array_equal(indices[:, 0], np.arange(len(coords)))
+    assert np.all(distances[:, 1] > 0.0)
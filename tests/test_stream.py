@@ -0,0 +1,53 @@
+from pathlib import Path
+from conquest2a.conquest import *
+from conquest2a.stream import *
+from conquest2a.writers import *
+import numpy as np
+import pytest
+
+test_input = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+test_coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+
+
+def test_chunks_match_eager() -> None:
+    stream = coordinates_stream("tests/data/test.dat", test_input, chunk_size=3)
+    chunks = list(stream.iter_chunks())
+    assert [len(columns) for columns in chunks] == [3, 3, 3, 3, 3, 3, 2]
+    columns = test_coords_proc.coords.columns
+    assert np.array_equal(np.concatenate([c.numbers for c in chunks]), columns.numbers)
+    assert np.array_equal(np.concatenate([c.labels for c in chunks]), columns.labels)
+    assert np.array_equal(np.vstack([c.cart_coords for c in chunks]), columns.cart_coords)
+
+
+def test_stream_vasp_matches_writer(tmp_path: Path) -> None:
+    vasp_writer(str(tmp_path / "eager.vasp"), test_coords_proc.coords)
+    coordinates_stream("tests/data/test.dat", test_input, chunk_size=4).write_vasp(
+        str(tmp_path / "stream.vasp")
+    )
+    assert (tmp_path / "stream.vasp").read_text() == (tmp_path / "eager.vasp").read_text()
+    # The per-element spill files are removed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["eager.vasp", "stream.vasp"]
+
+
+@pytest.mark.parametrize("file_format", ["xyz", "extxyz", "xsf"])
+def test_stream_single_pass_formats(tmp_path: Path, file_format: str) -> None:
+    if file_format == "xyz":
+        xyz_writer(str(tmp_path / "eager"), test_coords_proc.coords)
+    elif file_format == "extxyz":
+        extxyz_writer(str(tmp_path / "eager"), test_coords_proc.coords)
+    else:
+        xsf_writer(str(tmp_path / "eager"), test_coords_proc.coords)
+    coordinates_stream("tests/data/test.dat", test_input, chunk_size=7).convert(
+        str(tmp_path / "stream"), file_format
+    )
+    eager = (tmp_path / "eager").read_text().splitlines()
+    streamed = (tmp_path / "stream").read_text().splitlines()
+    # Streamed atoms are in file order rather than grouped by element
+    header = 5 if file_format == "xsf" else 2
+    assert streamed[:header] == eager[:header]
+    assert sorted(streamed[header:]) == sorted(eager[header:])
+
+
+def test_bad_chunk_size() -> None:
+    with pytest.raises(ValueError):
+        coordinates_stream("tests/data/test.dat", test_input, chunk_size=0)
@@ -1,6 +1,7 @@
 from conquest2a.conquest import *
 from conquest2a.supercell import *
 from conquest2a.writers import *
+import numpy as np
 import pytest
 
 test_input = conquest_species({1: "Bi", 2: "Mn", 3: "Mn", 4: "O"})
@@ -118,3 +119,123 @@ def test_single_repeat_all() -> None:
         < new_cell.supercell_coords.lattice_vectors[2][2]
         < (new_cell.repeats_z + 1) * 5.372100000
     )  # account for floating point error
+
+
+def test_supercell_order() -> None:
+    new_cell = supercell(repeats_x=2, repeats_y=1, repeats_z=3, coords_proc=test_coords_proc)
+    original = test_coords_proc.coords.columns
+    columns = new_cell.supercell_coords.columns
+    expected = [
+        [(x + l) / 3, (y + m) / 2, (z + n) / 4]
+        for x, y, z in original.frac_coords.tolist()
+        for l in range(3)
+        for m in range(2)
+        for n in range(4)
+    ]
+    assert columns.frac_coords.tolist() == expected
+    assert columns.species.tolist() == np.repeat(original.species, 24).tolist()
+    assert columns.numbers.tolist() == list(range(1, 24 * len(original) + 1))
+    assert np.array_equal(
+        columns.cart_coords, columns.frac_coords @ new_cell.supercell_coords.lattice_vectors.T
+    )
+    assert new_cell.supercell_coords.number_of_elements() == {
+        label: 24 * count for label, count in test_coords_proc.coords.number_of_elements().items()
+    }
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("repeats", [(0, 0, 0), (1, 0, 0), (2, 1, 3)])
+def test_virtual_supercell(tmp_path, lazy: bool, repeats: tuple[int, int, int]) -> None:
+    coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input, lazy=lazy)
+    expected = supercell(*repeats, coords_proc=test_coords_proc).supercell_coords
+    virtual = virtual_supercell(*repeats, coords_proc=coords_proc)
+    assert len(virtual) == len(expected.columns)
+    assert virtual.natoms == expected.natoms
+    assert np.array_equal(virtual.lattice_vectors, expected.lattice_vectors)
+    assert virtual.number_of_elements() == expected.number_of_elements()
+    for element, indices in expected.element_indices.items():
+        assert np.array_equal(virtual.element_indices[element], indices)
+    assert np.array_equal(virtual.get_cartesian_positions(), expected.columns.cart_coords)
+    atom = virtual.atoms[len(virtual) - 1]
+    assert atom.coords.tolist() == expected.atoms[len(virtual) - 1].coords.tolist()
+    assert atom.label == expected.atoms[len(virtual) - 1].label
+    for writer in [vasp_writer, xyz_writer, xsf_writer, conquest_writer]:
+        writer(str(tmp_path / "expected"), expected)
+        writer(str(tmp_path / "virtual"), virtual)
+        assert (tmp_path / "virtual").read_bytes() == (tmp_path / "expected").read_bytes()
+    # Nothing is built until the columns are accessed
+    assert virtual._materialised is None
+    for name in atom_columns.NAMES:
+        assert np.array_equal(getattr(virtual.columns, name), getattr(expected.columns, name))
+
+
+
+def test_virtual_supercell_assign_positions() -> None:
+    original = test_coords_proc.coords.cart_position_vectors.copy()
+    virtual = virtual_supercell(1, 0, 0, coords_proc=test_coords_proc)
+    moved = virtual.get_cartesian_positions() + 1.0
+    virtual.cart_position_vectors = moved
+    assert virtual._materialised is not None
+    assert virtual.cart_position_vectors is moved and virtual.columns.cart_coords is moved
+    # The original cell is unchanged
+    assert np.array_equal(test_coords_proc.coords.cart_position_vectors, original)
+
+
+@pytest.mark.parametrize(
+    "matrix",
+    [[[2, 0, 0], [0, 1, 0], [0, 0, 3]], [[1, 1, 0], [-1, 1, 0], [0, 0, 1]], [[2, 1, 0], [0, 3, 1], [1, 0, 1]]],
+)
+def test_hermite_normal_form(matrix: list[list[int]]) -> None:
+    hnf = hermite_normal_form(np.array(matrix))
+    assert np.array_equal(hnf, np.tril(hnf))
+    assert np.all(np.diag(hnf) > 0)
+    assert all(0 <= hnf[i, j] < hnf[i, i] for i in range(3) for j in range(i))
+    unimodular = np.linalg.inv(matrix) @ hnf
+    assert np.allclose(unimodular, np.round(unimodular))
+    assert round(abs(np.linalg.det(unimodular))) == 1
+    points = lattice_points(np.array(matrix))
+    assert len(points) == round(abs(np.linalg.det(matrix)))
+    # No two points are related by a supercell translation
+    frac = points @ np.linalg.inv(matrix).T
+    wrapped = np.round(frac - np.floor(frac + 1e-9), 9)
+    assert len(np.unique(wrapped, axis=0)) == len(points)
+    with pytest.raises(ValueError):
+        hermite_normal_form(np.array([[1, 2, 0], [2, 4, 0], [0, 0, 1]]))
+
+
+def test_transformed_supercell() -> None:
+    diagonal = transformed_supercell(np.diag([2, 1, 3]), test_coords_proc).supercell_coords
+    expected = supercell(1, 0, 2, coords_proc=test_coords_proc).supercell_coords
+    assert np.array_equal(diagonal.lattice_vectors, expected.lattice_vectors)
+    assert np.allclose(diagonal.columns.cart_coords, expected.columns.cart_coords)
+    assert diagonal.natoms == expected.natoms
+    cubic_input = conquest_coordinates_processor("tests/data/test.dat", test_input)
+    cubic_input.coords.lattice_vectors = 5.0 * np.eye(3)
+    cubic_input.coords.columns.forces = np.tile([1.0, 0.0, 0.5], (len(cubic_input.coords.columns), 1))
+    cubic_input.coords.columns.spins[:, 1] = 2.0
+    rotated = transformed_supercell(np.array([[1, 1, 0], [-1, 1, 0], [0, 0, 1]]), cubic_input)
+    coords = rotated.supercell_coords
+    # Forces and spins are rotated with the cell, so the lattice vectors (5, -5, 0) and (5, 5, 0)
+    # now lie along x and y
+    assert np.allclose(coords.columns.forces, [np.sqrt(0.5), np.sqrt(0.5), 0.5])
+    assert np.allclose(coords.columns.spins, [-np.sqrt(2), np.sqrt(2), 0.0])
+    assert np.allclose(rotated.rotation @ (cubic_input.coords.lattice_vectors @ rotated.matrix), coords.lattice_vectors)
+    assert np.allclose(coords.lattice_vectors, np.diag([5.0 * np.sqrt(2), 5.0 * np.sqrt(2), 5.0]))
+    assert len(coords.columns) == 2 * len(cubic_input.coords.columns)
+    assert np.all((coords.columns.frac_coords >= 0) & (coords.columns.frac_coords < 1))
+    assert len(np.unique(np.round(coords.columns.frac_coords, 8), axis=0)) == len(coords.columns)
+    with pytest.raises(ValueError):
+        transformed_supercell(np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]]), test_coords_proc)
+
+
+def test_most_cubic_matrix() -> None:
+    assert np.array_equal(most_cubic_matrix(np.eye(3), 8), np.diag([2, 2, 2]))
+    assert np.array_equal(most_cubic_matrix(np.eye(3), 2), [[1, 1, 0], [-1, 1, 0], [0, 0, 1]])
+    # No ratio of the edges of this cell is one of small integers, so its only orthogonal supercells
+    # with entries up to max_entry are diagonal
+    lattice = test_coords_proc.coords.lattice_vectors
+    assert np.array_equal(most_cubic_matrix(lattice, 8), np.diag([2, 2, 2]))
+    cell = transformed_supercell.most_cubic(8 * len(test_coords_proc.coords.columns), test_coords_proc)
+    assert np.array_equal(cell.matrix, np.diag([2, 2, 2]))
+    with pytest.raises(ValueError):
+        most_cubic_matrix(np.eye(3), 0)
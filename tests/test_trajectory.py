@@ -0,0 +1,78 @@
+from pathlib import Path
+from conquest2a.conquest import *
+from conquest2a.read.trajectory import *
+from conquest2a.writers import *
+import numpy as np
+import pytest
+
+test_input = conquest_species({1: "Bi", 2: "Mn", 3: "O"})
+test_coords_proc = conquest_coordinates_processor("tests/data/test.dat", test_input)
+
+
+def test_trajectory_frames_match_extxyz(tmp_path: Path) -> None:
+    dest = str(tmp_path / "md.extxyz")
+    with trajectory_writer(dest) as trajectory:
+        for step in range(3):
+            assert trajectory.write_frame(test_coords_proc.coords, time=step * 0.5) == step
+    offsets = load_frame_offsets(dest)
+    assert len(offsets) == 3
+    assert np.array_equal(offsets, scan_frame_offsets(dest))
+    for step in range(3):
+        extxyz_writer(str(tmp_path / "frame.extxyz"), test_coords_proc.coords, time=step * 0.5)
+        assert read_frame_text(dest, step, offsets) == (tmp_path / "frame.extxyz").read_text()
+
+
+def test_trajectory_append(tmp_path: Path) -> None:
+    dest = str(tmp_path / "md.extxyz")
+    with trajectory_writer(dest) as trajectory:
+        trajectory.write_frame(test_coords_proc.coords, time=0.0)
+    # A missing index is rebuilt before appending
+    index_path(dest).unlink()
+    with trajectory_writer(dest, append=True) as trajectory:
+        assert trajectory.write_frame(test_coords_proc.coords, time=1.0) == 1
+    assert index_is_current(dest)
+    offsets = load_frame_offsets(dest)
+    assert np.array_equal(offsets, scan_frame_offsets(dest))
+    assert "Time=1.0" in read_frame_text(dest, -1, offsets)
+
+
+def test_trajectory_not_compressed(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        trajectory_writer(str(tmp_path / "md.extxyz.gz"))
+
+
+def test_trajectory_reader_round_trip(tmp_path: Path) -> None:
+    dest = str(tmp_path / "md.extxyz")
+    original = test_coords_proc.coords
+    with trajectory_writer(dest) as trajectory:
+        for step in range(10):
+            trajectory.write_frame(original, time=float(step))
+    reader = trajectory_reader(dest, test_input)
+    assert len(reader) == 10
+    frame = reader[-1]
+    assert np.array_equal(frame.lattice_vectors, original.lattice_vectors)
+    # Frames are grouped by element, so compare atoms in that order
+    order = np.concatenate(list(original.element_indices.values()))
+    assert np.array_equal(frame.columns.labels, original.columns.labels[order])
+    assert np.array_equal(frame.columns.species, original.columns.species[order])
+    assert np.allclose(frame.columns.cart_coords, original.columns.cart_coords[order])
+    assert np.allclose(frame.columns.frac_coords, original.columns.frac_coords[order])
+    view = reader[2:8:2]
+    assert len(view) == 3
+    streamed = list(view.iter_frames())
+    parallel = view.read_frames(workers=2)
+    serial = view.read_frames(workers=1)
+    for a, b, c in zip(streamed, parallel, serial):
+        assert np.array_equal(a.columns.cart_coords, b.columns.cart_coords)
+        assert np.array_equal(a.columns.cart_coords, c.columns.cart_coords)
+    assert len(reader.read_frames(workers=2)) == 10
+
+
+def test_parse_frame_properties() -> None:
+    text = 'Lattice="2.0 0.0 0.0 0.0 2.0 0.0 0.0 0.0 2.0" Properties=pos:R:3:species:S:1\n'
+    frame = parse_frame(f"2\n{text}0.0 0.0 0.0 Bi\n1.0 0.0 0.0 O\n", test_input, True)
+    assert list(frame.columns.labels) == ["Bi", "O"]
+    assert list(frame.columns.species) == [1, 3]
+    assert np.allclose(frame.columns.frac_coords[1], [0.5, 0.0, 0.0])
+    with pytest.raises(ValueError):
+        parse_frame("1\ncomment\nFe 0.0 0.0 0.0\n", test_input)